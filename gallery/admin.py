@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import BackgroundImage
+from .models import BackgroundImage, DailyPuzzle
 from django.utils.html import mark_safe
 from django.db.models import Count
 
@@ -15,4 +15,12 @@ class BackgroundImageAdmin(admin.ModelAdmin):
         if obj.image:
             return mark_safe(f'<img src="{obj.image.url}" width="50" height="50" />')  # Show thumbnail of the image
         return "No image"  # In case the image is missing or not set
-    image_thumbnail.short_description = 'Image'
\ No newline at end of file
+    image_thumbnail.short_description = 'Image'
+
+@admin.register(DailyPuzzle)
+class DailyPuzzleAdmin(admin.ModelAdmin):
+    list_display = ['date', 'board']
+    list_select_related = ('board',)
+    raw_id_fields = ('board',)
+    date_hierarchy = 'date'
+    ordering = ('-date',)
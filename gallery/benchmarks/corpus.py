@@ -0,0 +1,152 @@
+"""
+Committed corpus of board layouts for the validation/solver benchmarks.
+
+Boards are generated from a seeded random Hamiltonian path over the grid (a
+boustrophedon walk scrambled with backbite moves) cut into color segments, so
+every solvable board ships with a known full-coverage solution:
+
+* easy       - many short paths
+* hard       - few long, winding paths
+* unsolvable - a solvable board with one corner sealed off: the corner is empty
+               and its two neighbours are endpoints of different colors, so no
+               path can ever cover it. Its candidate holds the unaffected paths.
+
+Regenerate with `manage.py generate_benchmark_corpus`; the output is deterministic.
+"""
+import json
+import os
+import random
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'corpus')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+STANDARD_SIZES = range(5, 13)
+STRESS_SIZES = (25, 50)
+KINDS = ('easy', 'hard', 'unsolvable')
+BOARDS_PER_KIND = {'standard': 2, 'stress': 1}
+CELLS_PER_COLOR = {'easy': 6, 'hard': 14}
+
+
+def color_for_index(index):
+    # Multiplying by an odd constant is a bijection modulo 2**24, so colors never repeat.
+    return f'#{(index * 2654435761 + 0x3a5f1c) & 0xffffff:06x}'
+
+
+def _neighbours(cell, cols, rows):
+    x, y = cell
+    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+        if 1 <= nx <= cols and 1 <= ny <= rows:
+            yield nx, ny
+
+
+def random_hamiltonian_path(cols, rows, rng):
+    path = [(x if y % 2 else cols + 1 - x, y) for y in range(1, rows + 1) for x in range(1, cols + 1)]
+    for _ in range(10 * cols * rows):
+        if rng.random() < 0.5:
+            path.reverse()
+        head = path[0]
+        neighbour = rng.choice(list(_neighbours(head, cols, rows)))
+        index = path.index(neighbour)
+        if index > 1:
+            # Backbite: connect the head to its neighbour and drop the edge before it.
+            path[:index] = path[index - 1::-1]
+    return path
+
+
+def _cut_segments(path, n_colors, rng):
+    cells = len(path)
+    n_colors = max(2, min(n_colors, cells // 3))
+    # Every segment gets 3 cells; the remaining slack is spread randomly over the cuts.
+    slack = cells - 3 * n_colors
+    offsets = sorted(rng.randint(0, slack) for _ in range(n_colors - 1))
+    bounds = [0] + [3 * (i + 1) + offset for i, offset in enumerate(offsets)] + [cells]
+    return [path[bounds[i]:bounds[i + 1]] for i in range(n_colors)]
+
+
+def _as_path_data(cells):
+    return [{'x': x, 'y': y} for x, y in cells]
+
+
+def generate_board(cols, rows, kind, rng, name):
+    path = random_hamiltonian_path(cols, rows, rng)
+    cells_per_color = CELLS_PER_COLOR['easy' if kind == 'unsolvable' else kind]
+    segments = _cut_segments(path, (cols * rows) // cells_per_color, rng)
+
+    endpoints = {}
+    solution = []
+    for index, segment in enumerate(segments):
+        color = color_for_index(index)
+        endpoints[segment[0]] = color
+        endpoints[segment[-1]] = color
+        solution.append({'color': color, 'path_data': _as_path_data(segment)})
+
+    solvable = kind != 'unsolvable'
+    candidate = solution
+    if not solvable:
+        endpoints, broken_colors = _seal_corner(endpoints, cols, rows, rng)
+        candidate = [p for p in solution if p['color'] not in broken_colors]
+
+    points = [{'x': x, 'y': y, 'color': color} for (x, y), color in sorted(endpoints.items(), key=lambda i: (i[1], i[0]))]
+    return {
+        'name': name, 'cols': cols, 'rows': rows, 'kind': kind, 'solvable': solvable,
+        'points': points, 'candidate': candidate,
+    }
+
+
+def _seal_corner(endpoints, cols, rows, rng):
+    corner, right, below = (1, 1), (2, 1), (1, 2)
+    trap = {corner, right, below}
+    endpoints = dict(endpoints)
+    broken_colors = set()
+
+    free_cells = [
+        (x, y) for x in range(1, cols + 1) for y in range(1, rows + 1)
+        if (x, y) not in endpoints and (x, y) not in trap
+    ]
+    rng.shuffle(free_cells)
+    for cell in trap:
+        if cell in endpoints:
+            color = endpoints.pop(cell)
+            endpoints[free_cells.pop()] = color
+            broken_colors.add(color)
+
+    color_a, color_b = rng.sample(sorted(set(endpoints.values())), 2)
+    for color, target in ((color_a, right), (color_b, below)):
+        source = rng.choice([cell for cell, c in endpoints.items() if c == color])
+        del endpoints[source]
+        endpoints[target] = color
+        broken_colors.add(color)
+    return endpoints, broken_colors
+
+
+def generate_corpus(seed=2025):
+    rng = random.Random(seed)
+    corpus = {}
+    sizes = [(n, 'standard') for n in STANDARD_SIZES] + [(n, 'stress') for n in STRESS_SIZES]
+    for size, group in sizes:
+        boards = []
+        for kind in KINDS:
+            for i in range(1, BOARDS_PER_KIND[group] + 1):
+                boards.append(generate_board(size, size, kind, rng, f'{size:02d}x{size:02d}-{kind}-{i}'))
+        corpus[f'{size:02d}x{size:02d}'] = boards
+    return corpus
+
+
+def write_corpus(corpus, directory=CORPUS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    for size_name, boards in corpus.items():
+        with open(os.path.join(directory, f'{size_name}.json'), 'w') as f:
+            json.dump(boards, f, separators=(',', ':'))
+            f.write('\n')
+
+
+def load_corpus(directory=CORPUS_DIR, sizes=None, kinds=None):
+    boards = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        if sizes and filename[:-len('.json')] not in sizes:
+            continue
+        with open(os.path.join(directory, filename)) as f:
+            boards.extend(b for b in json.load(f) if not kinds or b['kind'] in kinds)
+    return boards
@@ -0,0 +1,56 @@
+"""
+Compares JSON with MessagePack (gallery.renderers) on game session payloads built
+from the benchmark corpus: encode and decode time with the DRF renderer/parser
+classes the API uses, and payload size raw and gzipped. MessagePack is only
+measured when the optional msgpack package is installed.
+"""
+import gzip
+import io
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from gallery.renderers import MsgpackParser, MsgpackRenderer, msgpack
+
+from .runner import time_callable
+
+FORMATS = {'json': (JSONRenderer(), JSONParser())}
+if msgpack is not None:
+    FORMATS['msgpack'] = (MsgpackRenderer(), MsgpackParser())
+
+
+def session_payload(board):
+    """The shape get_or_create_game_session returns, with the board's candidate as paths."""
+    return {
+        'id': 1, 'player': 1, 'player_username': 'benchmark', 'board_game': 1,
+        'board_game_name': board['name'], 'is_solved': False,
+        'last_updated': '2025-01-01T00:00:00Z',
+        'paths': [
+            {'id': i, 'color': p['color'], 'path_data': p['path_data']}
+            for i, p in enumerate(board['candidate'], start=1)
+        ],
+        'board_details': {
+            'route': {'id': 1, 'name': board['name'], 'rows': board['rows'], 'cols': board['cols'], 'auto_save_enabled': False},
+            'points': [{'id': i, **p} for i, p in enumerate(board['points'], start=1)],
+        },
+    }
+
+
+def run_encoding_benchmarks(boards, repeat=7):
+    """Returns {board name: {format: {'encode_us', 'decode_us', 'bytes', 'gzip_bytes'}}}."""
+    results = {}
+    for board in boards:
+        payload = session_payload(board)
+        board_results = {}
+        for name, (renderer, parser) in FORMATS.items():
+            body = renderer.render(payload)
+            decode = lambda: parser.parse(io.BytesIO(body), parser.media_type, {})
+            assert decode() == payload, f"{name} did not round-trip {board['name']}"
+            board_results[name] = {
+                'encode_us': round(time_callable(lambda: renderer.render(payload), repeat=repeat) * 1e6, 1),
+                'decode_us': round(time_callable(decode, repeat=repeat) * 1e6, 1),
+                'bytes': len(body),
+                'gzip_bytes': len(gzip.compress(body)),
+            }
+        results[board['name']] = board_results
+    return results
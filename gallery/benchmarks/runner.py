@@ -0,0 +1,169 @@
+"""
+Times the gameplay validation code against the benchmark corpus.
+
+Each benchmark is a setup function registered with @benchmark(name). It receives
+a corpus board and returns a zero-argument callable to time, or None when the
+board doesn't apply (e.g. it exceeds the model's size limits).
+"""
+import json
+import platform
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Path, Point
+from gallery.solution import BoardSnapshot, check_solution, grade_candidate
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+@benchmark('check_solution')
+def bench_check_solution(board):
+    required_colors = {p['color'] for p in board['points']}
+    paths = [(p['color'], p['path_data']) for p in board['candidate']]
+    return lambda: check_solution(board['rows'], board['cols'], required_colors, paths)
+
+
+@benchmark('grade_candidate')
+def bench_grade_candidate(board):
+    points = [(p['x'], p['y'], p['color']) for p in board['points']]
+    snapshot = BoardSnapshot.from_points(None, board['cols'], board['rows'], points)
+    candidate = board['candidate']
+    return lambda: grade_candidate(snapshot, candidate)
+
+
+@benchmark('path_clean')
+def bench_path_clean(board):
+    if not board['candidate']:
+        return None
+    try:
+        db_board = _create_board(board)
+    except Exception:
+        return None  # Board not representable by the current models (e.g. too large)
+    session = GamePlaySession.objects.create(player=db_board.user, board_game=db_board)
+    paths = [Path(game_play_session=session, color=p['color'], path_data=p['path_data']) for p in board['candidate']]
+
+    def run():
+        for path in paths:
+            path.clean()
+    return run
+
+
+_fixtures = {}
+
+
+def _create_board(board):
+    if 'user' not in _fixtures:
+        _fixtures['user'] = User.objects.create(username='benchmark-validation-user')
+        _fixtures['background'] = BackgroundImage.objects.create(name='benchmark', image='backgrounds/test.jpg')
+    db_board = BoardGame.objects.create(
+        user=_fixtures['user'], background=_fixtures['background'],
+        name=board['name'], cols=board['cols'], rows=board['rows'],
+    )
+    Point.objects.bulk_create(Point(route=db_board, **p) for p in board['points'])
+    return db_board
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Runs the benchmarks inside a transaction that is always rolled back."""
+    _fixtures.clear()
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        _fixtures.clear()
+
+
+def time_callable(fn, repeat=7, min_time=0.005):
+    """Returns the median seconds per call over `repeat` rounds of at least `min_time` each."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return statistics.median(rounds)
+
+
+def run_benchmarks(boards, names=None, repeat=7):
+    """Returns {board name: {benchmark name: median microseconds per call}}."""
+    names = names or list(BENCHMARKS)
+    results = {}
+    with rolled_back():
+        for board in boards:
+            board_results = {}
+            for name in names:
+                fn = BENCHMARKS[name](board)
+                if fn is not None:
+                    board_results[name] = round(time_callable(fn, repeat=repeat) * 1e6, 3)
+            results[board['name']] = board_results
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'machine': platform.machine(),
+        'platform': platform.platform(terse=True),
+    }
+
+
+def save_baseline(results, path):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline_results, threshold=0.10):
+    """
+    Yields (board, benchmark, baseline_us, current_us, ratio, status) rows where status
+    is 'regression', 'improvement', 'same' or 'new'.
+    """
+    for board_name, board_results in results.items():
+        for name, current in board_results.items():
+            previous = baseline_results.get(board_name, {}).get(name)
+            if previous is None:
+                yield board_name, name, None, current, None, 'new'
+                continue
+            ratio = current / previous if previous else float('inf')
+            if ratio > 1 + threshold:
+                status = 'regression'
+            elif ratio < 1 - threshold:
+                status = 'improvement'
+            else:
+                status = 'same'
+            yield board_name, name, previous, current, ratio, status
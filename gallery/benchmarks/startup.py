@@ -0,0 +1,100 @@
+"""
+Measures how long a fresh worker process takes to become ready.
+
+Run as `python -m gallery.benchmarks.startup [path]`, this module times, in the
+current process, django.setup(), loading the URLconf and serving a first request to
+`path` through the WSGI handler, then prints the timings as one JSON line. Only the
+standard library is imported before the clock starts. measure() runs it in a new
+interpreter each time, so every sample is a real cold start.
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+PHASES = ('setup', 'urls', 'first_request', 'total')
+
+
+def _wsgi_environ(path):
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+
+
+def probe(path='/'):
+    """Cold-starts Django in this process and returns the phase timings in ms."""
+    start = time.perf_counter()
+    import django
+    django.setup()
+    after_setup = time.perf_counter()
+
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    after_urls = time.perf_counter()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    statuses = []
+    response = WSGIHandler()(_wsgi_environ(path), lambda status, headers, exc_info=None: statuses.append(status))
+    b''.join(response)
+    response.close()
+    end = time.perf_counter()
+
+    return {
+        'setup': (after_setup - start) * 1000,
+        'urls': (after_urls - after_setup) * 1000,
+        'first_request': (end - after_urls) * 1000,
+        'total': (end - start) * 1000,
+        'status': statuses[0] if statuses else None,
+        'modules': len(sys.modules),
+    }
+
+
+def _parse_importtime(stderr):
+    # Lines look like "import time:   self [us] | cumulative | <indent>package"
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip()) - 1) // 2))
+    return imports
+
+
+def measure(path='/', settings_module=None, importtime=False, cwd=None):
+    """
+    Runs probe() in a new interpreter. Returns its timings plus the wall time of the
+    whole process ('process', including interpreter startup), and with `importtime`
+    the (module, self us, cumulative us, depth) entries reported by -X importtime.
+    """
+    env = dict(os.environ)
+    if settings_module:
+        env['DJANGO_SETTINGS_MODULE'] = settings_module
+    cmd = [sys.executable, '-X', 'importtime'] if importtime else [sys.executable]
+    start = time.perf_counter()
+    result = subprocess.run(cmd + ['-m', __name__, path], capture_output=True, text=True,
+                            env=env, cwd=cwd, check=True)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process'] = (time.perf_counter() - start) * 1000
+    if importtime:
+        timings['imports'] = _parse_importtime(result.stderr)
+    return timings
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'path_editor.settings')
+    print(json.dumps(probe(sys.argv[1] if len(sys.argv) > 1 else '/')))
@@ -0,0 +1,143 @@
+"""
+Puzzle of the day and board leaderboards.
+
+A DailyPuzzle row features one board per date. Every player opens the same board
+when the day starts, so the prepare_daily_puzzle command runs ahead of midnight (a
+cron job at 23:30, say) and warms what those first requests need: the board's
+preview image and difficulty rating, its grading snapshot and get_board_data_api
+payload, the daily_puzzle_api entry and the leaderboard. The warmed entries are
+stored to stay fresh until WARM_MARGIN_SECONDS past midnight, and are invalidated
+as usual if the board, the schedule or a result changes meanwhile.
+
+Leaderboards list the players who solved a board, earliest solve first
+(GamePlaySession.solved_at).
+"""
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from path_editor.caching import cache_generation, get_or_compute, refresh
+
+from .models import DAILY_SCHEDULE, BoardGame, DailyPuzzle, GamePlaySession, board_summary_generation
+from .solution import (
+    SNAPSHOT_CACHE_TIMEOUT, board_data_cache_key, board_snapshot_cache_key, get_board_snapshot,
+)
+
+
+def _config(name, default):
+    return getattr(settings, 'GALLERY_DAILY', {}).get(name, default)
+
+
+def leaderboard_cache_key(board_id):
+    return f'gallery:leaderboard:{board_id}'
+
+
+def invalidate_leaderboard(board_id):
+    key = leaderboard_cache_key(board_id)
+    cache.delete(key)
+    # Again after commit, in case a concurrent request cached the pre-commit results meanwhile.
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def build_leaderboard(board_id):
+    sessions = GamePlaySession.objects.filter(board_game_id=board_id, is_solved=True).order_by(
+        F('solved_at').asc(nulls_last=True), 'last_updated', 'id',
+    ).values_list('player__username', 'solved_at')[:_config('LEADERBOARD_SIZE', 20)]
+    return [
+        {'rank': rank, 'username': username, 'solved_at': solved_at.isoformat() if solved_at else None}
+        for rank, (username, solved_at) in enumerate(sessions, start=1)
+    ]
+
+
+def board_leaderboard(board_id):
+    """The board's leaderboard, cached until a player's solved state changes."""
+    return get_or_compute(
+        leaderboard_cache_key(board_id), lambda: build_leaderboard(board_id), _config('LEADERBOARD_SECONDS', 300),
+    )
+
+
+def schedule_cache_key(date):
+    return f'gallery:daily-schedule:{date.isoformat()}:{cache_generation(DAILY_SCHEDULE)}'
+
+
+def daily_cache_key(date, board_id):
+    # Only changes of the featured board itself (name, preview, rating) invalidate the entry.
+    return f'gallery:daily:{date.isoformat()}:{board_id}:{cache_generation(board_summary_generation(board_id))}'
+
+
+def scheduled_board_id(date):
+    return DailyPuzzle.objects.filter(date=date).values_list('board_id', flat=True).first()
+
+
+def build_daily_entry(date, board_id):
+    """The summary of the puzzle of `date`, or None if its board is gone."""
+    board = BoardGame.objects.filter(pk=board_id).first()
+    if board is None:
+        return None
+    return {
+        'date': date.isoformat(),
+        'board_id': board.id,
+        'name': board.name,
+        'rows': board.rows,
+        'cols': board.cols,
+        'difficulty': board.difficulty,
+        'preview_url': reverse('gallery:board_preview', args=[board.id, board.preview_fingerprint])
+        if board.preview_fingerprint else None,
+        'play_url': reverse('gallery:play_game', args=[board.id]),
+    }
+
+
+def daily_entry(date):
+    """The summary of the puzzle of `date`, or None if no board is scheduled."""
+    timeout = _config('ENTRY_SECONDS', 600)
+    board_id = get_or_compute(schedule_cache_key(date), lambda: scheduled_board_id(date), timeout)
+    if board_id is None:
+        return None
+    return get_or_compute(daily_cache_key(date, board_id), lambda: build_daily_entry(date, board_id), timeout)
+
+
+def pick_board(date, recent_days=30):
+    """
+    A random board to feature on `date`: one with points that wasn't featured in the
+    `recent_days` before it, preferring rated boards. None if there is no such board.
+    """
+    recent = DailyPuzzle.objects.filter(
+        date__gte=date - datetime.timedelta(days=recent_days), date__lte=date,
+    ).values('board_id')
+    boards = BoardGame.objects.filter(color_count__gt=0).exclude(pk__in=recent)
+    return boards.filter(difficulty__isnull=False).order_by('?').first() or boards.order_by('?').first()
+
+
+def warm_timeout(date, now=None):
+    """Seconds until WARM_MARGIN_SECONDS past the start of `date` (at least the usual lifetimes)."""
+    start = timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+    seconds = (start - (now or timezone.now())).total_seconds() + _config('WARM_MARGIN_SECONDS', 60 * 60)
+    return max(int(seconds), _config('LEADERBOARD_SECONDS', 300))
+
+
+def warm(puzzle, now=None):
+    """
+    Renders, rates and caches everything the puzzle's first requests hit. Returns the
+    number of seconds the warmed entries stay fresh.
+    """
+    from . import previews, solver
+    from .views import build_board_data
+
+    board_id, date = puzzle.board_id, puzzle.date
+    previews.update_board_preview(board_id)
+    solver.update_board_difficulty(board_id)  # Solves it unless the stored rating is current
+    timeout = warm_timeout(date, now)
+
+    cache.delete(board_snapshot_cache_key(board_id))
+    get_board_snapshot(BoardGame.objects.get(pk=board_id))
+    cache.touch(board_snapshot_cache_key(board_id), max(timeout, SNAPSHOT_CACHE_TIMEOUT))
+    refresh(board_data_cache_key(board_id), lambda: build_board_data(board_id), timeout)
+    refresh(leaderboard_cache_key(board_id), lambda: build_leaderboard(board_id), timeout)
+    refresh(schedule_cache_key(date), lambda: board_id, timeout)
+    refresh(daily_cache_key(date, board_id), lambda: build_daily_entry(date, board_id), timeout)
+    return timeout
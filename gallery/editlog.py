@@ -0,0 +1,203 @@
+"""
+Server-side undo/redo log for the board editor.
+
+Every editor save records one BoardEditOperation holding the operations it applied
+(`forward`) and the operations that revert them (`inverse`, already in reverse
+order). Operations are small JSON dicts:
+
+    {'op': 'add',    'points': [{'id', 'x', 'y', 'color'}, ...]}
+    {'op': 'delete', 'points': [{'id', 'x', 'y', 'color'}, ...]}
+    {'op': 'move',   'id': 7, 'from': [x, y], 'to': [x, y]}
+    {'op': 'rename', 'from': 'old name', 'to': 'new name'}
+    {'op': 'resize', 'from': [cols, rows], 'to': [cols, rows]}
+
+Undo and redo replay a run of entries in one transaction using bulk queries, with
+the game session resets deferred to a single bulk reset. Each op checks the state it
+expects, so edits made outside the log (e.g. in the admin) surface as an
+EditConflict instead of corrupting the board.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .models import BoardEditOperation, Point, defer_session_resets, request_session_reset
+from .solution import invalidate_board_snapshot
+
+
+class EditConflict(ValidationError):
+    """The board no longer matches the state an undo/redo entry expects."""
+
+
+def max_entries():
+    return getattr(settings, 'GALLERY_EDIT_HISTORY', {}).get('MAX_ENTRIES', 100)
+
+
+def point_dicts(points):
+    return [{'id': p['id'], 'x': p['x'], 'y': p['y'], 'color': p['color']} for p in points.values('id', 'x', 'y', 'color')]
+
+
+def invert(op):
+    kind = op['op']
+    if kind == 'add':
+        return {'op': 'delete', 'points': op['points']}
+    if kind == 'delete':
+        return {'op': 'add', 'points': op['points']}
+    if kind == 'move':
+        return {'op': 'move', 'id': op['id'], 'from': op['to'], 'to': op['from']}
+    if kind in ('rename', 'resize'):
+        return {'op': kind, 'from': op['to'], 'to': op['from']}
+    raise ValueError(f"Unknown edit op {kind!r}")
+
+
+def compact_ops(ops):
+    """
+    Shrinks an op list without changing its effect: drops no-op moves, renames and
+    resizes, merges adjacent moves of the same point, adjacent renames/resizes and
+    adjacent adds/deletes, and cancels an add immediately followed by its delete.
+    Only adjacent ops are merged, since reordering could create transient cell conflicts.
+    """
+    compacted = []
+    for op in ops:
+        op = dict(op)
+        previous = compacted[-1] if compacted else None
+        if previous is not None and previous['op'] == op['op']:
+            if op['op'] == 'move' and previous['id'] == op['id']:
+                previous['to'] = op['to']
+                op = None
+            elif op['op'] in ('rename', 'resize'):
+                previous['to'] = op['to']
+                op = None
+            elif op['op'] in ('add', 'delete'):
+                previous['points'] = previous['points'] + op['points']
+                op = None
+        elif previous is not None and previous['op'] == 'add' and op['op'] == 'delete':
+            if {p['id'] for p in previous['points']} == {p['id'] for p in op['points']}:
+                compacted.pop()
+                op = None
+
+        if op is not None:
+            compacted.append(op)
+    return [op for op in compacted if op['op'] not in ('move', 'rename', 'resize') or op['from'] != op['to']]
+
+
+def record(board, ops):
+    """
+    Appends an entry for `ops` to the board's log, discarding the redo history and
+    the oldest entries beyond MAX_ENTRIES. Call inside the transaction that applied them.
+    """
+    ops = compact_ops(ops)
+    if not ops:
+        return None
+    log = BoardEditOperation.objects.filter(board=board)
+    log.filter(undone=True).delete()
+    last_seq = log.order_by('-seq').values_list('seq', flat=True).first() or 0
+    entry = BoardEditOperation.objects.create(
+        board=board, seq=last_seq + 1, forward=ops, inverse=[invert(op) for op in reversed(ops)],
+    )
+    log.filter(seq__lte=entry.seq - max_entries()).delete()
+    return entry
+
+
+def resize_board(board, cols, rows):
+    """
+    Resizes the board and returns the ops describing it: a delete of the points the
+    shrink removed (out of bounds points and their pairs) followed by the resize.
+    """
+    before = point_dicts(board.points.all())
+    old_size = [board.cols, board.rows]
+    board.cols, board.rows = cols, rows
+    board.save(update_fields=['cols', 'rows'])
+    ops = []
+    if cols < old_size[0] or rows < old_size[1]:
+        remaining = set(board.points.values_list('id', flat=True))
+        removed = [p for p in before if p['id'] not in remaining]
+        if removed:
+            ops.append({'op': 'delete', 'points': removed})
+    ops.append({'op': 'resize', 'from': old_size, 'to': [cols, rows]})
+    return ops
+
+
+def apply_ops(board, ops):
+    """Applies ops to the board with bulk queries. Raises EditConflict if the board has diverged."""
+    points_changed = False
+    for op in ops:
+        kind = op['op']
+        if kind == 'add':
+            for p in op['points']:
+                if not (1 <= p['x'] <= board.cols and 1 <= p['y'] <= board.rows):
+                    raise EditConflict(f"Point ({p['x']}, {p['y']}) is outside the {board.cols}x{board.rows} board.")
+            try:
+                with transaction.atomic():
+                    Point.objects.bulk_create(
+                        Point(id=p['id'], route=board, x=p['x'], y=p['y'], color=p['color']) for p in op['points']
+                    )
+            except IntegrityError:
+                raise EditConflict("A cell or point being restored is already in use.")
+            points_changed = True
+        elif kind == 'delete':
+            expected = {p['id']: (p['x'], p['y']) for p in op['points']}
+            points = Point.objects.filter(route=board, id__in=expected)
+            current = {pk: (x, y) for pk, x, y in points.values_list('id', 'x', 'y')}
+            if current != expected:
+                raise EditConflict("Some of the points to remove have been moved or deleted since this edit.")
+            points.delete()
+            points_changed = True
+        elif kind == 'move':
+            (from_x, from_y), (to_x, to_y) = op['from'], op['to']
+            try:
+                with transaction.atomic():
+                    moved = Point.objects.filter(route=board, id=op['id'], x=from_x, y=from_y).update(x=to_x, y=to_y)
+            except IntegrityError:
+                raise EditConflict(f"Cell ({to_x}, {to_y}) is already occupied.")
+            if not moved:
+                raise EditConflict(f"Point {op['id']} is no longer at ({from_x}, {from_y}).")
+            points_changed = True
+        elif kind == 'rename':
+            if board.name != op['from']:
+                raise EditConflict("The board name has changed since this edit.")
+            board.name = op['to']
+            board.save(update_fields=['name'])
+        elif kind == 'resize':
+            if [board.cols, board.rows] != list(op['from']):
+                raise EditConflict("The board dimensions have changed since this edit.")
+            board.cols, board.rows = op['to']
+            board.save(update_fields=['cols', 'rows'])
+        else:
+            raise ValueError(f"Unknown edit op {kind!r}")
+
+    if points_changed:
+        # bulk_create() and update() bypass the Point signals.
+        request_session_reset(board.id)
+        invalidate_board_snapshot(board.id)
+
+
+def _replay(board, undo, steps):
+    log = BoardEditOperation.objects.select_for_update().filter(board=board, undone=not undo)
+    entries = list(log.order_by('-seq' if undo else 'seq')[:steps])
+    if not entries:
+        return []
+    with defer_session_resets():
+        for entry in entries:
+            apply_ops(board, entry.inverse if undo else entry.forward)
+        BoardEditOperation.objects.filter(pk__in=[e.pk for e in entries]).update(undone=undo)
+    return [entry.seq for entry in entries]
+
+
+@transaction.atomic
+def undo(board, steps=1):
+    """Reverts the latest `steps` entries and returns their seqs (empty if there is nothing to undo)."""
+    return _replay(board, undo=True, steps=steps)
+
+
+@transaction.atomic
+def redo(board, steps=1):
+    """Re-applies the earliest `steps` undone entries and returns their seqs."""
+    return _replay(board, undo=False, steps=steps)
+
+
+def history_state(board):
+    log = BoardEditOperation.objects.filter(board=board)
+    return {
+        'can_undo': log.filter(undone=False).exists(),
+        'can_redo': log.filter(undone=True).exists(),
+    }
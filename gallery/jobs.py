@@ -0,0 +1,157 @@
+"""
+Durable background jobs stored in the database.
+
+Handlers are plain functions registered with @job(name) (see gallery.tasks) and
+called with the job's JSON payload as keyword arguments. enqueue() stores a Job row.
+The runworker command then:
+- claims due jobs by leasing them with a conditional UPDATE, so two workers never
+  run the same job;
+- runs them in a thread or process pool and extends the leases while they run;
+- deletes jobs that succeed and retries failures with exponential backoff until
+  max_attempts.
+
+A job whose worker died is claimed again once its lease expires, so handlers must be
+safe to run twice.
+
+With JOB_QUEUE['EAGER'] (the default under DEBUG), jobs without a delay run inline
+when enqueued, so development needs no worker. Delayed jobs are always stored: they
+are used to debounce bursts of changes, which running them inline would defeat.
+"""
+import hashlib
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def job(name):
+    def decorator(handler):
+        HANDLERS[name] = handler
+        return handler
+    return decorator
+
+
+def _config(name, default):
+    return getattr(settings, 'JOB_QUEUE', {}).get(name, default)
+
+
+def lease_seconds():
+    return _config('LEASE_SECONDS', 300)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before retrying a job that has failed `attempts` times."""
+    return min(_config('RETRY_BACKOFF', 10) * 2 ** (attempts - 1), _config('RETRY_BACKOFF_MAX', 3600))
+
+
+def _unique_key(name, payload):
+    return hashlib.sha1(f'{name}:{json.dumps(payload, sort_keys=True)}'.encode()).hexdigest()
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None, unique=False):
+    """
+    Queues handler `name` to run with `payload` after `delay` seconds and returns the
+    Job (None if it ran eagerly). With `unique`, nothing is queued if an identical job
+    is already waiting.
+    """
+    if name not in HANDLERS:
+        raise ValueError(f"Unknown job {name!r}; expected one of {', '.join(sorted(HANDLERS))}.")
+    payload = payload or {}
+    if _config('EAGER', False) and not delay:
+        HANDLERS[name](**payload)
+        return None
+
+    unique_key = _unique_key(name, payload) if unique else ''
+    if unique and Job.objects.filter(unique_key=unique_key, status=Job.QUEUED).exists():
+        return None
+    return Job.objects.create(
+        name=name, payload=payload, unique_key=unique_key,
+        run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or _config('MAX_ATTEMPTS', 5),
+    )
+
+
+def cancel(name, payload=None):
+    """Deletes the waiting jobs queued by enqueue(name, payload, unique=True); returns how many."""
+    return Job.objects.filter(unique_key=_unique_key(name, payload or {}), status=Job.QUEUED).delete()[0]
+
+
+def _due(now):
+    return Q(status=Job.QUEUED, run_after__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now)
+
+
+def claim(worker_id, limit):
+    """Leases up to `limit` due jobs (including ones whose lease expired) and returns their ids."""
+    now = timezone.now()
+    candidates = Job.objects.filter(_due(now)).order_by('run_after', 'id').values_list('id', flat=True)[:limit * 2]
+    claimed = []
+    for job_id in candidates:
+        if len(claimed) >= limit:
+            break
+        # Another worker may have leased the job since the SELECT; the conditional UPDATE decides.
+        leased = Job.objects.filter(_due(now), pk=job_id).update(
+            status=Job.RUNNING, locked_by=worker_id, locked_until=now + timedelta(seconds=lease_seconds()),
+            attempts=F('attempts') + 1,
+        )
+        if leased:
+            claimed.append(job_id)
+    return claimed
+
+
+def extend_leases(worker_id):
+    """Renews the leases of the jobs this worker is running."""
+    return Job.objects.filter(status=Job.RUNNING, locked_by=worker_id).update(
+        locked_until=timezone.now() + timedelta(seconds=lease_seconds())
+    )
+
+
+def run_job(job_id, worker_id):
+    """Runs a leased job and records the outcome. Returns True if the handler succeeded."""
+    job = Job.objects.filter(pk=job_id, locked_by=worker_id).first()
+    if job is None:
+        return False
+    leased = Job.objects.filter(pk=job_id, locked_by=worker_id, status=Job.RUNNING)
+    try:
+        if job.attempts > job.max_attempts:
+            raise RuntimeError("Lease expired after the last attempt.")
+        handler = HANDLERS.get(job.name)
+        if handler is None:
+            raise LookupError(f"No handler registered for job {job.name!r}.")
+        handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Job %s (%s) failed on attempt %s/%s", job.id, job.name, job.attempts, job.max_attempts)
+        if job.attempts >= job.max_attempts:
+            leased.update(status=Job.FAILED, last_error=error, locked_until=None)
+        else:
+            leased.update(
+                status=Job.QUEUED, last_error=error, locked_by='', locked_until=None,
+                run_after=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+            )
+        return False
+    leased.delete()
+    return True
+
+
+def run_job_in_pool(job_id, worker_id):
+    # Pool threads and processes each open their own connection; close it after every job.
+    try:
+        return run_job(job_id, worker_id)
+    finally:
+        connection.close()
+
+
+def run_pending(worker_id='inline', limit=100):
+    """Claims and runs due jobs in the current thread. Returns the number that succeeded."""
+    return sum(run_job(job_id, worker_id) for job_id in claim(worker_id, limit))
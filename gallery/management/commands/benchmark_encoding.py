@@ -0,0 +1,39 @@
+import json
+from collections import defaultdict
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+from gallery.benchmarks.corpus import load_corpus
+from gallery.benchmarks.encoding import FORMATS, run_encoding_benchmarks
+
+class Command(BaseCommand):
+    help = "Compares JSON and MessagePack on session payloads from the benchmark corpus."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', action='append', help="Only use these corpus sizes, e.g. --size 50x50.")
+        parser.add_argument('--kind', action='append', choices=['easy', 'hard', 'unsolvable'], help="Only use these board kinds.")
+        parser.add_argument('--repeat', type=int, default=7, help="Timing rounds per board and format.")
+        parser.add_argument('--json', action='store_true', help="Print the per-board results as JSON.")
+
+    def handle(self, *args, **options):
+        boards = load_corpus(sizes=options['size'], kinds=options['kind'])
+        if not boards:
+            raise CommandError("No corpus boards matched; run generate_benchmark_corpus first?")
+        if 'msgpack' not in FORMATS:
+            self.stderr.write("msgpack isn't installed; only JSON is measured.")
+        results = run_encoding_benchmarks(boards, repeat=options['repeat'])
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=1))
+            return
+
+        grouped = defaultdict(list)
+        for board_name, board_results in results.items():
+            for name, values in board_results.items():
+                grouped[(board_name[:5], name)].append(values)
+        self.stdout.write(f"{'size':<6} {'format':<7} {'encode us':>10} {'decode us':>10} {'bytes':>9} {'gzip bytes':>11}")
+        for (size, name), rows in sorted(grouped.items()):
+            self.stdout.write(
+                f"{size:<6} {name:<7} "
+                + ' '.join(f"{median(row[key] for row in rows):>{width}.0f}"
+                           for key, width in (('encode_us', 10), ('decode_us', 10), ('bytes', 9), ('gzip_bytes', 11)))
+            )
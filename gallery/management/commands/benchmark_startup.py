@@ -0,0 +1,43 @@
+import json
+from statistics import median
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from gallery.benchmarks.startup import PHASES, measure
+
+class Command(BaseCommand):
+    help = (
+        "Cold-starts Django in fresh processes and reports how long setup, URLconf loading "
+        "and the first request take, optionally with the slowest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help="Fresh processes to start.")
+        parser.add_argument('--path', default='/', help="Path of the first request.")
+        parser.add_argument('--imports', type=int, default=0, metavar='N',
+                            help="Also list the N slowest top-level imports (from python -X importtime).")
+        parser.add_argument('--json', action='store_true', help="Print the raw results as JSON.")
+
+    def handle(self, *args, **options):
+        runs = [measure(options['path'], settings.SETTINGS_MODULE, cwd=settings.BASE_DIR)
+                for _ in range(max(options['runs'], 1))]
+        imports = []
+        if options['imports']:
+            # A separate run: -X importtime itself slows the imports down.
+            imports = measure(options['path'], settings.SETTINGS_MODULE, importtime=True, cwd=settings.BASE_DIR)['imports']
+            imports = sorted((entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2])[:options['imports']]
+
+        if options['json']:
+            self.stdout.write(json.dumps({'runs': runs, 'imports': imports}, indent=2))
+            return
+
+        self.stdout.write(f"{len(runs)} cold starts, first request GET {options['path']} -> {runs[0]['status']}, "
+                          f"{runs[0]['modules']} modules loaded")
+        self.stdout.write(f"{'phase':<14} {'min ms':>9} {'median ms':>10}")
+        for phase in PHASES + ('process',):
+            values = [run[phase] for run in runs]
+            self.stdout.write(f"{phase:<14} {min(values):>9.1f} {median(values):>10.1f}")
+        if imports:
+            self.stdout.write("\nSlowest top-level imports:")
+            for name, self_us, cumulative_us, _ in imports:
+                self.stdout.write(f"  {name:<50} {cumulative_us / 1000:>8.1f} ms")
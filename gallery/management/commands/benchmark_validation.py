@@ -0,0 +1,64 @@
+import os
+from collections import defaultdict
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+from gallery.benchmarks.corpus import BASELINE_PATH, load_corpus
+from gallery.benchmarks.runner import BENCHMARKS, compare, load_baseline, run_benchmarks, save_baseline
+
+class Command(BaseCommand):
+    help = (
+        "Times the solution checker, Path.clean and solver engines against the benchmark corpus, "
+        "reports medians and compares them with the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--benchmark', action='append', choices=sorted(BENCHMARKS), help="Only run these benchmarks.")
+        parser.add_argument('--size', action='append', help="Only run these corpus sizes, e.g. --size 07x07.")
+        parser.add_argument('--kind', action='append', choices=['easy', 'hard', 'unsolvable'], help="Only run these board kinds.")
+        parser.add_argument('--repeat', type=int, default=7, help="Timing rounds per board and benchmark.")
+        parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline JSON file.")
+        parser.add_argument('--save-baseline', action='store_true', help="Store the results as the new baseline.")
+        parser.add_argument('--threshold', type=float, default=0.10, help="Relative change reported as a regression/improvement.")
+        parser.add_argument('--fail-on-regression', action='store_true', help="Exit with an error if anything regressed.")
+        parser.add_argument('--verbose-boards', action='store_true', help="Print per-board results, not just per-size medians.")
+
+    def handle(self, *args, **options):
+        boards = load_corpus(sizes=options['size'], kinds=options['kind'])
+        if not boards:
+            raise CommandError("No corpus boards matched; run generate_benchmark_corpus first?")
+        results = run_benchmarks(boards, names=options['benchmark'], repeat=options['repeat'])
+
+        # Per size/kind medians across boards
+        grouped = defaultdict(list)
+        for board in boards:
+            for name, micros in results[board['name']].items():
+                grouped[(board['name'][:5], board['kind'], name)].append(micros)
+        self.stdout.write(f"{'size':<6} {'kind':<11} {'benchmark':<16} {'median us':>12}")
+        for (size, kind, name), values in sorted(grouped.items()):
+            self.stdout.write(f"{size:<6} {kind:<11} {name:<16} {median(values):>12.1f}")
+        if options['verbose_boards']:
+            for board_name, board_results in results.items():
+                for name, micros in board_results.items():
+                    self.stdout.write(f"  {board_name:<22} {name:<16} {micros:>12.1f}")
+
+        regressions = 0
+        if os.path.exists(options['baseline']) and not options['save_baseline']:
+            baseline = load_baseline(options['baseline'])
+            self.stdout.write(f"\nComparison with {options['baseline']} (threshold {options['threshold']:.0%}):")
+            counts = defaultdict(int)
+            for board_name, name, previous, current, ratio, status in compare(results, baseline['results'], options['threshold']):
+                counts[status] += 1
+                if status in ('regression', 'improvement'):
+                    self.stdout.write(f"  {status:<11} {board_name:<22} {name:<16} {previous:>10.1f} -> {current:>10.1f} us ({ratio:.2f}x)")
+            regressions = counts['regression']
+            self.stdout.write(
+                f"  {counts['regression']} regressions, {counts['improvement']} improvements, "
+                f"{counts['same']} unchanged, {counts['new']} new."
+            )
+
+        if options['save_baseline']:
+            save_baseline(results, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}."))
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f"{regressions} benchmark regressions.")
@@ -0,0 +1,27 @@
+import os
+
+from django.core.management.base import BaseCommand
+from path_editor import schema
+
+class Command(BaseCommand):
+    help = ("Generates the OpenAPI schema served at /api/schema/ into content-hashed files. "
+            "Run it on deploy so no request has to build the schema.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help="Only report whether the stored schema matches the current URLconf.")
+
+    def handle(self, *args, **options):
+        fingerprint = schema.urlconf_fingerprint()
+        manifest = schema.read_manifest()
+        if options['check']:
+            if manifest and manifest['urlconf'] == fingerprint:
+                self.stdout.write(self.style.SUCCESS(f"Schema {manifest['hash']} is up to date."))
+            else:
+                self.stdout.write(self.style.WARNING("Schema is missing or built from another URLconf."))
+            return
+
+        manifest = schema.build(fingerprint)
+        for name in manifest['files'].values():
+            self.stdout.write(f"Wrote {os.path.join(schema.schema_dir(), name)}")
+        self.stdout.write(self.style.SUCCESS(f"Done. Schema {manifest['hash']} for URLconf {fingerprint}."))
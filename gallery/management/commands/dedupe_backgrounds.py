@@ -0,0 +1,103 @@
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from gallery.models import BackgroundImage, BoardGame, content_addressed_name, schedule_preview_render
+
+CHUNK_SIZE = 1024 * 1024
+
+def _hash_stored_file(name):
+    # hashlib releases the GIL on large chunks, so threads hash files in parallel.
+    digest = hashlib.sha256()
+    try:
+        with default_storage.open(name, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+class Command(BaseCommand):
+    help = ("Hashes background images, merges rows that share the same file into one and "
+            "moves files to their content-addressed names.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help="Files hashed in parallel.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would change.")
+        parser.add_argument('--remove-unreferenced-copies', action='store_true',
+                            help="Also delete files under backgrounds/ that no row uses but that duplicate one that is used.")
+
+    def handle(self, *args, **options):
+        backgrounds = list(BackgroundImage.objects.exclude(image='').order_by('id'))
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as pool:
+            hashes = list(pool.map(_hash_stored_file, [bg.image.name for bg in backgrounds]))
+
+        groups = defaultdict(list)
+        for background, content_hash in zip(backgrounds, hashes):
+            if content_hash is None:
+                self.stdout.write(self.style.WARNING(f"Background {background.pk}: file {background.image.name} is missing."))
+            else:
+                groups[content_hash].append(background)
+
+        merged = moved = 0
+        for content_hash, group in groups.items():
+            # Keep the row already carrying the hash, otherwise the oldest one.
+            group.sort(key=lambda bg: (bg.content_hash != content_hash, bg.pk))
+            canonical, duplicates = group[0], group[1:]
+            target = content_addressed_name(content_hash, canonical.image.name)
+            if not duplicates and canonical.image.name == target and canonical.content_hash == content_hash:
+                continue
+            if options['dry_run']:
+                self.stdout.write(f"Would keep background {canonical.pk} as {target}"
+                                  f" and merge {[bg.pk for bg in duplicates]} into it.")
+                continue
+            self._merge(canonical, duplicates, content_hash, target)
+            merged += len(duplicates)
+            moved += canonical.image.name != target
+
+        removed = self._remove_redundant_copies(set(groups), options) if options['remove_unreferenced_copies'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Merged {merged} duplicate backgrounds, moved {moved} files, removed {removed} unreferenced copies."
+        ))
+
+    def _remove_redundant_copies(self, known_hashes, options):
+        # Files left behind by earlier re-uploads that no row references. Only exact
+        # copies of a referenced file are removed; other stray files are kept.
+        referenced = set(BackgroundImage.objects.values_list('image', flat=True))
+        try:
+            names = [f'backgrounds/{name}' for name in default_storage.listdir('backgrounds')[1]]
+        except FileNotFoundError:
+            return 0
+        names = [name for name in names if name not in referenced]
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as pool:
+            hashes = list(pool.map(_hash_stored_file, names))
+        removed = 0
+        for name, content_hash in zip(names, hashes):
+            if content_hash in known_hashes:
+                if options['dry_run']:
+                    self.stdout.write(f"Would remove {name}, a copy of a stored background.")
+                else:
+                    default_storage.delete(name)
+                removed += 1
+        return removed
+
+    def _merge(self, canonical, duplicates, content_hash, target):
+        old_names = {bg.image.name for bg in [canonical, *duplicates]} - {target}
+        with transaction.atomic():
+            board_ids = list(BoardGame.objects.filter(background__in=[canonical, *duplicates]).values_list('id', flat=True))
+            # Re-point boards before deleting the duplicates: BoardGame.background cascades.
+            BoardGame.objects.filter(background__in=duplicates).update(background=canonical)
+            BackgroundImage.objects.filter(pk__in=[bg.pk for bg in duplicates]).delete()
+            if not default_storage.exists(target):
+                with default_storage.open(canonical.image.name, 'rb') as f:
+                    target = default_storage.save(target, f)
+            BackgroundImage.objects.filter(pk=canonical.pk).update(image=target, content_hash=content_hash)
+
+        for name in old_names:
+            if not BackgroundImage.objects.filter(image=name).exists():
+                default_storage.delete(name)
+        for board_id in board_ids:
+            schedule_preview_render(board_id)  # The previews' fingerprints include the file name
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from gallery.benchmarks.corpus import CORPUS_DIR, generate_corpus, write_corpus
+
+class Command(BaseCommand):
+    help = "Regenerates the committed benchmark corpus of easy, hard and unsolvable boards."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=2025, help="Random seed (the committed corpus uses the default).")
+        parser.add_argument('--output', default=CORPUS_DIR, help="Directory to write the corpus files to.")
+
+    def handle(self, *args, **options):
+        corpus = generate_corpus(seed=options['seed'])
+        write_corpus(corpus, options['output'])
+        total = sum(len(boards) for boards in corpus.values())
+        self.stdout.write(self.style.SUCCESS(f"Wrote {total} boards in {len(corpus)} files to {options['output']}."))
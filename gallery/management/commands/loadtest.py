@@ -0,0 +1,385 @@
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from gallery.models import BackgroundImage, BoardGame, Point
+
+LOADTEST_PASSWORD = 'loadtest-pass'
+PLAYER_BOARD_NAME = 'Load test: player board'
+PLAYER_BOARD_SIZE = 6
+COLORS = ['#e6194b', '#3cb44b', '#ffe119', '#4363d8', '#f58231', '#911eb4', '#46f0f0', '#f032e6']
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpConnection:
+    """
+    Tiny keep-alive HTTP/1.1 client on asyncio streams. It only has to speak to
+    Django's dev/test servers, so it supports Content-Length, chunked and
+    read-until-close bodies and nothing fancier.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.cookies = {}
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None, content_type='application/json'):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = b''
+        if body is not None:
+            payload = body.encode() if isinstance(body, str) else body
+        lines = [
+            f'{method} {path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            f'Content-Length: {len(payload)}',
+            'Connection: keep-alive',
+        ]
+        if body is not None:
+            lines.append(f'Content-Type: {content_type}')
+        if self.cookies:
+            lines.append('Cookie: ' + '; '.join(f'{k}={v}' for k, v in self.cookies.items()))
+        if 'csrftoken' in self.cookies:
+            lines.append(f"X-CSRFToken: {self.cookies['csrftoken']}")
+        for name, value in (headers or {}).items():
+            lines.append(f'{name}: {value}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+        await self.writer.drain()
+
+        try:
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise HttpError('Connection closed by server')
+            status = int(status_line.split()[1])
+            response_headers = {}
+            while True:
+                line = await self.reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                name, value = name.strip().lower(), value.strip()
+                if name == 'set-cookie':
+                    cookie_name, _, rest = value.partition('=')
+                    self.cookies[cookie_name] = rest.split(';', 1)[0]
+                response_headers[name] = value
+
+            if 'content-length' in response_headers:
+                content = await self.reader.readexactly(int(response_headers['content-length']))
+            elif response_headers.get('transfer-encoding') == 'chunked':
+                chunks = []
+                while True:
+                    size = int((await self.reader.readline()).strip(), 16)
+                    if size == 0:
+                        await self.reader.readline()
+                        break
+                    chunks.append(await self.reader.readexactly(size))
+                    await self.reader.readline()
+                content = b''.join(chunks)
+            else:
+                content = await self.reader.read()
+                response_headers['connection'] = 'close'
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            await self.close()
+            raise HttpError(str(e)) from e
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, content
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, seconds, ok):
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+
+class VirtualUser:
+    def __init__(self, runner, username):
+        self.runner = runner
+        self.username = username
+        self.conn = HttpConnection(runner.host, runner.port)
+
+    async def call(self, endpoint, method, path, payload=None):
+        body = json.dumps(payload) if payload is not None else None
+        start = time.perf_counter()
+        try:
+            status, content = await self.conn.request(method, path, body=body)
+            ok = status < 400
+        except (HttpError, OSError):
+            status, content, ok = None, b'', False
+        if self.runner.measuring:
+            self.runner.stats.record(endpoint, time.perf_counter() - start, ok)
+        if ok and content:
+            try:
+                return json.loads(content)
+            except ValueError:
+                return None
+        return None
+
+    async def login(self):
+        status, content = await self.conn.request('GET', '/users/login/')
+        match = re.search(rb'name="csrfmiddlewaretoken" value="([^"]+)"', content)
+        if status != 200 or not match:
+            raise HttpError(f'Could not load the login page for {self.username} (status {status}).')
+        form = f'csrfmiddlewaretoken={match.group(1).decode()}&username={self.username}&password={LOADTEST_PASSWORD}'
+        status, _ = await self.conn.request(
+            'POST', '/users/login/', body=form, content_type='application/x-www-form-urlencoded',
+        )
+        if status != 302 or 'sessionid' not in self.conn.cookies:
+            raise HttpError(f'Login failed for {self.username} (status {status}).')
+
+    async def think(self, seconds):
+        await asyncio.sleep(seconds * random.uniform(0.5, 1.5))
+
+
+class Editor(VirtualUser):
+    """Moves points on its own auto-save board through update_point and save_pending_changes."""
+
+    def __init__(self, runner, username, board):
+        super().__init__(runner, username)
+        self.board_id = board['id']
+        self.cols, self.rows = board['cols'], board['rows']
+        self.points = {p['id']: (p['x'], p['y']) for p in board['points']}
+
+    def _random_move(self):
+        point_id = random.choice(list(self.points))
+        occupied = set(self.points.values())
+        free = [(x, y) for x in range(1, self.cols + 1) for y in range(1, self.rows + 1) if (x, y) not in occupied]
+        return point_id, random.choice(free)
+
+    async def run(self, deadline):
+        while time.monotonic() < deadline:
+            point_id, (x, y) = self._random_move()
+            if random.random() < 0.5:
+                data = await self.call(
+                    'update_point', 'PUT', f'/gallery/points/update/{self.board_id}/{point_id}/', {'x': x, 'y': y},
+                )
+                if data and data.get('success'):
+                    self.points[point_id] = (x, y)
+            else:
+                changes = [{'type': 'update', 'pointId': point_id, 'x': x, 'y': y}]
+                data = await self.call(
+                    'save_pending_changes', 'POST',
+                    f'/gallery/api/board/{self.board_id}/save-pending-changes/', {'changes': changes},
+                )
+                if data and 'all_points' in data:
+                    self.points = {p['id']: (p['x'], p['y']) for p in data['all_points']}
+            await self.think(self.runner.editor_think)
+
+
+class Player(VirtualUser):
+    """Loads its session, then autosaves a growing, eventually complete, set of paths (the first save creates the session)."""
+
+    def __init__(self, runner, username, board):
+        super().__init__(runner, username)
+        self.board_id = board['id']
+        self.solution = board['solution']
+
+    async def run(self, deadline):
+        # Reading a session doesn't create it: until the first save the player has no
+        # session id, so that save goes to the board-scoped URL, which returns one.
+        data = await self.call('get_or_create_game_session', 'GET', f'/gallery/api/game/board/{self.board_id}/session/')
+        session_id = data and data.get('id')
+        drawn = 0
+        while time.monotonic() < deadline:
+            drawn = drawn % len(self.solution) + 1
+            if session_id is None:
+                data = await self.call(
+                    'save_board_paths_api', 'POST', f'/gallery/api/game/board/{self.board_id}/session/save_all_paths/',
+                    {'paths': self.solution[:drawn]},
+                )
+                session_id = data and data.get('session_id')
+            else:
+                await self.call(
+                    'save_all_paths_api', 'POST', f'/gallery/api/game/session/{session_id}/save_all_paths/',
+                    {'paths': self.solution[:drawn]},
+                )
+            await self.think(self.runner.autosave_interval)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a load test of editors and players against a running server (runserver or testserver) "
+        "and reports throughput, latency percentiles and error rates per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the server under test.")
+        parser.add_argument('--editors', type=int, default=10, help="Number of concurrent editor virtual users.")
+        parser.add_argument('--players', type=int, default=100, help="Number of concurrent player virtual users.")
+        parser.add_argument('--duration', type=float, default=60, help="Measured test duration in seconds.")
+        parser.add_argument('--ramp-up', type=float, default=5, help="Seconds over which virtual users start.")
+        parser.add_argument('--autosave-interval', type=float, default=5, help="Mean seconds between player saves.")
+        parser.add_argument('--editor-think', type=float, default=2, help="Mean seconds between editor actions.")
+        parser.add_argument(
+            '--no-setup', action='store_true',
+            help="Skip creating the load test users and boards (they must already exist in the server's database).",
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError("--url must be a plain http:// URL.")
+        self.host, self.port = url.hostname, url.port or 80
+        self.editor_think = options['editor_think']
+        self.autosave_interval = options['autosave_interval']
+        self.stats = Stats()
+        self.measuring = False
+
+        if options['no_setup']:
+            editor_boards, player_board = self.load_fixtures(options['editors'], options['players'])
+        else:
+            editor_boards, player_board = self.create_fixtures(options['editors'], options['players'])
+
+        users = [Editor(self, f'loadtest-editor-{i}', board) for i, board in enumerate(editor_boards)]
+        users += [Player(self, f'loadtest-player-{i}', player_board) for i in range(options['players'])]
+
+        self.stdout.write(f"Logging in {len(users)} virtual users against {options['url']}...")
+        elapsed = asyncio.run(self.run_load(users, options['duration'], options['ramp_up']))
+        self.report(elapsed)
+
+    # --- Fixtures ---
+
+    def _player_solution(self):
+        # One color per row, endpoints on the first and last column: the straight rows solve the board.
+        return [
+            {'color': COLORS[row - 1], 'path_data': [{'x': x, 'y': row} for x in range(1, PLAYER_BOARD_SIZE + 1)]}
+            for row in range(1, PLAYER_BOARD_SIZE + 1)
+        ]
+
+    def _board_dict(self, board):
+        return {
+            'id': board.id, 'cols': board.cols, 'rows': board.rows,
+            'points': list(board.points.values('id', 'x', 'y')),
+        }
+
+    @transaction.atomic
+    def create_fixtures(self, editors, players):
+        background = BackgroundImage.objects.order_by('id').first()
+        if background is None:
+            raise CommandError("At least one BackgroundImage is required to create load test boards.")
+
+        def get_user(username):
+            user, created = User.objects.get_or_create(username=username)
+            if created or not user.check_password(LOADTEST_PASSWORD):
+                user.set_password(LOADTEST_PASSWORD)
+                user.save()
+            return user
+
+        editor_boards = []
+        for i in range(editors):
+            user = get_user(f'loadtest-editor-{i}')
+            board, created = BoardGame.objects.get_or_create(
+                user=user, name='Load test: editor board',
+                defaults={'background': background, 'cols': 8, 'rows': 8, 'auto_save_enabled': True},
+            )
+            if created:
+                for n, color in enumerate(COLORS[:3]):
+                    Point.objects.create(route=board, x=1, y=n + 1, color=color)
+                    Point.objects.create(route=board, x=8, y=n + 1, color=color)
+            editor_boards.append(self._board_dict(board))
+
+        for i in range(players):
+            get_user(f'loadtest-player-{i}')
+        owner = get_user('loadtest-editor-owner')
+        player_board, created = BoardGame.objects.get_or_create(
+            user=owner, name=PLAYER_BOARD_NAME,
+            defaults={'background': background, 'cols': PLAYER_BOARD_SIZE, 'rows': PLAYER_BOARD_SIZE},
+        )
+        if created:
+            for path in self._player_solution():
+                for coord in (path['path_data'][0], path['path_data'][-1]):
+                    Point.objects.create(route=player_board, x=coord['x'], y=coord['y'], color=path['color'])
+        return editor_boards, {'id': player_board.id, 'solution': self._player_solution()}
+
+    def load_fixtures(self, editors, players):
+        boards = {
+            b.user.username: b for b in BoardGame.objects.filter(
+                user__username__startswith='loadtest-editor-'
+            ).select_related('user')
+        }
+        missing = [f'loadtest-editor-{i}' for i in range(editors) if f'loadtest-editor-{i}' not in boards]
+        if missing or PLAYER_BOARD_NAME not in {b.name for b in boards.values()}:
+            raise CommandError("Load test fixtures are missing; run once without --no-setup.")
+        player_board = next(b for b in boards.values() if b.name == PLAYER_BOARD_NAME)
+        editor_boards = [self._board_dict(boards[f'loadtest-editor-{i}']) for i in range(editors)]
+        return editor_boards, {'id': player_board.id, 'solution': self._player_solution()}
+
+    # --- Load generation ---
+
+    async def run_load(self, users, duration, ramp_up):
+        # Logins are not part of the measurement.
+        semaphore = asyncio.Semaphore(50)
+
+        async def login(user):
+            async with semaphore:
+                await user.login()
+
+        await asyncio.gather(*(login(u) for u in users))
+
+        self.measuring = True
+        start = time.monotonic()
+        deadline = start + duration
+
+        async def start_user(user, delay):
+            await asyncio.sleep(delay)
+            await user.run(deadline)
+
+        random.shuffle(users)
+        step = ramp_up / len(users) if users else 0
+        try:
+            await asyncio.gather(*(start_user(u, i * step) for i, u in enumerate(users)))
+        finally:
+            self.measuring = False
+            await asyncio.gather(*(u.conn.close() for u in users))
+        return time.monotonic() - start
+
+    def report(self, elapsed):
+        def percentile(sorted_values, fraction):
+            index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+            return sorted_values[index] * 1000
+
+        header = f"{'endpoint':<30} {'requests':>9} {'req/s':>8} {'errors':>7} {'err%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        total = 0
+        for endpoint in sorted(self.stats.latencies):
+            values = sorted(self.stats.latencies[endpoint])
+            errors = self.stats.errors[endpoint]
+            total += len(values)
+            self.stdout.write(
+                f"{endpoint:<30} {len(values):>9} {len(values) / elapsed:>8.1f} {errors:>7} "
+                f"{100 * errors / len(values):>5.1f}% {percentile(values, 0.50):>8.1f} "
+                f"{percentile(values, 0.95):>8.1f} {percentile(values, 0.99):>8.1f} "
+                f"{statistics.fmean(values) * 1000:>8.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)."))
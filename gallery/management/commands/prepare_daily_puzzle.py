@@ -0,0 +1,41 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from gallery.daily import pick_board, warm
+from gallery.models import BoardGame, DailyPuzzle
+
+class Command(BaseCommand):
+    help = (
+        "Warms the caches of a day's puzzle (tomorrow's by default): renders its preview, solves it and "
+        "pre-populates its board data, daily entry and leaderboard. Run it shortly before midnight."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=datetime.date.fromisoformat, default=None, help="Day to prepare, YYYY-MM-DD (default: tomorrow).")
+        parser.add_argument('--board', type=int, default=None, help="Schedule this board for the day, replacing any scheduled one.")
+        parser.add_argument('--auto', action='store_true', help="If no board is scheduled for the day, pick one that wasn't featured recently.")
+        parser.add_argument('--recent-days', type=int, default=30, help="With --auto, skip boards featured in this many days before (default: 30).")
+
+    def handle(self, *args, **options):
+        date = options['date'] or timezone.localdate() + datetime.timedelta(days=1)
+
+        if options['board'] is not None:
+            if not BoardGame.objects.filter(pk=options['board']).exists():
+                raise CommandError(f"Board {options['board']} does not exist.")
+            puzzle, _ = DailyPuzzle.objects.update_or_create(date=date, defaults={'board_id': options['board']})
+        else:
+            puzzle = DailyPuzzle.objects.filter(date=date).first()
+            if puzzle is None and options['auto']:
+                board = pick_board(date, recent_days=options['recent_days'])
+                if board is None:
+                    raise CommandError(f"No board is eligible for {date}.")
+                puzzle = DailyPuzzle.objects.create(date=date, board=board)
+                self.stdout.write(f"Scheduled board {board.id} ({board.name}) for {date}.")
+            if puzzle is None:
+                raise CommandError(f"No puzzle is scheduled for {date}; pass --board or --auto.")
+
+        timeout = warm(puzzle)
+        self.stdout.write(self.style.SUCCESS(
+            f"Prepared board {puzzle.board_id} for {date}; caches stay warm for {timeout // 60} minutes."
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from gallery.models import BoardGame
+from gallery.solver import max_nodes, update_board_difficulty
+
+class Command(BaseCommand):
+    help = "Rates the difficulty of boards whose points or dimensions changed since their last rating."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Re-rate every board, not only stale ones.")
+        parser.add_argument('--limit', type=int, default=None, help="Rate at most this many boards.")
+        parser.add_argument('--max-nodes', type=int, default=None, help="Solver node budget per board (default: GALLERY_DIFFICULTY['MAX_NODES']).")
+
+    def handle(self, *args, **options):
+        boards = BoardGame.objects.all() if options['all'] else BoardGame.objects.filter(difficulty_stale=True)
+        board_ids = list(boards.order_by('id').values_list('id', flat=True)[:options['limit']])
+        node_limit = options['max_nodes'] or max_nodes()
+
+        rated = 0
+        for board_id in board_ids:
+            result = update_board_difficulty(board_id, node_limit=node_limit, force=options['all'])
+            if result is None:
+                continue
+            board, score = result
+            rated += 1
+            self.stdout.write(f"Board {board_id} ({board.cols}x{board.rows}): {'unsolvable' if score is None else score}")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Rated {rated} boards."))
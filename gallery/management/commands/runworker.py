@@ -0,0 +1,56 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from gallery import jobs
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs (gallery.jobs) in a thread or process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help="Jobs run at the same time.")
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                            help="Use processes for CPU-bound jobs such as rate_board.")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between polls when idle.")
+        parser.add_argument('--once', action='store_true', help="Exit once no due jobs are left.")
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        concurrency = max(options['concurrency'], 1)
+        poll_interval = options['poll_interval']
+        if options['pool'] == 'process':
+            # Forked children must not share the parent's database connection.
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=concurrency)
+        else:
+            pool = ThreadPoolExecutor(max_workers=concurrency)
+
+        self.stdout.write(f"Worker {worker_id} started ({concurrency} {options['pool']} workers).")
+        running = set()
+        succeeded = failed = 0
+        try:
+            with pool:
+                while True:
+                    if len(running) < concurrency:
+                        for job_id in jobs.claim(worker_id, concurrency - len(running)):
+                            running.add(pool.submit(jobs.run_job_in_pool, job_id, worker_id))
+                    if not running:
+                        if options['once']:
+                            break
+                        time.sleep(poll_interval)
+                        continue
+                    finished, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future.result():
+                            succeeded += 1
+                        else:
+                            failed += 1
+                    jobs.extend_leases(worker_id)
+        except KeyboardInterrupt:
+            # Leaving the pool's context waited for the running jobs; anything not
+            # finished is picked up by another worker once its lease expires.
+            self.stdout.write("Interrupted.")
+        self.stdout.write(self.style.SUCCESS(f"Done. {succeeded} jobs succeeded, {failed} failed."))
@@ -0,0 +1,7 @@
+# Gameplay counters exposed through the project-wide metrics registry (/metrics/).
+from path_editor.metrics import REGISTRY
+
+PATHS_SAVED = REGISTRY.counter('gallery_paths_saved_total', 'Paths stored by save_all_paths_api.')
+SESSIONS_SOLVED = REGISTRY.counter('gallery_sessions_solved_total', 'Game sessions that transitioned to solved.')
+SESSION_RESETS = REGISTRY.counter('gallery_session_resets_total', 'Game session progress resets (GamePlaySession.reset_progress).')
+SOLVER_CALLS = REGISTRY.counter('gallery_solver_calls_total', 'Solution checks run against a board.')
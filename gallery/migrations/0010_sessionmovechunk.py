@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-19 17:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0009_gameplaysession_alter_point_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionMoveChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('cols', models.PositiveSmallIntegerField()),
+                ('base_ts', models.BigIntegerField()),
+                ('move_count', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='move_chunks', to='gallery.gameplaysession')),
+            ],
+            options={
+                'ordering': ['session', 'seq'],
+                'unique_together': {('session', 'seq')},
+            },
+        ),
+    ]
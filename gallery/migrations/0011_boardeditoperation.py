@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-19 17:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0010_sessionmovechunk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardEditOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('forward', models.JSONField()),
+                ('inverse', models.JSONField()),
+                ('undone', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='edit_operations', to='gallery.boardgame')),
+            ],
+            options={
+                'ordering': ['board', 'seq'],
+                'unique_together': {('board', 'seq')},
+            },
+        ),
+    ]
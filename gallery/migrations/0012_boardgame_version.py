@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0011_boardeditoperation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardgame',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.20 on 2026-10-19 17:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+import re
+
+# A frozen copy of gallery.search.tokenize as of this migration, so later changes to
+# the tokenizer don't change what this migration does.
+TOKEN_RE = re.compile(r'\w+')
+MAX_TOKEN_LENGTH = 50
+
+
+def tokenize(text):
+    tokens = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        token = token[:MAX_TOKEN_LENGTH]
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def backfill_search_index(apps, schema_editor):
+    BoardGame = apps.get_model('gallery', 'BoardGame')
+    BoardSearchToken = apps.get_model('gallery', 'BoardSearchToken')
+    Point = apps.get_model('gallery', 'Point')
+    color_counts = dict(
+        Point.objects.order_by().values_list('route_id').annotate(n=Count('color', distinct=True))
+    )
+    tokens = []
+    for board in BoardGame.objects.only('id', 'name').iterator():
+        tokens.extend(BoardSearchToken(board_id=board.id, token=token) for token in tokenize(board.name))
+        if color_counts.get(board.id):
+            BoardGame.objects.filter(pk=board.id).update(color_count=color_counts[board.id])
+    BoardSearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0012_boardgame_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardgame',
+            name='color_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.CreateModel(
+            name='BoardSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='gallery.boardgame')),
+            ],
+            options={
+                'unique_together': {('token', 'board')},
+            },
+        ),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0013_board_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardgame',
+            name='difficulty',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='boardgame',
+            name='difficulty_stale',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0015_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boardgame',
+            name='preview_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
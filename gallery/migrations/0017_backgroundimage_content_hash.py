@@ -0,0 +1,24 @@
+# Generated by Django 4.2.20 on 2026-10-19 18:07
+
+from django.db import migrations, models
+import gallery.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0016_boardgame_preview_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backgroundimage',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='backgroundimage',
+            name='image',
+            field=models.ImageField(upload_to=gallery.models.background_upload_to),
+        ),
+    ]
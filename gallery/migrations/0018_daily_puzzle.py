@@ -0,0 +1,38 @@
+# Generated by Django 4.2.20 on 2026-10-19 18:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_solved_at(apps, schema_editor):
+    # Best guess for sessions solved before the field existed: their last save.
+    GamePlaySession = apps.get_model('gallery', 'GamePlaySession')
+    GamePlaySession.objects.filter(is_solved=True).update(solved_at=models.F('last_updated'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0017_backgroundimage_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameplaysession',
+            name='solved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_solved_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='DailyPuzzle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_features', to='gallery.boardgame')),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+    ]
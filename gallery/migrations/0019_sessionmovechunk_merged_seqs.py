@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0018_daily_puzzle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionmovechunk',
+            name='merged_seqs',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -1,41 +1,103 @@
-from django.db import models
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.contrib.auth.models import User
-from PIL import Image
 from django.core.exceptions import ValidationError
 from django.db.models import JSONField
-from django.db.models.signals import post_delete # Import post_delete
+from django.db.models.signals import post_delete, post_save # Import post_delete
 from django.dispatch import receiver # Already imported in the original file but good to ensure
+from path_editor.caching import bump_generation
+from .metrics import SESSION_RESETS
+from .solution import invalidate_board_snapshot
+
+def max_board_dimension():
+    return getattr(settings, 'GALLERY_BOARD_MAX_DIMENSION', 12)
+
+class StaleBoardVersion(Exception):
+    """Raised when an editor write is based on an outdated BoardGame.version."""
+
+def hash_file(file):
+    """SHA-256 hex digest of a Django File, read in chunks."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+def content_addressed_name(content_hash, filename):
+    """Storage name of an upload: backgrounds/ab/abcdef....png, derived from the file's content only."""
+    extension = os.path.splitext(filename)[1].lower()
+    return f'backgrounds/{content_hash[:2]}/{content_hash}{extension}'
+
+def background_upload_to(instance, filename):
+    return content_addressed_name(instance.content_hash, filename)
 
 class BackgroundImage(models.Model):
-    image = models.ImageField(upload_to='backgrounds/')
+    image = models.ImageField(upload_to=background_upload_to)
     name = models.CharField(max_length=100)
     width = models.PositiveIntegerField(editable=False, null=True)
     height = models.PositiveIntegerField(editable=False, null=True)
+    # SHA-256 of the file. Null only for legacy uploads not yet hashed by the dedupe_backgrounds command.
+    content_hash = models.CharField(max_length=64, unique=True, null=True, editable=False)
+
+    @classmethod
+    def get_or_create_from_upload(cls, uploaded_file, name):
+        """Returns (background, created); re-uploading an existing image returns its row."""
+        content_hash = hash_file(uploaded_file)
+        existing = cls.objects.filter(content_hash=content_hash).first()
+        if existing is not None:
+            return existing, False
+        background = cls(name=name, image=uploaded_file, content_hash=content_hash)
+        background.save()
+        return background, True
+
+    def clean(self):
+        super().clean()
+        if self.image and not self.image._committed:
+            self.content_hash = hash_file(self.image)
+            existing = BackgroundImage.objects.filter(content_hash=self.content_hash).exclude(pk=self.pk).first()
+            if existing is not None:
+                raise ValidationError({'image': f"This image is already uploaded as background '{existing.name}' (id {existing.pk})."})
 
     def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:
+            # New upload: store it under its content hash, reusing the file if it is already stored.
+            self.content_hash = hash_file(self.image)
+            stored_name = content_addressed_name(self.content_hash, self.image.name)
+            if self.image.storage.exists(stored_name):
+                self.image.name = stored_name
+                self.image._committed = True
         super().save(*args, **kwargs)
 
+        if self.image:
+            # Opening the file to read its size is slow on remote storage; do it in the background.
+            from .jobs import enqueue
+            if enqueue('probe_background_image', {'image_id': self.pk}) is None:
+                # The job ran inline (JOB_QUEUE['EAGER']); pick up the size it stored.
+                self.refresh_from_db(fields=['width', 'height'])
+
+    def update_dimensions(self):
+        """Reads the image file's size into width/height (None if it can't be read)."""
+        from PIL import Image  # Deferred: Pillow is only needed by the probe job, not at startup
+
+        width, height = None, None
         if self.image and hasattr(self.image, 'path'):
             try:
-                img = Image.open(self.image.path)
-                current_width, current_height = img.size
-
-                if self.width != current_width or self.height != current_height:
-                    self.width = current_width
-                    self.height = current_height
-                    BackgroundImage.objects.filter(pk=self.pk).update(width=self.width, height=self.height)
-            except FileNotFoundError:
-                if self.width is not None or self.height is not None:
-                    self.width = None
-                    self.height = None
-                    BackgroundImage.objects.filter(pk=self.pk).update(width=self.width, height=self.height)
-                pass
-            except Exception as e:
-                if self.width is not None or self.height is not None:
-                    self.width = None
-                    self.height = None
-                    BackgroundImage.objects.filter(pk=self.pk).update(width=self.width, height=self.height)
+                with Image.open(self.image.path) as img:
+                    width, height = img.size
+            except Exception:
                 pass
+        if self.width != width or self.height != height:
+            self.width, self.height = width, height
+            BackgroundImage.objects.filter(pk=self.pk).update(width=width, height=height)
 
     def __str__(self):
         return self.name
@@ -50,16 +112,43 @@ class BoardGame(models.Model):
     cols = models.IntegerField(default=6)
     rows = models.IntegerField(default=6)
     auto_save_enabled = models.BooleanField(default=False) 
+    version = models.PositiveIntegerField(default=0) # Bumped by every editor write, see claim_version()
+    color_count = models.PositiveIntegerField(default=0, db_index=True) # Denormalized for search facets, see refresh_color_count()
+    difficulty = models.FloatField(null=True, blank=True, db_index=True) # 0-100 from gallery.solver, None if unrated/unsolvable
+    difficulty_stale = models.BooleanField(default=True, db_index=True) # Points or size changed since the last rating
+    preview_fingerprint = models.CharField(max_length=16, blank=True, editable=False) # Current preview file, see gallery.previews
 
     def __str__(self):
         return f"{self.name} ({self.user.username})"
 
+    def claim_version(self, expected_version=None):
+        """
+        Bumps the board's edit version with one conditional UPDATE. When `expected_version`
+        is given and another editor has saved since, raises StaleBoardVersion instead.
+        Call inside the transaction that applies the edit so a failed edit rolls it back.
+        """
+        boards = BoardGame.objects.filter(pk=self.pk)
+        if expected_version is not None:
+            boards = boards.filter(version=expected_version)
+        if not boards.update(version=models.F('version') + 1):
+            raise StaleBoardVersion(f"Board {self.pk} is no longer at version {expected_version}.")
+        if expected_version is not None:
+            self.version = expected_version + 1
+        else:
+            self.refresh_from_db(fields=['version'])
+        invalidate_board_snapshot(self.pk) # The cached board data carries the version
+
+    def delete(self, *args, **kwargs):
+        with board_deletion(self.pk):
+            return super().delete(*args, **kwargs)
+
     def save(self, *args, **kwargs):
         # Validate dimensions
-        if not (1 <= self.cols <= 12):
-            raise ValidationError("Cols must be between 1 and 12.")
-        if not (1 <= self.rows <= 12):
-            raise ValidationError("Rows must be between 1 and 12.")
+        max_dimension = max_board_dimension()
+        if not (1 <= self.cols <= max_dimension):
+            raise ValidationError(f"Cols must be between 1 and {max_dimension}.")
+        if not (1 <= self.rows <= max_dimension):
+            raise ValidationError(f"Rows must be between 1 and {max_dimension}.")
 
         original_cols_from_db, original_rows_from_db = None, None
         is_update_and_fetched_originals = False
@@ -81,6 +170,11 @@ class BoardGame(models.Model):
             board_shrank_cols = self.cols < original_cols_from_db
             board_shrank_rows = self.rows < original_rows_from_db
 
+            if self.cols != original_cols_from_db or self.rows != original_rows_from_db:
+                BoardGame.objects.filter(pk=self.pk).update(difficulty_stale=True)
+                self.difficulty_stale = True
+                schedule_difficulty_rating(self.pk)
+
             if board_shrank_cols or board_shrank_rows:
                 # Delete points that are now out of bounds due to dimension change.
                 # The post_delete signal on Point model will handle resetting game sessions.
@@ -168,9 +262,8 @@ class Point(models.Model):
                 trigger_session_reset = True
 
         if trigger_session_reset:
-            if self.route: # Ensure route is set
-                for session in self.route.play_sessions.all():
-                    session.reset_progress()
+            if self.route_id: # Ensure route is set
+                request_session_reset(self.route_id)
 
 # --- New Models for Gameplay ---
 
@@ -178,6 +271,7 @@ class GamePlaySession(models.Model):
     player = models.ForeignKey(User, on_delete=models.CASCADE, related_name='game_sessions')
     board_game = models.ForeignKey(BoardGame, on_delete=models.CASCADE, related_name='play_sessions')
     is_solved = models.BooleanField(default=False)
+    solved_at = models.DateTimeField(null=True, blank=True) # When is_solved last became true; ranks leaderboards
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -188,18 +282,24 @@ class GamePlaySession(models.Model):
         return f"{self.player.username}'s session on '{self.board_game.name}' (Solved: {self.is_solved})"
 
     def reset_progress(self):
+        SESSION_RESETS.inc()
         self.paths.all().delete() 
+        self.move_chunks.all().delete()
         
         was_solved_before_reset = self.is_solved 
         
         if self.is_solved:
             self.is_solved = False
+            self.solved_at = None
             
         fields_to_update = ['last_updated']
         if was_solved_before_reset: 
-            fields_to_update.append('is_solved')
+            fields_to_update += ['is_solved', 'solved_at']
         
         self.save(update_fields=fields_to_update)
+        if was_solved_before_reset:
+            from .daily import invalidate_leaderboard
+            invalidate_leaderboard(self.board_game_id)
 
 class Path(models.Model):
     game_play_session = models.ForeignKey(GamePlaySession, on_delete=models.CASCADE, related_name='paths')
@@ -221,13 +321,15 @@ class Path(models.Model):
             raise ValidationError("Path must be associated with a game play session.")
 
         board_game = self.game_play_session.board_game
-        points_of_color = Point.objects.filter(route=board_game, color=self.color)
-        if points_of_color.count() == 0:
+        # One query; a third row is only fetched to detect boards with too many points of this color.
+        points_of_color = list(Point.objects.filter(route=board_game, color=self.color)[:3])
+        if len(points_of_color) == 0:
             raise ValidationError(f"No points found for color {self.color} on the board '{board_game.name}'.")
-        if points_of_color.count() != 2:
+        if len(points_of_color) != 2:
+            found = Point.objects.filter(route=board_game, color=self.color).count()
             raise ValidationError(
                 f"Board '{board_game.name}' must have exactly two points for color {self.color}. "
-                f"Found {points_of_color.count()}."
+                f"Found {found}."
             )
 
         if not isinstance(self.path_data, list) or not self.path_data:
@@ -235,6 +337,11 @@ class Path(models.Model):
         if len(self.path_data) < 2:
             raise ValidationError("Path data must contain at least two coordinates (start and end points).")
 
+        # Single pass over the path: shape, bounds, contiguity and self-intersection,
+        # with visited cells tracked in a flat occupancy array indexed by (y-1)*cols + (x-1).
+        cols, rows = board_game.cols, board_game.rows
+        visited = bytearray(cols * rows)
+        prev_x = prev_y = None
         for i, coord_dict in enumerate(self.path_data):
             if not (isinstance(coord_dict, dict) and 
                     'x' in coord_dict and 'y' in coord_dict and
@@ -243,15 +350,26 @@ class Path(models.Model):
                     f"Path segment {i} ({coord_dict}) is not a valid integer coordinate dictionary like {{'x': X, 'y': Y}}."
                 )
             x, y = coord_dict['x'], coord_dict['y']
-            if not (1 <= x <= board_game.cols and 1 <= y <= board_game.rows):
+            if not (1 <= x <= cols and 1 <= y <= rows):
+                raise ValidationError(
+                    f"Path segment {i} ({x}, {y}) is out of board bounds ({cols}x{rows})."
+                )
+            if prev_x is not None and abs(x - prev_x) + abs(y - prev_y) != 1:
+                raise ValidationError(
+                    f"Path for color {self.color} is not contiguous. "
+                    f"Segment from ({prev_x},{prev_y}) to ({x},{y}) is invalid."
+                )
+            cell = (y - 1) * cols + (x - 1)
+            if visited[cell]:
                 raise ValidationError(
-                    f"Path segment {i} ({x}, {y}) is out of board bounds ({board_game.cols}x{board_game.rows})."
+                    f"Path for color {self.color} self-intersects (visits the same cell more than once)."
                 )
+            visited[cell] = 1
+            prev_x, prev_y = x, y
 
         start_coord_data = self.path_data[0]
         end_coord_data = self.path_data[-1]
-        p1 = points_of_color.first()
-        p2 = points_of_color.last()
+        p1, p2 = points_of_color
 
         path_starts_on_p1 = (start_coord_data['x'] == p1.x and start_coord_data['y'] == p1.y)
         path_ends_on_p2 = (end_coord_data['x'] == p2.x and end_coord_data['y'] == p2.y)
@@ -266,48 +384,260 @@ class Path(models.Model):
                 f"({end_coord_data['x']},{end_coord_data['y']})."
             )
 
-        for i in range(len(self.path_data) - 1):
-            curr = self.path_data[i]
-            next_ = self.path_data[i+1]
-            dx = abs(curr['x'] - next_['x'])
-            dy = abs(curr['y'] - next_['y'])
-            if not ((dx == 1 and dy == 0) or (dx == 0 and dy == 1)):
-                raise ValidationError(
-                    f"Path for color {self.color} is not contiguous. "
-                    f"Segment from ({curr['x']},{curr['y']}) to ({next_['x']},{next_['y']}) is invalid."
-                )
-
-        path_coords_as_tuples = [(seg['x'], seg['y']) for seg in self.path_data]
-        if len(path_coords_as_tuples) != len(set(path_coords_as_tuples)):
-            raise ValidationError(
-                f"Path for color {self.color} self-intersects (visits the same cell more than once)."
-            )
-
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
         if self.game_play_session:
             self.game_play_session.save(update_fields=['last_updated'])
 
+class SessionMoveChunk(models.Model):
+    """
+    One batch of the append-only move log of a GamePlaySession. Moves are packed
+    records (see gallery.movelog) with cells encoded against the board's `cols` at
+    the time of the append and timestamps relative to `base_ts` (ms since epoch).
+    """
+    session = models.ForeignKey(GamePlaySession, on_delete=models.CASCADE, related_name='move_chunks')
+    seq = models.PositiveIntegerField()
+    cols = models.PositiveSmallIntegerField()
+    base_ts = models.BigIntegerField()
+    move_count = models.PositiveIntegerField()
+    data = models.BinaryField()
+    # [seq, index of its first move] per append merged into this chunk by compaction; empty if unmerged
+    merged_seqs = JSONField(default=list, blank=True)
+
+    class Meta:
+        unique_together = ('session', 'seq')
+        ordering = ['session', 'seq']
+
+    def __str__(self):
+        return f"Move chunk {self.seq} ({self.move_count} moves) of session {self.session_id}"
+
+class BoardSearchToken(models.Model):
+    """
+    One lower-cased word of a board's name (see gallery.search). The (token, board)
+    index serves prefix searches as index range scans.
+    """
+    board = models.ForeignKey(BoardGame, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=50)
+
+    class Meta:
+        unique_together = ('token', 'board')
+
+    def __str__(self):
+        return f"{self.token} -> board {self.board_id}"
+
+class BoardEditOperation(models.Model):
+    """
+    One entry of a board's server-side undo/redo log (see gallery.editlog): the
+    operations an edit applied and the inverse operations that revert it.
+    """
+    board = models.ForeignKey(BoardGame, on_delete=models.CASCADE, related_name='edit_operations')
+    seq = models.PositiveIntegerField()
+    forward = JSONField()
+    inverse = JSONField()
+    undone = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('board', 'seq')
+        ordering = ['board', 'seq']
+
+    def __str__(self):
+        return f"Edit {self.seq} on board {self.board_id}{' (undone)' if self.undone else ''}"
+
+class Job(models.Model):
+    """
+    A background job (see gallery.jobs). Workers lease queued jobs by setting
+    `locked_by`/`locked_until`; a job whose lease expired is claimed again. Jobs are
+    deleted once they succeed, so the table only holds pending and failed work.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (FAILED, 'Failed')]
+
+    name = models.CharField(max_length=100)
+    payload = JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    unique_key = models.CharField(max_length=64, blank=True, db_index=True) # Set for enqueue(unique=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'run_after'])]
+        ordering = ['run_after', 'id']
+
+    def __str__(self):
+        return f"Job {self.id} {self.name} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+class DailyPuzzle(models.Model):
+    """
+    The board featured as puzzle of the day on `date` (see gallery.daily). The
+    prepare_daily_puzzle command warms its caches before the day starts.
+    """
+    date = models.DateField(unique=True)
+    board = models.ForeignKey(BoardGame, on_delete=models.CASCADE, related_name='daily_features')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date}: {self.board.name}"
+
+# --- Game session resets ---
+
+_session_resets = threading.local()
+
+def reset_board_sessions(board_id):
+    """Resets the progress of every game session on a board with a few bulk queries."""
+    Path.objects.filter(game_play_session__board_game_id=board_id).delete()
+    SessionMoveChunk.objects.filter(session__board_game_id=board_id).delete()
+    reset_count = GamePlaySession.objects.filter(board_game_id=board_id).update(
+        is_solved=False, solved_at=None, last_updated=timezone.now()
+    )
+    SESSION_RESETS.inc(reset_count)
+
+def refresh_color_count(board_id):
+    colors = Point.objects.filter(route_id=OuterRef('pk')).order_by().values('route_id').annotate(
+        n=Count('color', distinct=True)
+    ).values('n')
+    # Point changes also invalidate the solver rating.
+    BoardGame.objects.filter(pk=board_id).update(color_count=Coalesce(Subquery(colors), 0), difficulty_stale=True)
+    # A queryset update sends no post_save, so refresh the listings (and search facets) here.
+    bump_generation(BOARD_LISTING)
+    transaction.on_commit(lambda: bump_generation(BOARD_LISTING))
+    schedule_difficulty_rating(board_id)
+
+def schedule_difficulty_rating(board_id):
+    """Queues a re-rating of a stale board, delayed so a burst of edits is rated once."""
+    from .jobs import enqueue
+    delay = getattr(settings, 'GALLERY_DIFFICULTY', {}).get('RATE_DELAY_SECONDS', 30)
+    enqueue('rate_board', {'board_id': board_id}, delay=delay, unique=True)
+
+def schedule_preview_render(board_id):
+    """Queues a re-render of the board's preview image, delayed so a burst of edits renders once."""
+    from .jobs import enqueue
+    delay = getattr(settings, 'GALLERY_PREVIEWS', {}).get('RENDER_DELAY_SECONDS', 5)
+    enqueue('render_board_preview', {'board_id': board_id}, delay=delay, unique=True)
+
+def _board_points_changed(board_id):
+    # Every point add/move/delete funnels through request_session_reset(), so this is
+    # also where the denormalized color_count and the preview are kept up to date.
+    reset_board_sessions(board_id)
+    refresh_color_count(board_id)
+    schedule_preview_render(board_id)
+
+def request_session_reset(board_id):
+    if board_id in getattr(_session_resets, 'deleting', ()):
+        return # Cascaded from deleting the board: nothing left to reset, recount or render
+    pending = getattr(_session_resets, 'pending', None)
+    if pending is not None:
+        pending.add(board_id)
+    else:
+        _board_points_changed(board_id)
+
+@contextmanager
+def defer_session_resets():
+    """
+    Collects the session resets requested by point changes inside the block and runs
+    them once per board when the block succeeds, instead of once per changed point.
+    """
+    if getattr(_session_resets, 'pending', None) is not None: # Nested: the outer block resets
+        yield
+        return
+    _session_resets.pending = set()
+    try:
+        yield
+        board_ids = _session_resets.pending
+    finally:
+        _session_resets.pending = None
+    for board_id in board_ids:
+        _board_points_changed(board_id)
+
+@contextmanager
+def board_deletion(board_id):
+    """
+    Marks the board as being deleted for the block, so its cascaded point deletes don't
+    each reset sessions, recount colors and queue jobs for a board that is going away.
+    """
+    if not hasattr(_session_resets, 'deleting'):
+        _session_resets.deleting = set()
+    _session_resets.deleting.add(board_id)
+    try:
+        yield
+    finally:
+        _session_resets.deleting.discard(board_id)
+    pending = getattr(_session_resets, 'pending', None)
+    if pending is not None: # Requested earlier in an enclosing defer_session_resets block
+        pending.discard(board_id)
+
 # Signal handler for Point deletion
 @receiver(post_delete, sender=Point)
 def point_post_delete_handler(sender, instance, **kwargs):
     """
     When a Point is deleted, reset progress for all game sessions on its board.
     """
-    try:
-        board = instance.route
-        # The board (instance.route) should generally exist due to ForeignKey(on_delete=CASCADE)
-        # behavior, but a check is safe.
-        if board:
-            # If the board itself is in the process of being deleted, its play_sessions
-            # will also be cascade-deleted. Calling reset_progress on sessions that
-            # are about to be deleted is redundant but generally harmless.
-            for session in board.play_sessions.all(): # play_sessions is related_name
-                session.reset_progress()
-    except BoardGame.DoesNotExist:
-        # This might occur if the board was deleted before or around the same time
-        # this signal is processed. In such a case, related sessions are likely gone too.
-        pass
-    # No explicit catch for GamePlaySession.DoesNotExist as .all() on a related manager
-    # will simply return an empty queryset if the board itself has no sessions or is gone.
\ No newline at end of file
+    # Skipped if the board itself is being deleted (see board_deletion).
+    request_session_reset(instance.route_id)
+
+# Keep cached grading snapshots (gallery.solution.get_board_snapshot) in sync with the board.
+@receiver(post_save, sender=Point)
+@receiver(post_delete, sender=Point)
+def point_changed_invalidate_snapshot(sender, instance, **kwargs):
+    invalidate_board_snapshot(instance.route_id)
+
+@receiver(post_save, sender=BoardGame)
+@receiver(post_delete, sender=BoardGame)
+def board_changed_invalidate_snapshot(sender, instance, **kwargs):
+    invalidate_board_snapshot(instance.pk)
+
+@receiver(post_delete, sender=BoardGame)
+def board_deleted_cancel_jobs(sender, instance, **kwargs):
+    # Also covers queryset deletes, which bypass board_deletion and queue jobs per point.
+    from .jobs import cancel
+    for name in ('rate_board', 'render_board_preview'):
+        cancel(name, {'board_id': instance.pk})
+
+BOARD_LISTING = 'gallery:board-listing' # Cache generation of the board listings, see path_editor.caching
+
+def board_summary_generation(board_id):
+    # Cache generation of one board's summary (name, preview, rating), see gallery.daily.
+    return f'gallery:board-summary:{board_id}'
+
+def board_summary_changed(board_id):
+    """Refreshes the cached listings and the board's own summary."""
+    bump_generation(BOARD_LISTING)
+    bump_generation(board_summary_generation(board_id))
+
+@receiver(post_save, sender=BoardGame)
+@receiver(post_delete, sender=BoardGame)
+def board_changed_refresh_listing(sender, instance, **kwargs):
+    board_id = instance.pk
+    board_summary_changed(board_id)
+    # Again after commit, in case a concurrent request cached the pre-commit listing meanwhile.
+    transaction.on_commit(lambda: board_summary_changed(board_id))
+
+DAILY_SCHEDULE = 'gallery:daily-schedule' # Cache generation of the puzzle-of-the-day entries
+
+@receiver(post_save, sender=DailyPuzzle)
+@receiver(post_delete, sender=DailyPuzzle)
+def daily_puzzle_changed(sender, instance, **kwargs):
+    bump_generation(DAILY_SCHEDULE)
+    transaction.on_commit(lambda: bump_generation(DAILY_SCHEDULE))
+
+@receiver(post_save, sender=BoardGame)
+def board_saved_update_search_index(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or 'name' in update_fields:
+        from .search import index_board_name
+        index_board_name(instance, created=created)
+
+@receiver(post_save, sender=BoardGame)
+def board_saved_schedule_preview(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or {'cols', 'rows', 'background'} & set(update_fields):
+        schedule_preview_render(instance.pk)
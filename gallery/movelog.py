@@ -0,0 +1,192 @@
+"""
+Append-only move log for game sessions.
+
+Every append stores one SessionMoveChunk row holding the batch as packed 10-byte
+records (little endian):
+
+    u32  color (24-bit RGB) | op << 24
+    u16  cell index, (y-1)*cols + (x-1)
+    u32  milliseconds since the chunk's base_ts
+
+Appending costs one small SELECT and one INSERT, under a lock on the session row so
+concurrent appends get distinct seqs. Every COMPACT_EVERY appends the log is
+compacted: consecutive chunks recorded with the same board width are merged into one
+row and the oldest moves beyond the size cap are dropped. Merged rows remember where
+each append's moves start, so a replay resumed mid-row skips the moves already sent.
+"""
+import struct
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import GamePlaySession, SessionMoveChunk
+
+RECORD = struct.Struct('<IHI')
+OPS = {'start': 0, 'step': 1, 'retract': 2, 'clear': 3}
+OP_NAMES = {code: name for name, code in OPS.items()}
+MAX_OFFSET_MS = 2 ** 32 - 1
+
+
+def _config(name, default):
+    return getattr(settings, 'GALLERY_MOVE_LOG', {}).get(name, default)
+
+
+def max_moves():
+    return _config('MAX_MOVES', 50000)
+
+
+def max_batch():
+    return _config('MAX_BATCH', 2000)
+
+
+def compact_every():
+    return _config('COMPACT_EVERY', 32)
+
+
+def _parse_color(color):
+    if not (isinstance(color, str) and len(color) == 7 and color[0] == '#'):
+        raise ValueError
+    return int(color[1:], 16)
+
+
+def encode_moves(moves, cols, rows, base_ts=None):
+    """
+    Packs a list of {'op', 'color', 'x', 'y', 't'} dicts (t in ms since epoch, optional)
+    and returns (data, base_ts). Raises ValidationError on malformed moves.
+    """
+    now = int(time.time() * 1000)
+    if base_ts is None:
+        timestamps = [m.get('t') for m in moves if isinstance(m, dict) and isinstance(m.get('t'), int)]
+        base_ts = min(timestamps) if timestamps else now
+
+    buffer = bytearray(RECORD.size * len(moves))
+    for i, move in enumerate(moves):
+        if not isinstance(move, dict):
+            raise ValidationError(f"Move {i} must be an object.")
+        op = OPS.get(move.get('op'))
+        if op is None:
+            raise ValidationError(f"Move {i} has an unknown op {move.get('op')!r}; expected one of {', '.join(OPS)}.")
+        try:
+            color = _parse_color(move.get('color'))
+        except ValueError:
+            raise ValidationError(f"Move {i} has an invalid color {move.get('color')!r}.")
+        cell = 0
+        if op != OPS['clear']:
+            x, y = move.get('x'), move.get('y')
+            if not (isinstance(x, int) and isinstance(y, int) and 1 <= x <= cols and 1 <= y <= rows):
+                raise ValidationError(f"Move {i} ({x}, {y}) is out of board bounds ({cols}x{rows}).")
+            cell = (y - 1) * cols + (x - 1)
+        t = move.get('t')
+        offset = (t if isinstance(t, int) else now) - base_ts
+        RECORD.pack_into(buffer, i * RECORD.size, color | op << 24, cell, min(max(offset, 0), MAX_OFFSET_MS))
+    return bytes(buffer), base_ts
+
+
+def decode_chunk(chunk):
+    moves = []
+    for packed, cell, offset in RECORD.iter_unpack(bytes(chunk.data)):
+        op = OP_NAMES[packed >> 24]
+        move = {'op': op, 'color': f'#{packed & 0xffffff:06x}', 't': chunk.base_ts + offset}
+        if op != 'clear':
+            move['x'] = cell % chunk.cols + 1
+            move['y'] = cell // chunk.cols + 1
+        moves.append(move)
+    return moves
+
+
+@transaction.atomic
+def append_moves(session, moves):
+    """Appends a batch of moves to the session's log and returns the new chunk's seq."""
+    if not isinstance(moves, list) or not moves:
+        raise ValidationError("Moves must be a non-empty list.")
+    if len(moves) > max_batch():
+        raise ValidationError(f"Too many moves in one batch (max {max_batch()}).")
+    board = session.board_game
+    data, base_ts = encode_moves(moves, board.cols, board.rows)
+
+    # Serializes appends to the session (a no-op on SQLite, which serializes writers itself).
+    GamePlaySession.objects.select_for_update().filter(pk=session.pk).values_list('pk', flat=True).first()
+    last_seq = (
+        SessionMoveChunk.objects.filter(session=session)
+        .order_by('-seq').values_list('seq', flat=True).first()
+    ) or 0
+    seq = last_seq + 1
+    SessionMoveChunk.objects.create(
+        session=session, seq=seq, cols=board.cols, base_ts=base_ts, move_count=len(moves), data=data,
+    )
+    if seq % compact_every() == 0:
+        compact(session)
+    return seq
+
+
+def _parts(chunk):
+    return chunk.merged_seqs or [[chunk.seq, 0]]
+
+
+@transaction.atomic
+def compact(session):
+    """
+    Merges consecutive chunks recorded with the same board width into single rows and
+    drops the oldest moves beyond the size cap. A merged chunk takes the seq of the
+    last chunk merged into it, so sequence numbers only ever grow, and records in
+    merged_seqs where the moves of every merged append start.
+    """
+    chunks = list(SessionMoveChunk.objects.filter(session=session).order_by('seq'))
+    if not chunks:
+        return
+
+    merged = []
+    for chunk in chunks:
+        data = bytes(chunk.data)
+        if merged and merged[-1]['cols'] == chunk.cols and chunk.base_ts - merged[-1]['base_ts'] < MAX_OFFSET_MS:
+            group = merged[-1]
+            shift = chunk.base_ts - group['base_ts']
+            for packed, cell, offset in RECORD.iter_unpack(data):
+                group['data'] += RECORD.pack(packed, cell, min(max(offset + shift, 0), MAX_OFFSET_MS))
+            group['parts'] += [[seq, start + group['move_count']] for seq, start in _parts(chunk)]
+            group['move_count'] += chunk.move_count
+            group['seq'] = chunk.seq
+        else:
+            merged.append({
+                'seq': chunk.seq, 'cols': chunk.cols, 'base_ts': chunk.base_ts,
+                'move_count': chunk.move_count, 'data': bytearray(data), 'parts': _parts(chunk),
+            })
+
+    # Enforce the cap by trimming moves from the front of the log.
+    excess = sum(group['move_count'] for group in merged) - max_moves()
+    while excess > 0 and merged:
+        group = merged[0]
+        if group['move_count'] <= excess:
+            excess -= group['move_count']
+            merged.pop(0)
+        else:
+            del group['data'][:excess * RECORD.size]
+            group['move_count'] -= excess
+            # Appends that lost all their moves go; the first kept one now starts at 0.
+            parts = [[seq, start - excess] for seq, start in group['parts']]
+            first = max(i for i, (seq, start) in enumerate(parts) if start <= 0)
+            group['parts'] = [[parts[first][0], 0]] + parts[first + 1:]
+            excess = 0
+
+    SessionMoveChunk.objects.filter(session=session).delete()
+    SessionMoveChunk.objects.bulk_create(
+        SessionMoveChunk(session=session, seq=g['seq'], cols=g['cols'], base_ts=g['base_ts'],
+                         move_count=g['move_count'], data=bytes(g['data']),
+                         merged_seqs=g['parts'] if len(g['parts']) > 1 else [])
+        for g in merged
+    )
+
+
+def iter_replay(session, after_seq=0, chunk_size=100):
+    """
+    Yields (seq, moves) for the session's log chunks after `after_seq`, streaming from
+    the DB. Of a merged chunk, only the moves appended after `after_seq` are yielded.
+    """
+    chunks = SessionMoveChunk.objects.filter(session=session, seq__gt=after_seq).order_by('seq')
+    for chunk in chunks.iterator(chunk_size=chunk_size):
+        moves = decode_chunk(chunk)
+        if chunk.merged_seqs and chunk.merged_seqs[0][0] <= after_seq:
+            moves = moves[next(start for seq, start in chunk.merged_seqs if seq > after_seq):]
+        yield chunk.seq, moves
@@ -0,0 +1,216 @@
+"""
+Live per-move validation against a cached occupancy bitmap.
+
+Each player's in-progress board is kept in the cache as an OccupancyState: a flat
+list with, per cell ((y-1)*cols + (x-1)), the 1-based index of the color whose
+path covers it (0 = free), plus every color's path as a list of cells. A move
+(the ops of gallery.movelog: start, step, retract, clear) is checked and applied
+with O(1) work on that state: bounds, adjacency to the path's head, collisions with
+other paths and endpoints, and that paths start and end on their color's points.
+Only start/clear over an existing path touch its cells.
+
+Warm checks need no database access: the board's endpoints come from the cached
+BoardSnapshot. A cold state is seeded once from the player's saved paths, and
+save_all_paths_api replaces it with what was saved. Board edits drop every state of
+the board through a cache generation (see invalidate_board_snapshot).
+
+A state is loaded, updated and stored under its cache lock, so concurrent moves of
+one player can't overwrite each other's update. A move that can't get the lock
+within LOCK_WAIT seconds is rejected as a conflict, to be retried.
+"""
+from django.core.cache import cache
+
+from path_editor.caching import bump_generation, cache_generation, cache_lock
+
+from .solution import board_snapshot_cache_key, get_board_snapshot
+
+STATE_TIMEOUT = 60 * 60 * 6
+LOCK_WAIT = 0.5
+LOCK_INTERVAL = 0.005
+
+START, STEP, RETRACT, CLEAR = 'start', 'step', 'retract', 'clear'
+OPS = (START, STEP, RETRACT, CLEAR)
+
+# Reasons a move is rejected.
+UNKNOWN_COLOR = 'unknown_color'
+OUT_OF_BOUNDS = 'out_of_bounds'
+NOT_AN_ENDPOINT = 'not_an_endpoint'
+NOT_STARTED = 'not_started'
+ALREADY_COMPLETE = 'already_complete'
+NOT_ADJACENT = 'not_adjacent'
+SELF_INTERSECTION = 'self_intersection'
+COLLISION = 'collision'
+CONFLICT = 'conflict'
+
+
+class MoveRejected(Exception):
+
+    def __init__(self, reason, detail):
+        super().__init__(detail)
+        self.reason = reason
+        self.detail = detail
+
+
+class OccupancyState:
+    __slots__ = ('cells', 'colors', 'points', 'paths', 'covered')
+
+    def __init__(self, snapshot):
+        # 1-based color indices; a list rather than a bytearray, as large boards can hold
+        # more than 255 point pairs.
+        self.cells = [0] * (snapshot.cols * snapshot.rows)
+        self.colors = {color: i for i, color in enumerate(sorted(snapshot.endpoints), start=1)}
+        self.points = {cell: color for color, cells in snapshot.endpoints.items() for cell in cells}
+        self.paths = {}
+        self.covered = 0
+
+    def __getstate__(self):
+        return (self.cells, self.colors, self.points, self.paths, self.covered)
+
+    def __setstate__(self, state):
+        self.cells, self.colors, self.points, self.paths, self.covered = state
+
+    def is_complete(self, snapshot, color):
+        path = self.paths.get(color)
+        return bool(path) and len(path) > 1 and {path[0], path[-1]} == snapshot.endpoints[color]
+
+    def is_solved(self, snapshot):
+        return self.covered == len(self.cells) and all(self.is_complete(snapshot, c) for c in snapshot.endpoints)
+
+    def _clear(self, color):
+        for cell in self.paths.pop(color, ()):
+            self.cells[cell] = 0
+            self.covered -= 1
+
+    def _occupy(self, color, cell):
+        self.paths.setdefault(color, []).append(cell)
+        self.cells[cell] = self.colors[color]
+        self.covered += 1
+
+    def apply(self, snapshot, op, color, x=None, y=None):
+        """Checks the move and applies it, or raises MoveRejected leaving the state unchanged."""
+        endpoints = snapshot.endpoints.get(color)
+        if endpoints is None or color not in self.colors:
+            raise MoveRejected(UNKNOWN_COLOR, f"Color {color} has no point pair on this board.")
+        if op == CLEAR:
+            self._clear(color)
+            return
+        if op == RETRACT:
+            path = self.paths.get(color)
+            if not path:
+                raise MoveRejected(NOT_STARTED, f"Color {color} has no path to retract.")
+            self.cells[path.pop()] = 0
+            self.covered -= 1
+            if not path:
+                del self.paths[color]
+            return
+
+        cols, rows = snapshot.cols, snapshot.rows
+        if not (1 <= x <= cols and 1 <= y <= rows):
+            raise MoveRejected(OUT_OF_BOUNDS, f"({x}, {y}) is out of board bounds ({cols}x{rows}).")
+        cell = (y - 1) * cols + (x - 1)
+
+        if op == START:
+            if cell not in endpoints:
+                raise MoveRejected(NOT_AN_ENDPOINT, f"Paths of {color} must start on one of its points.")
+            self._clear(color)
+            self._occupy(color, cell)
+            return
+
+        path = self.paths.get(color)
+        if not path:
+            raise MoveRejected(NOT_STARTED, f"Color {color} has no path yet; start it on one of its points.")
+        head = path[-1]
+        if len(path) > 1 and head in endpoints:
+            raise MoveRejected(ALREADY_COMPLETE, f"The path of {color} already connects its points.")
+        if abs(cell % cols - head % cols) + abs(cell // cols - head // cols) != 1:
+            raise MoveRejected(NOT_ADJACENT, f"({x}, {y}) is not next to the path's end.")
+        owner = self.cells[cell]
+        if owner == self.colors[color]:
+            raise MoveRejected(SELF_INTERSECTION, f"The path of {color} already covers ({x}, {y}).")
+        if owner:
+            raise MoveRejected(COLLISION, f"({x}, {y}) is covered by another path.")
+        if self.points.get(cell, color) != color:
+            raise MoveRejected(COLLISION, f"({x}, {y}) is another color's point.")
+        self._occupy(color, cell)
+
+
+def occupancy_generation_name(board_id):
+    return f'gallery:occupancy:{board_id}'
+
+
+def occupancy_cache_key(board_id, user_id):
+    return f'gallery:occupancy:{board_id}:{cache_generation(occupancy_generation_name(board_id))}:{user_id}'
+
+
+def invalidate_board_occupancy(board_id):
+    bump_generation(occupancy_generation_name(board_id))
+
+
+def cached_board_snapshot(board_id):
+    """The board's BoardSnapshot, from the cache when warm; raises BoardGame.DoesNotExist."""
+    snapshot = cache.get(board_snapshot_cache_key(board_id))
+    if snapshot is None:
+        from .models import BoardGame
+        snapshot = get_board_snapshot(BoardGame.objects.only('id', 'cols', 'rows').get(pk=board_id))
+    return snapshot
+
+
+def build_state(snapshot, paths):
+    """A state holding `paths` ((color, path_data) pairs), each cut at its first invalid move."""
+    state = OccupancyState(snapshot)
+    for color, path_data in paths:
+        for i, coord in enumerate(path_data or ()):
+            try:
+                state.apply(snapshot, START if i == 0 else STEP, color, int(coord['x']), int(coord['y']))
+            except (MoveRejected, TypeError, KeyError, ValueError):
+                break
+    return state
+
+
+def _saved_paths(board_id, user_id):
+    from .models import Path
+    return Path.objects.filter(
+        game_play_session__board_game_id=board_id, game_play_session__player_id=user_id,
+    ).values_list('color', 'path_data')
+
+
+def load_state(snapshot, board_id, user_id):
+    """Returns (state, seeded): the cached state, or one just seeded from the saved paths."""
+    state = cache.get(occupancy_cache_key(board_id, user_id))
+    if state is not None:
+        return state, False
+    return build_state(snapshot, _saved_paths(board_id, user_id)), True
+
+
+def store_state(board_id, user_id, state):
+    cache.set(occupancy_cache_key(board_id, user_id), state, STATE_TIMEOUT)
+
+
+def replace_state(board_id, user_id, state):
+    """Stores `state` (e.g. what was just saved), or drops the cached one if a move holds it."""
+    key = occupancy_cache_key(board_id, user_id)
+    with cache_lock(key, wait=LOCK_WAIT, interval=LOCK_INTERVAL) as locked:
+        if locked:
+            cache.set(key, state, STATE_TIMEOUT)
+        else:
+            cache.delete(key)  # The next move seeds it from the saved paths
+
+
+def apply_move(board_id, user_id, op, color, x=None, y=None):
+    """
+    Validates one move of the player's in-progress board and, if it is valid, records
+    it. Returns (state, snapshot); raises MoveRejected for invalid moves.
+    """
+    snapshot = cached_board_snapshot(board_id)
+    with cache_lock(occupancy_cache_key(board_id, user_id), wait=LOCK_WAIT, interval=LOCK_INTERVAL) as locked:
+        if not locked:
+            raise MoveRejected(CONFLICT, "Another move of yours is being checked; retry.")
+        state, seeded = load_state(snapshot, board_id, user_id)
+        try:
+            state.apply(snapshot, op, color, x, y)
+        except MoveRejected:
+            if seeded:
+                store_state(board_id, user_id, state)
+            raise
+        store_state(board_id, user_id, state)
+    return state, snapshot
@@ -0,0 +1,125 @@
+"""
+Small preview images of boards: the background downscaled, with the grid and the
+board's dots drawn over it.
+
+A preview is stored once per board fingerprint, a hash of everything it shows (size,
+background file, points and render settings), at MEDIA_ROOT/previews/<board id>/
+<fingerprint>.<ext>. BoardGame.preview_fingerprint records the current one. The URL
+therefore changes whenever the board does, and it is served with an immutable cache
+header. Previews are rendered by the debounced render_board_preview job after board
+changes, not per request.
+"""
+import hashlib
+import io
+import os
+import threading
+
+from django.conf import settings
+from PIL import Image, ImageDraw
+
+from .models import BoardGame, board_summary_changed
+
+RENDER_VERSION = 1  # Bump when the drawing changes to re-render every preview
+GRID_COLOR = (255, 255, 255, 110)
+EMPTY_BACKGROUND = (229, 231, 235)
+FORMATS = {'WEBP': ('webp', 'image/webp'), 'PNG': ('png', 'image/png')}
+
+
+def _config(name, default):
+    return getattr(settings, 'GALLERY_PREVIEWS', {}).get(name, default)
+
+
+def preview_format():
+    return _config('FORMAT', 'WEBP').upper()
+
+
+def content_type():
+    return FORMATS[preview_format()][1]
+
+
+def preview_dir(board_id):
+    return os.path.join(settings.MEDIA_ROOT, 'previews', str(board_id))
+
+
+def preview_path(board_id, fingerprint):
+    return os.path.join(preview_dir(board_id), f'{fingerprint}.{FORMATS[preview_format()][0]}')
+
+
+def _points(board):
+    return sorted(board.points.order_by().values_list('x', 'y', 'color'))
+
+
+def fingerprint(board, points):
+    background = board.background.image.name if board.background_id and board.background.image else ''
+    source = repr((RENDER_VERSION, preview_format(), _config('MAX_SIZE', 240), board.cols, board.rows, background, points))
+    return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+
+def _load_background(board, width, height):
+    image = board.background.image if board.background_id else None
+    if image:
+        try:
+            with Image.open(image.path) as img:
+                img.draft('RGB', (width, height))  # Lets JPEG decode straight at a reduced scale
+                return img.convert('RGB').resize((width, height), Image.BILINEAR)
+        except Exception:
+            pass
+    return Image.new('RGB', (width, height), EMPTY_BACKGROUND)
+
+
+def render_preview(board, points):
+    """Renders the preview of `board` with `points` ((x, y, color) tuples) and returns the encoded bytes."""
+    max_size = _config('MAX_SIZE', 240)
+    cell = max(max_size // max(board.cols, board.rows), 1)
+    width, height = board.cols * cell, board.rows * cell
+
+    canvas = _load_background(board, width, height).convert('RGBA')
+    overlay = Image.new('RGBA', canvas.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for col in range(1, board.cols):
+        draw.line([(col * cell, 0), (col * cell, height)], fill=GRID_COLOR)
+    for row in range(1, board.rows):
+        draw.line([(0, row * cell), (width, row * cell)], fill=GRID_COLOR)
+    radius = max(cell * 0.35, 1)
+    for x, y, color in points:
+        cx, cy = (x - 0.5) * cell, (y - 0.5) * cell
+        try:
+            draw.ellipse([cx - radius, cy - radius, cx + radius, cy + radius], fill=color, outline=(255, 255, 255))
+        except ValueError:
+            continue  # Not a color Pillow understands
+    canvas = Image.alpha_composite(canvas, overlay).convert('RGB')
+
+    output = io.BytesIO()
+    canvas.save(output, format=preview_format(), quality=80)
+    return output.getvalue()
+
+
+def update_board_preview(board_id):
+    """
+    Renders the board's preview if it changed since the last render, stores its
+    fingerprint and removes the outdated files. Returns the fingerprint, or None if
+    the board is gone.
+    """
+    board = BoardGame.objects.select_related('background').filter(pk=board_id).first()
+    if board is None:
+        return None
+    points = _points(board)
+    current = fingerprint(board, points)
+    path = preview_path(board.pk, current)
+    if not os.path.exists(path):
+        os.makedirs(preview_dir(board.pk), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(render_preview(board, points))
+        os.replace(temp_path, path)  # Atomic, so a concurrent request never reads a partial file
+    if board.preview_fingerprint != current:
+        BoardGame.objects.filter(pk=board.pk).update(preview_fingerprint=current)
+        board_summary_changed(board.pk)
+        extension = FORMATS[preview_format()][0]
+        for name in os.listdir(preview_dir(board.pk)):
+            if name.endswith(extension) and not name.startswith(current):
+                try:
+                    os.remove(os.path.join(preview_dir(board.pk), name))
+                except FileNotFoundError:
+                    pass
+    return current
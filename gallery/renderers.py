@@ -0,0 +1,57 @@
+"""
+DRF renderer and parser for MessagePack, used by the game API views.
+
+The game API views accept and return application/x-msgpack (Accept / Content-Type,
+or ?format=msgpack) when the optional msgpack package (a C extension) is installed;
+JSON stays the default. Without it the views only speak JSON: clients that ask with
+`Accept: application/x-msgpack, */*` get MessagePack when the server has it and JSON
+otherwise (DRF ranks media types by specificity, not q-values), and should decode
+by the response's Content-Type.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MEDIA_TYPE = 'application/x-msgpack'
+
+
+class MsgpackRenderer(BaseRenderer):
+    media_type = MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Dates, decimals, lazy strings etc. become what JSONRenderer would make of them.
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+class MsgpackParser(BaseParser):
+    media_type = MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as e:
+            raise ParseError(f"MessagePack parse error - {e}")
+
+
+def game_api_renderers():
+    if msgpack is None:
+        return api_settings.DEFAULT_RENDERER_CLASSES
+    return [*api_settings.DEFAULT_RENDERER_CLASSES, MsgpackRenderer]
+
+
+def game_api_parsers():
+    if msgpack is None:
+        return api_settings.DEFAULT_PARSER_CLASSES
+    return [*api_settings.DEFAULT_PARSER_CLASSES, MsgpackParser]
@@ -0,0 +1,116 @@
+"""
+Board search over an indexed token table with facet counts.
+
+Board names are split into lower-cased word tokens stored in BoardSearchToken. A
+query word matches any token it is a prefix of. The match is written as a range
+(token >= 'abc' AND token < 'abd'), so it runs as an index range scan on every
+backend. LIKE 'abc%' cannot use the index on SQLite because Django adds an ESCAPE
+clause. All query words must match (AND).
+
+Facets (rows, cols, color_count, creator) are counted over the boards matching the
+query and every *other* active filter, so a client can widen a facet selection
+without losing its options. Facet counts are cached briefly, until a board changes
+(BOARD_LISTING generation), and only the requested page of boards is loaded.
+"""
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from path_editor.caching import cache_generation
+
+from .models import BOARD_LISTING, BoardGame, BoardSearchToken
+
+TOKEN_RE = re.compile(r'\w+')
+MAX_TOKEN_LENGTH = 50
+MAX_QUERY_TOKENS = 8
+FACETS = {
+    # facet name -> (BoardGame field, query parameter)
+    'rows': 'rows',
+    'cols': 'cols',
+    'color_count': 'color_count',
+    'creator': 'user_id',
+}
+
+
+def _config(name, default):
+    return getattr(settings, 'GALLERY_SEARCH', {}).get(name, default)
+
+
+def tokenize(text):
+    """Lower-cased, de-duplicated word tokens of `text`, in order of appearance."""
+    tokens = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        token = token[:MAX_TOKEN_LENGTH]
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def index_board_name(board, created=False):
+    if not created:
+        BoardSearchToken.objects.filter(board=board).delete()
+    BoardSearchToken.objects.bulk_create(
+        BoardSearchToken(board=board, token=token) for token in tokenize(board.name)
+    )
+
+
+def _prefix_upper_bound(prefix):
+    # The smallest string greater than every string starting with `prefix`.
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def matching_boards(query):
+    boards = BoardGame.objects.all()
+    for token in tokenize(query)[:MAX_QUERY_TOKENS]:
+        board_ids = BoardSearchToken.objects.filter(
+            token__gte=token, token__lt=_prefix_upper_bound(token)
+        ).values('board_id')
+        boards = boards.filter(id__in=board_ids)
+    return boards
+
+
+def _apply_filters(boards, filters, skip=None):
+    for facet, value in filters.items():
+        if facet != skip:
+            boards = boards.filter(**{FACETS[facet]: value})
+    return boards
+
+
+def facet_counts(query, filters):
+    key_source = repr((tokenize(query)[:MAX_QUERY_TOKENS], sorted(filters.items())))
+    cache_key = f'gallery:search-facets:{cache_generation(BOARD_LISTING)}:' + hashlib.sha1(key_source.encode()).hexdigest()
+    facets = cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    limit = _config('FACET_LIMIT', 20)
+    base = matching_boards(query)
+    facets = {}
+    for facet, field in FACETS.items():
+        boards = _apply_filters(base, filters, skip=facet).order_by()
+        if facet == 'creator':
+            rows = boards.values('user_id', 'user__username').annotate(count=Count('id')).order_by('-count', 'user_id')[:limit]
+            facets[facet] = [{'value': r['user_id'], 'label': r['user__username'], 'count': r['count']} for r in rows]
+        else:
+            rows = boards.values(field).annotate(count=Count('id')).order_by('-count', field)[:limit]
+            facets[facet] = [{'value': r[field], 'count': r['count']} for r in rows]
+    cache.set(cache_key, facets, _config('FACET_CACHE_SECONDS', 30))
+    return facets
+
+
+def search_boards(query='', filters=None, page=1, page_size=20):
+    """
+    Returns (total, boards on the requested page, facets). `filters` maps facet
+    names to required values.
+    """
+    filters = filters or {}
+    boards = _apply_filters(matching_boards(query), filters)
+    total = boards.count()
+    offset = (page - 1) * page_size
+    page_boards = list(
+        boards.select_related('user', 'background').order_by('-id')[offset:offset + page_size]
+    )
+    return total, page_boards, facet_counts(query, filters)
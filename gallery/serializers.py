@@ -94,7 +94,7 @@ class PathSerializer(serializers.ModelSerializer):
 
 
 class GamePlaySessionSerializer(serializers.ModelSerializer):
-    paths = PathSerializer(many=True, read_only=True)
+    paths = serializers.SerializerMethodField(read_only=True)
     player_username = serializers.CharField(source='player.username', read_only=True)
     board_game_name = serializers.CharField(source='board_game.name', read_only=True)
     board_details = serializers.SerializerMethodField(read_only=True)
@@ -107,6 +107,11 @@ class GamePlaySessionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['player', 'board_game', 'last_updated'] # is_solved might be updatable by check_solve
 
+    def get_paths(self, obj: GamePlaySession):
+        if obj.pk is None:
+            return [] # Unsaved session (nothing saved on this board yet) has no paths
+        return PathSerializer(obj.paths.all(), many=True, context=self.context).data
+
     def get_board_details(self, obj: GamePlaySession):
         board = obj.board_game
         points_queryset = Point.objects.filter(route=board) # Ensure we get points for this board
@@ -0,0 +1,185 @@
+# Board solution checking, shared by the gameplay API and the validation benchmarks.
+
+
+def check_solution(rows, cols, required_colors, paths):
+    """
+    Returns True when `paths` (an iterable of (color, path_data) pairs that already
+    passed Path.clean) connect every required color, don't overlap and cover the grid.
+
+    Runs in O(rows * cols): cells are marked in a flat occupancy array indexed by
+    (y-1)*cols + (x-1), so overlaps are detected on the spot and coverage is a counter.
+    """
+    paths = list(paths)
+    drawn_colors = set(color for color, _ in paths)
+    if set(required_colors) != drawn_colors:
+        return False
+
+    total_cells = rows * cols
+    occupied = bytearray(total_cells)
+    covered = 0
+    for _, path_data in paths:
+        for coord in path_data: # path_data is a list of dicts {'x': val, 'y': val}
+            x, y = coord['x'], coord['y']
+            if not (1 <= x <= cols and 1 <= y <= rows):
+                return False
+            cell = (y - 1) * cols + (x - 1)
+            if occupied[cell]: # Overlapping paths
+                return False
+            occupied[cell] = 1
+            covered += 1
+    return covered == total_cells # All cells covered
+
+
+# --- Batch grading against a cached board snapshot ---
+
+SOLVED = 'solved'
+OVERLAP = 'overlap'
+GAP = 'gap'
+BAD_ENDPOINTS = 'bad_endpoints'
+INVALID = 'invalid'
+
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60
+
+
+class BoardSnapshot:
+    """
+    Immutable in-memory view of a board for grading: its dimensions and, per color,
+    the flat cell indices ((y-1)*cols + (x-1)) of the color's two endpoints.
+    """
+    __slots__ = ('board_id', 'cols', 'rows', 'endpoints')
+
+    def __init__(self, board_id, cols, rows, endpoints):
+        self.board_id = board_id
+        self.cols = cols
+        self.rows = rows
+        self.endpoints = endpoints
+
+    @classmethod
+    def from_points(cls, board_id, cols, rows, points):
+        """`points` is an iterable of (x, y, color) tuples."""
+        cells_by_color = {}
+        for x, y, color in points:
+            cells_by_color.setdefault(color, []).append((y - 1) * cols + (x - 1))
+        endpoints = {color: frozenset(cells) for color, cells in cells_by_color.items() if len(cells) == 2}
+        return cls(board_id, cols, rows, endpoints)
+
+    def __getstate__(self):
+        return (self.board_id, self.cols, self.rows, self.endpoints)
+
+    def __setstate__(self, state):
+        self.board_id, self.cols, self.rows, self.endpoints = state
+
+
+def board_snapshot_cache_key(board_id):
+    return f'gallery:board-snapshot:{board_id}'
+
+
+def board_data_cache_key(board_id):
+    return f'gallery:board-data:{board_id}'
+
+
+def invalidate_board_snapshot(board_id):
+    """
+    Drops the board's cached grading snapshot, get_board_data_api payload, leaderboard
+    (point changes reset every session) and players' occupancy states.
+    """
+    from django.core.cache import cache
+    from django.db import transaction
+    from .daily import leaderboard_cache_key
+    from .occupancy import invalidate_board_occupancy
+    keys = [board_snapshot_cache_key(board_id), board_data_cache_key(board_id), leaderboard_cache_key(board_id)]
+    cache.delete_many(keys)
+    invalidate_board_occupancy(board_id)
+    # Again after commit: a concurrent request may have re-cached the pre-commit state meanwhile.
+    transaction.on_commit(lambda: (cache.delete_many(keys), invalidate_board_occupancy(board_id)))
+
+
+def get_board_snapshot(board):
+    """Returns the cached BoardSnapshot of `board`, building it with a single points query on a miss."""
+    from django.core.cache import cache
+    key = board_snapshot_cache_key(board.pk)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        points = board.points.values_list('x', 'y', 'color')
+        snapshot = BoardSnapshot.from_points(board.pk, board.cols, board.rows, points)
+        cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def _verdict(verdict, color=None, detail=None):
+    result = {'verdict': verdict}
+    if color is not None:
+        result['color'] = color
+    if detail is not None:
+        result['detail'] = detail
+    return result
+
+
+def grade_candidate(snapshot, paths):
+    """
+    Grades one candidate solution (a list of {'color': ..., 'path_data': [{'x', 'y'}, ...]})
+    entirely in memory. Returns a dict with a 'verdict' of solved, invalid, bad_endpoints,
+    overlap or gap, plus the offending 'color' and a 'detail' message when not solved.
+    """
+    cols, rows = snapshot.cols, snapshot.rows
+    endpoints = snapshot.endpoints
+    total_cells = cols * rows
+    # Occupancy stores the 1-based index of the path covering each cell.
+    occupied = [0] * total_cells
+    covered = 0
+    seen_colors = set()
+
+    if not isinstance(paths, list):
+        return _verdict(INVALID, detail="Candidate must be a list of paths.")
+
+    for path_number, path in enumerate(paths, start=1):
+        if not isinstance(path, dict):
+            return _verdict(INVALID, detail=f"Path {path_number} must be an object with color and path_data.")
+        color = path.get('color')
+        path_data = path.get('path_data')
+        if color not in endpoints:
+            return _verdict(INVALID, color, "Color has no point pair on this board.")
+        if color in seen_colors:
+            return _verdict(INVALID, color, "Color has more than one path.")
+        seen_colors.add(color)
+        if not isinstance(path_data, list) or len(path_data) < 2:
+            return _verdict(INVALID, color, "Path data must contain at least two coordinates.")
+
+        prev_x = prev_y = None
+        first_cell = cell = None
+        for coord in path_data:
+            try:
+                x, y = coord['x'], coord['y']
+            except (TypeError, KeyError):
+                return _verdict(INVALID, color, f"Invalid coordinate {coord!r}.")
+            if type(x) is not int or type(y) is not int:
+                return _verdict(INVALID, color, f"Invalid coordinate {coord!r}.")
+            if not (1 <= x <= cols and 1 <= y <= rows):
+                return _verdict(INVALID, color, f"({x}, {y}) is out of board bounds ({cols}x{rows}).")
+            if prev_x is not None and abs(x - prev_x) + abs(y - prev_y) != 1:
+                return _verdict(INVALID, color, f"Path is not contiguous at ({prev_x},{prev_y}) -> ({x},{y}).")
+            cell = (y - 1) * cols + (x - 1)
+            owner = occupied[cell]
+            if owner:
+                if owner == path_number:
+                    return _verdict(INVALID, color, f"Path visits ({x}, {y}) more than once.")
+                return _verdict(OVERLAP, color, f"({x}, {y}) is covered by more than one path.")
+            occupied[cell] = path_number
+            covered += 1
+            if first_cell is None:
+                first_cell = cell
+            prev_x, prev_y = x, y
+
+        if first_cell == cell or frozenset((first_cell, cell)) != endpoints[color]:
+            return _verdict(BAD_ENDPOINTS, color, "Path does not start and end on the color's point pair.")
+
+    missing = endpoints.keys() - seen_colors
+    if missing:
+        return _verdict(GAP, min(missing), "Color has no path.")
+    if covered != total_cells:
+        return _verdict(GAP, detail=f"{total_cells - covered} cells are not covered.")
+    return _verdict(SOLVED)
+
+
+def grade_candidates(snapshot, candidates):
+    return [grade_candidate(snapshot, candidate) for candidate in candidates]
@@ -0,0 +1,241 @@
+"""
+Backtracking solver for gallery boards, used to rate their difficulty.
+
+A board is solved when every color pair is joined by a path and the paths cover
+the whole grid (see gallery.solution.check_solution). The solver grows one path
+head at a time from each pair's first point.
+- Forced moves (a head with a single legal step) are applied without branching.
+- Otherwise it branches on the head with the fewest options.
+- Each search node is pruned when an empty cell can no longer be passed through,
+  or when an empty region can't be reached by any unfinished color.
+
+difficulty() turns the search statistics into a 0-100 score. It combines the
+search-tree size, the share of moves that were forced and whether the solution
+is unique.
+"""
+import math
+import sys
+from collections import namedtuple
+
+from django.conf import settings
+
+from .models import BoardGame, board_summary_changed
+
+SolveStats = namedtuple('SolveStats', 'solutions nodes forced_moves total_moves exhausted')
+
+
+def max_nodes():
+    return getattr(settings, 'GALLERY_DIFFICULTY', {}).get('MAX_NODES', 20000)
+
+
+def _neighbors(cols, rows):
+    result = []
+    for cell in range(cols * rows):
+        x, y = cell % cols, cell // cols
+        cells = []
+        if x > 0:
+            cells.append(cell - 1)
+        if x < cols - 1:
+            cells.append(cell + 1)
+        if y > 0:
+            cells.append(cell - cols)
+        if y < rows - 1:
+            cells.append(cell + cols)
+        result.append(cells)
+    return result
+
+
+def solve(cols, rows, points, node_limit=None, max_solutions=2):
+    """
+    Searches for up to `max_solutions` solutions of a board given as (x, y, color)
+    points and returns SolveStats. `exhausted` is True when the search stopped at
+    `node_limit` branch nodes before it could finish.
+    """
+    node_limit = node_limit or max_nodes()
+    cells_by_color = {}
+    for x, y, color in points:
+        if x != int(x) or y != int(y) or not (1 <= x <= cols and 1 <= y <= rows):
+            return SolveStats(0, 0, 0, 0, False)  # Legacy points off the grid
+        cells_by_color.setdefault(color, []).append((int(y) - 1) * cols + (int(x) - 1))
+    pairs = [cells for cells in cells_by_color.values() if len(cells) == 2]
+    if not pairs or len(pairs) != len(cells_by_color):
+        return SolveStats(0, 0, 0, 0, False)
+
+    neighbors = _neighbors(cols, rows)
+    grid = [-1] * (cols * rows)
+    heads, targets = [], []
+    for color_index, (start, end) in enumerate(pairs):
+        grid[start] = grid[end] = color_index
+        heads.append(start)
+        targets.append(end)
+    done = [False] * len(pairs)
+    state = {'empty': cols * rows - 2 * len(pairs), 'solutions': 0, 'nodes': 0, 'forced': 0, 'moves': 0, 'exhausted': False}
+    depth_limit = sys.getrecursionlimit() - 100
+
+    def options(c):
+        target = targets[c]
+        return [cell for cell in neighbors[heads[c]] if grid[cell] == -1 or cell == target]
+
+    def move(c, cell, trail):
+        trail.append((c, heads[c]))
+        if cell == targets[c]:
+            done[c] = True
+        else:
+            grid[cell] = c
+            state['empty'] -= 1
+        heads[c] = cell
+        state['moves'] += 1
+
+    def undo(trail, keep=0):
+        while len(trail) > keep:
+            c, previous_head = trail.pop()
+            cell = heads[c]
+            if done[c] and cell == targets[c]:
+                done[c] = False
+            else:
+                grid[cell] = -1
+                state['empty'] += 1
+            heads[c] = previous_head
+
+    def is_free_end(cell):
+        c = grid[cell]
+        return c != -1 and not done[c] and (cell == heads[c] or cell == targets[c])
+
+    def pruned():
+        # A path through an empty cell needs two usable neighbours.
+        for cell, value in enumerate(grid):
+            if value == -1:
+                usable = 0
+                for other in neighbors[cell]:
+                    if grid[other] == -1 or is_free_end(other):
+                        usable += 1
+                if usable < 2:
+                    return True
+        # Every empty region must be fillable by a color whose head and target both border it,
+        # and every unfinished color must still be able to reach its target.
+        region_of = [-1] * len(grid)
+        region_colors = []
+        for cell, value in enumerate(grid):
+            if value != -1 or region_of[cell] != -1:
+                continue
+            region = len(region_colors)
+            bordering_heads, bordering_targets = set(), set()
+            stack = [cell]
+            region_of[cell] = region
+            while stack:
+                current = stack.pop()
+                for other in neighbors[current]:
+                    other_value = grid[other]
+                    if other_value == -1:
+                        if region_of[other] == -1:
+                            region_of[other] = region
+                            stack.append(other)
+                    elif not done[other_value]:
+                        if other == heads[other_value]:
+                            bordering_heads.add(other_value)
+                        elif other == targets[other_value]:
+                            bordering_targets.add(other_value)
+            colors = bordering_heads & bordering_targets
+            if not colors:
+                return True
+            region_colors.append(colors)
+        for c in range(len(pairs)):
+            if done[c] or targets[c] in neighbors[heads[c]]:
+                continue
+            if not any(c in colors for colors in region_colors):
+                return True
+        return False
+
+    def search(depth):
+        trail = []
+        # Apply forced moves until every unfinished head has a choice.
+        while True:
+            best = None
+            progressed = False
+            for c in range(len(pairs)):
+                if done[c]:
+                    continue
+                choices = options(c)
+                if not choices:
+                    undo(trail)
+                    return
+                if len(choices) == 1:
+                    move(c, choices[0], trail)
+                    state['forced'] += 1
+                    progressed = True
+                elif best is None or len(choices) < len(best[1]):
+                    best = (c, choices)
+            if not progressed:
+                break
+
+        if best is None: # Every color is connected
+            if state['empty'] == 0:
+                state['solutions'] += 1
+            undo(trail)
+            return
+        if pruned():
+            undo(trail)
+            return
+        state['nodes'] += 1
+        if state['nodes'] > node_limit or depth > depth_limit:
+            state['exhausted'] = True
+            undo(trail)
+            return
+
+        c, choices = best
+        # Finishing a color first keeps the tree small when it is adjacent to its target.
+        choices.sort(key=lambda cell: cell != targets[c])
+        for cell in choices:
+            keep = len(trail)
+            move(c, cell, trail)
+            search(depth + 1)
+            undo(trail, keep)
+            if state['solutions'] >= max_solutions or state['exhausted']:
+                break
+        undo(trail)
+
+    search(0)
+    return SolveStats(state['solutions'], state['nodes'], state['forced'], state['moves'], state['exhausted'])
+
+
+def difficulty(stats, node_limit=None):
+    """
+    Rates a board 0-100 from its SolveStats. Boards the search couldn't solve within
+    the node budget rate 100; boards proven unsolvable return None.
+      - 60 points for the search-tree size, on a log scale up to the node budget
+      - 30 points for the share of moves that had to be chosen rather than forced
+      - 10 points when the solution is unique
+    """
+    if stats.solutions == 0:
+        return 100.0 if stats.exhausted else None
+    node_limit = node_limit or max_nodes()
+    tree = min(math.log10(stats.nodes + 1) / math.log10(node_limit + 1), 1.0)
+    forced_ratio = stats.forced_moves / stats.total_moves if stats.total_moves else 1.0
+    unique = 1.0 if stats.solutions == 1 and not stats.exhausted else 0.0
+    return round(60 * tree + 30 * (1 - forced_ratio) + 10 * unique, 1)
+
+
+def rate_board(board, node_limit=None):
+    """Solves a BoardGame and returns its difficulty score (see difficulty())."""
+    node_limit = node_limit or max_nodes()
+    points = board.points.order_by().values_list('x', 'y', 'color')
+    return difficulty(solve(board.cols, board.rows, points, node_limit=node_limit), node_limit=node_limit)
+
+
+def update_board_difficulty(board_id, node_limit=None, force=False):
+    """
+    Rates a stale board (any board with `force`) and stores the score. Returns
+    (board, score), or None if the board is gone or was already rated.
+    """
+    boards = BoardGame.objects.filter(pk=board_id)
+    # Clear the flag before solving: an edit made while the solver runs marks the
+    # board stale again, so it gets rated again.
+    if not boards.filter(**({} if force else {'difficulty_stale': True})).update(difficulty_stale=False):
+        return None
+    board = boards.first()
+    if board is None:
+        return None
+    score = rate_board(board, node_limit=node_limit)
+    boards.update(difficulty=score)
+    board_summary_changed(board_id)
+    return board, score
@@ -547,10 +547,6 @@ class FreeFlowGame {
     }
     handleSaveProgress() {
         return __awaiter(this, void 0, void 0, function* () {
-            if (!this.sessionId) {
-                this.updateGameStatus("Session ID not found. Cannot save.", true);
-                return;
-            }
             if (!this.hasUnsavedChanges && !this.isSolvedState) {
                 // if not solved, and no unsaved changes
                 // Allow saving if it's a newly solved state, even if hasUnsavedChanges was false before solving.
@@ -569,7 +565,12 @@ class FreeFlowGame {
                 path_data: pInfo.segments,
             }));
             try {
-                const response = yield this.apiRequest(`/gallery/api/game/session/${this.sessionId}/save_all_paths/`, "POST", { paths: pathsToSave });
+                // Before the first save there is no session yet; saving by board creates it.
+                const saveUrl = this.sessionId
+                    ? `/gallery/api/game/session/${this.sessionId}/save_all_paths/`
+                    : `/gallery/api/game/board/${currentBoardId}/session/save_all_paths/`;
+                const response = yield this.apiRequest(saveUrl, "POST", { paths: pathsToSave });
+                this.sessionId = response.session_id;
                 this.isSolvedState = response.is_solved; // Update with server's authoritative state
                 this.setUnsavedChanges(false); // This will re-evaluate button states
                 const statusMessage = response.message +
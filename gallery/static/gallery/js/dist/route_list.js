@@ -150,7 +150,12 @@ class RouteListManager {
             const backgroundDiv = document.createElement("div");
             backgroundDiv.className =
                 "w-full h-32 bg-cover bg-center rounded-t-lg mb-2";
-            if (board.background_image_url) {
+            if (board.preview_url) {
+                backgroundDiv.style.backgroundImage = `url('${board.preview_url}')`;
+                backgroundDiv.classList.replace("bg-cover", "bg-contain");
+                backgroundDiv.classList.add("bg-no-repeat");
+            }
+            else if (board.background_image_url) {
                 backgroundDiv.style.backgroundImage = `url('${board.background_image_url}')`;
             }
             else {
@@ -59,6 +59,24 @@ class RouteEditorApp {
             if (this.boardData)
                 this.boardData.points = this.currentPointsData; // Sync with boardData too
         };
+        this.getBoardVersion = () => { var _a; return (_a = this.boardData) === null || _a === void 0 ? void 0 : _a.route.version; };
+        this.setBoardVersion = (version) => {
+            if (this.boardData && typeof version === "number")
+                this.boardData.route.version = version;
+        };
+        this.applyStaleBoardSnapshot = (data) => {
+            var _a, _b, _c;
+            // 409 from an editor endpoint: another tab saved first, so local edits are discarded.
+            this.clearPendingChanges();
+            if (this.boardData && data.route)
+                this.boardData.route = data.route;
+            this.setCurrentPointsData(data.all_points || []);
+            this.rebuildBoardVisuals((_a = this.boardData) === null || _a === void 0 ? void 0 : _a.route.cols, (_b = this.boardData) === null || _b === void 0 ? void 0 : _b.route.rows, this.currentPointsData);
+            if ((_c = this.boardData) === null || _c === void 0 ? void 0 : _c.route.name)
+                this.updatePageTitle(this.boardData.route.name);
+            this.updateSaveChangesButtonState();
+            alert(data.error || "This board was changed in another editor.");
+        };
         this.removePointsByColorFromState = (color) => {
             const removed = [];
             this.currentPointsData = this.currentPointsData.filter((p) => {
@@ -402,9 +420,17 @@ class RouteEditorApp {
                             "Content-Type": "application/json",
                             "X-CSRFToken": this.csrfToken,
                         },
-                        body: JSON.stringify({ x: newX, y: newY }),
+                        body: JSON.stringify({
+                            x: newX,
+                            y: newY,
+                            version: this.getBoardVersion(),
+                        }),
                     });
                     const data = yield response.json();
+                    if (response.status === 409) {
+                        this.applyStaleBoardSnapshot(data);
+                        return;
+                    }
                     if (!response.ok) {
                         if (data.auto_save_off) {
                             // Server turned off auto-save
@@ -424,6 +450,7 @@ class RouteEditorApp {
                     if (!(data && data.success)) {
                         throw new Error(data.error || "Server reported update failure.");
                     }
+                    this.setBoardVersion(data.version);
                 }
                 catch (err) {
                     console.error("Auto-save update error:", err);
@@ -568,9 +595,17 @@ class RouteEditorApp {
                     try {
                         const response = yield fetch(`/gallery/api/point/${idForApiCall}/delete/`, {
                             method: "DELETE",
-                            headers: { "X-CSRFToken": this.csrfToken },
+                            headers: {
+                                "Content-Type": "application/json",
+                                "X-CSRFToken": this.csrfToken,
+                            },
+                            body: JSON.stringify({ version: this.getBoardVersion() }),
                         });
                         const data = yield response.json();
+                        if (response.status === 409) {
+                            this.applyStaleBoardSnapshot(data);
+                            return;
+                        }
                         if (!response.ok)
                             throw new Error(data.error || `Failed to delete point pair ${response.statusText}`);
                         yield this.loadInitialBoardData(); // Refresh all data
@@ -631,14 +666,22 @@ class RouteEditorApp {
                         "Content-Type": "application/json",
                         "X-CSRFToken": this.csrfToken,
                     },
-                    body: JSON.stringify({ changes: this.pendingChanges }),
+                    body: JSON.stringify({
+                        changes: this.pendingChanges,
+                        version: this.getBoardVersion(),
+                    }),
                 });
                 const data = yield response.json();
+                if (response.status === 409) {
+                    this.applyStaleBoardSnapshot(data);
+                    return;
+                }
                 if (!response.ok || data.status !== "success") {
                     throw new Error(data.error || data.message || "Failed to save pending changes.");
                 }
                 this.clearPendingChanges();
                 this.setCurrentPointsData(data.all_points || []); // Server response is source of truth
+                this.setBoardVersion(data.version);
                 if (this.boardData && data.board_route_data) {
                     // Server might return updated route data too
                     this.boardData.route = data.board_route_data;
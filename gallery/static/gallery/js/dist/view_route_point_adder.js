@@ -143,9 +143,15 @@ class PointAdder {
                                 Object.assign(Object.assign({}, point1), { color }),
                                 Object.assign(Object.assign({}, point2), { color }),
                             ],
+                            version: this.context.getBoardVersion(),
                         }),
                     });
                     const data = yield response.json();
+                    if (response.status === 409) {
+                        this.context.applyStaleBoardSnapshot(data);
+                        this.resetPairForm();
+                        return;
+                    }
                     if (!response.ok) {
                         if (data.auto_save_off) {
                             // Server indicates auto-save was turned off
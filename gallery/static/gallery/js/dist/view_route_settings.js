@@ -98,14 +98,22 @@ class BoardSettingsManager {
                             "Content-Type": "application/json",
                             "X-CSRFToken": this.context.getCsrfToken(),
                         },
-                        body: JSON.stringify({ name: newName }),
+                        body: JSON.stringify({
+                            name: newName,
+                            version: this.context.getBoardVersion(),
+                        }),
                     });
                     const data = yield response.json();
+                    if (response.status === 409) {
+                        this.applyStaleBoard(data);
+                        return;
+                    }
                     if (!response.ok)
                         throw new Error(data.error || `HTTP error ${response.status}`);
                     if (data.status !== "success") {
                         throw new Error(data.message || "Failed to update name on server");
                     }
+                    this.context.setBoardVersion(data.version);
                     // Name is already updated in context state by data.name from server if different
                     // this.context.updateBoardNameInState(data.name); // if server can transform name
                     // this.context.updatePageTitle(data.name);
@@ -139,13 +147,14 @@ class BoardSettingsManager {
                 return;
             const newCols = parseInt(this.colsInput.value);
             const newRows = parseInt(this.rowsInput.value);
+            const maxDimension = parseInt(this.colsInput.max) || 12;
             if (isNaN(newCols) ||
                 isNaN(newRows) ||
                 newCols < 1 ||
-                newCols > 12 ||
+                newCols > maxDimension ||
                 newRows < 1 ||
-                newRows > 12) {
-                alert("Columns and Rows must be numbers between 1 and 12.");
+                newRows > maxDimension) {
+                alert(`Columns and Rows must be numbers between 1 and ${maxDimension}.`);
                 return;
             }
             const boardData = this.context.getBoardData();
@@ -167,9 +176,17 @@ class BoardSettingsManager {
                             "Content-Type": "application/json",
                             "X-CSRFToken": this.context.getCsrfToken(),
                         },
-                        body: JSON.stringify({ cols: newCols, rows: newRows }),
+                        body: JSON.stringify({
+                            cols: newCols,
+                            rows: newRows,
+                            version: this.context.getBoardVersion(),
+                        }),
                     });
                     const data = yield response.json();
+                    if (response.status === 409) {
+                        this.applyStaleBoard(data);
+                        return;
+                    }
                     if (!response.ok)
                         throw new Error(data.error || data.message || `HTTP error ${response.status}`);
                     if (data.status !== "success") {
@@ -211,6 +228,12 @@ class BoardSettingsManager {
             }
         });
     }
+    applyStaleBoard(data) {
+        this.context.applyStaleBoardSnapshot(data);
+        const boardData = this.context.getBoardData();
+        if (boardData)
+            this.initializePanel(boardData); // Show the server's name and size
+    }
     handleToggleAutoSave() {
         return __awaiter(this, void 0, void 0, function* () {
             if (!this.boardId)
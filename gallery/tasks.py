@@ -0,0 +1,27 @@
+"""
+Background job handlers (see gallery.jobs). Registered when the app is ready.
+
+The handlers import their subsystems (Pillow via previews, the solver) when they
+first run, so web workers, which only enqueue jobs, never load them.
+"""
+from .jobs import job
+from .models import BackgroundImage
+
+
+@job('probe_background_image')
+def probe_background_image(image_id):
+    image = BackgroundImage.objects.filter(pk=image_id).first()
+    if image is not None:
+        image.update_dimensions()
+
+
+@job('rate_board')
+def rate_board(board_id):
+    from .solver import update_board_difficulty
+    update_board_difficulty(board_id)
+
+
+@job('render_board_preview')
+def render_board_preview(board_id):
+    from .previews import update_board_preview
+    update_board_preview(board_id)
@@ -1,3 +1,23 @@
 from .test_api import *
 from .test_models import *
 from .test_views import *
+from .test_middleware import *
+from .test_solution import *
+from .test_large_boards import *
+from .test_grading import *
+from .test_movelog import *
+from .test_editlog import *
+from .test_versioning import *
+from .test_search import *
+from .test_solver import *
+from .test_jobs import *
+from .test_previews import *
+from .test_backgrounds import *
+from .test_db_router import *
+from .test_caching import *
+from .test_startup import *
+from .test_schema import *
+from .test_renderers import *
+from .test_occupancy import *
+from .test_daily import *
+from .test_loadtest import *
@@ -0,0 +1,63 @@
+import io
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from gallery.models import BackgroundImage, BoardGame
+
+def png_bytes(color):
+    output = io.BytesIO()
+    Image.new('RGB', (40, 30), color).save(output, format='PNG')
+    return output.getvalue()
+
+class ContentAddressedBackgroundTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_duplicate_upload_resolves_to_existing_row_and_file(self):
+        data = png_bytes('red')
+        first, created = BackgroundImage.get_or_create_from_upload(SimpleUploadedFile('shot.png', data), 'Shot')
+        self.assertTrue(created)
+        self.assertEqual(first.image.name, f'backgrounds/{first.content_hash[:2]}/{first.content_hash}.png')
+        self.assertEqual((first.width, first.height), (40, 30))
+
+        again, created = BackgroundImage.get_or_create_from_upload(SimpleUploadedFile('shot (1).png', data), 'Shot again')
+        self.assertEqual((again.pk, created), (first.pk, False))
+
+        with self.assertRaises(ValidationError):
+            BackgroundImage(name='Copy', image=SimpleUploadedFile('copy.png', data)).full_clean()
+        self.assertEqual(len(os.listdir(os.path.dirname(first.image.path))), 1)
+
+    def test_dedupe_command_merges_rows_and_moves_files(self):
+        user = User.objects.create_user(username='owner', password='pass')
+        data = png_bytes('blue')
+        names = [default_storage.save(f'backgrounds/screenshot_{i}.png', ContentFile(data)) for i in range(2)]
+        other_name = default_storage.save('backgrounds/other.png', ContentFile(png_bytes('green')))
+        keep = BackgroundImage.objects.create(name='Keep', image=names[0])
+        duplicate = BackgroundImage.objects.create(name='Duplicate', image=names[1])
+        other = BackgroundImage.objects.create(name='Other', image=other_name)
+        board = BoardGame.objects.create(user=user, background=duplicate, name='Board')
+
+        call_command('dedupe_backgrounds', '--workers', '2', stdout=StringIO())
+
+        self.assertEqual(set(BackgroundImage.objects.values_list('pk', flat=True)), {keep.pk, other.pk})
+        board.refresh_from_db()
+        self.assertEqual(board.background_id, keep.pk)
+        keep.refresh_from_db()
+        self.assertEqual(keep.image.name, f'backgrounds/{keep.content_hash[:2]}/{keep.content_hash}.png')
+        self.assertTrue(default_storage.exists(keep.image.name))
+        self.assertFalse(any(default_storage.exists(name) for name in names))
@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, Point
+from path_editor import caching
+
+# The lock needs an atomic cache.add(), as Redis and the local-memory cache have; the
+# file-based fallback's add() can let two threads in (see settings.CACHES).
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class GetOrComputeTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'payload'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(caching.get_or_compute('hot', compute, 60))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((len(calls), results), (1, ['payload'] * 8))
+
+    def test_expired_value_served_while_another_request_refreshes(self):
+        caching.get_or_compute('key', lambda: 'old', 60)
+        with mock.patch('path_editor.caching.time.time', return_value=time.time() + 61):
+            cache.add('key:lock', 'someone-else')
+            self.assertEqual(caching.get_or_compute('key', lambda: 'new', 60), 'old')
+            cache.delete('key:lock')
+            self.assertEqual(caching.get_or_compute('key', lambda: 'new', 60), 'new')
+
+class SharedCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+        # 'worker' is another process's connection to the same cache.
+        override = override_settings(CACHES={'default': backend, 'worker': backend})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_locks_and_generations_are_shared_between_processes(self):
+        worker = caches['worker']
+        worker.add('hot:lock', 'worker-token', 30)
+        finish = lambda seconds: worker.set('hot', ('payload', 0.1, time.time() + 60), 120)
+        compute = mock.Mock(return_value='recomputed')
+        with mock.patch('path_editor.caching.time.sleep', side_effect=finish):
+            self.assertEqual(caching.get_or_compute('hot', compute, 60), 'payload')
+        compute.assert_not_called()
+
+        generation = caching.cache_generation('boards')
+        caching.bump_generation('boards')
+        self.assertNotEqual(worker.get('generation:boards'), generation)
+
+class BoardPayloadCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Cached')
+        self.client.login(username='cached', password='pass')
+
+    def test_board_data_is_cached_until_the_board_changes(self):
+        url = reverse('gallery:get_board_data_api', args=[self.board.id])
+        self.client.get(url)
+        with self.assertNumQueries(2): # Session and user only
+            self.assertEqual(self.client.get(url).json()['points'], [])
+
+        Point.objects.create(route=self.board, x=1, y=1, color='#ff0000')
+        self.assertEqual(len(self.client.get(url).json()['points']), 1)
+        self.board.claim_version()
+        self.assertEqual(self.client.get(url).json()['route']['version'], self.board.version)
+
+    def test_listing_is_refreshed_when_a_board_is_saved(self):
+        url = reverse('gallery:api_playable_boards')
+        self.assertEqual([b['name'] for b in self.client.get(url).json()], ['Cached'])
+        self.board.name = 'Renamed'
+        self.board.save()
+        self.assertEqual([b['name'] for b in self.client.get(url).json()], ['Renamed'])
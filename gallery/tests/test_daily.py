@@ -0,0 +1,77 @@
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from gallery import daily
+from gallery.models import BackgroundImage, BoardGame, DailyPuzzle, Point
+
+class DailyPuzzleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='daily', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Daily', cols=3, rows=1)
+        Point.objects.create(route=self.board, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=self.board, x=3, y=1, color='#ff0000')
+        self.client.login(username='daily', password='pass')
+        self.today = timezone.localdate()
+
+    def solve(self, username):
+        player = User.objects.create_user(username=username, password='pass')
+        self.client.force_login(player)
+        path = {'color': '#ff0000', 'path_data': [{'x': x, 'y': 1} for x in (1, 2, 3)]}
+        self.client.post(reverse('gallery:save_board_paths_api', args=[self.board.id]), {'paths': [path]}, content_type='application/json')
+
+    def test_command_schedules_and_warms_the_puzzle(self):
+        with mock.patch('gallery.previews.update_board_preview') as update_preview:
+            call_command('prepare_daily_puzzle', '--auto', '--date', self.today.isoformat(), stdout=mock.Mock())
+        update_preview.assert_called_once_with(self.board.id)
+        self.assertEqual(DailyPuzzle.objects.get(date=self.today).board, self.board)
+        self.board.refresh_from_db()
+        self.assertIsNotNone(self.board.difficulty)  # Pre-solved
+
+        with self.assertNumQueries(4):  # Session and user per request only
+            data = self.client.get(reverse('gallery:daily_puzzle_api')).json()
+            self.client.get(reverse('gallery:get_board_data_api', args=[self.board.id]))
+        self.assertEqual((data['puzzle']['board_id'], data['leaderboard']), (self.board.id, []))
+
+        # Unrelated board changes keep the warmed entry.
+        other = BoardGame.objects.create(user=self.user, background=self.board.background, name='Other', cols=3, rows=1)
+        other.name = 'Renamed'
+        other.save()
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(reverse('gallery:daily_puzzle_api')).json(), data)
+
+    def test_leaderboard_ranks_earliest_solves_and_follows_changes(self):
+        DailyPuzzle.objects.create(date=self.today, board=self.board)
+        url = reverse('gallery:daily_puzzle_api')
+        self.assertEqual(self.client.get(url).json()['leaderboard'], [])
+        self.solve('first')
+        self.solve('second')
+        self.assertEqual([(e['rank'], e['username']) for e in self.client.get(url).json()['leaderboard']],
+                         [(1, 'first'), (2, 'second')])
+
+        Point.objects.create(route=self.board, x=2, y=1, color='#00ff00')  # Resets every session
+        self.assertEqual(self.client.get(url).json()['leaderboard'], [])
+
+    def test_schedule_changes_and_missing_puzzles(self):
+        url = reverse('gallery:daily_puzzle_api')
+        self.assertEqual(self.client.get(url).status_code, 404)
+        puzzle = DailyPuzzle.objects.create(date=self.today, board=self.board)
+        self.assertEqual(self.client.get(url).json()['puzzle']['name'], 'Daily')
+        self.board.name = 'Renamed'
+        self.board.save()
+        self.assertEqual(self.client.get(url).json()['puzzle']['name'], 'Renamed')
+        puzzle.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_pick_board_skips_recently_featured_boards(self):
+        DailyPuzzle.objects.create(date=self.today - datetime.timedelta(days=3), board=self.board)
+        self.assertIsNone(daily.pick_board(self.today))
+        self.assertEqual(daily.pick_board(self.today, recent_days=2), self.board)
@@ -0,0 +1,37 @@
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from gallery.models import BoardGame
+from path_editor.db_router import ReplicaRouter, read_from_replica
+
+class ReplicaRouterTests(SimpleTestCase):
+
+    def route(self, method, write=False):
+        router = ReplicaRouter()
+
+        @read_from_replica
+        def view(request):
+            before = router.db_for_read(BoardGame)
+            if write:
+                router.db_for_write(BoardGame)
+            return before, router.db_for_read(BoardGame)
+        return view(getattr(RequestFactory(), method)('/'))
+
+    def test_safe_requests_read_from_replica_until_they_write(self):
+        self.assertEqual(self.route('get'), ('replica', 'replica'))
+        self.assertEqual(self.route('get', write=True), ('replica', 'default'))
+        self.assertEqual(self.route('post'), ('default', 'default'))
+        self.assertEqual(ReplicaRouter().db_for_read(BoardGame), 'default')
+
+class ReplicaReadViewTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def test_listing_reads_from_replica(self):
+        User.objects.create_user(username='reader', password='pass')
+        self.client.login(username='reader', password='pass')
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(reverse('gallery:api_playable_boards'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('gallery_boardgame' in q['sql'] for q in replica_queries))
@@ -0,0 +1,97 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from gallery import editlog
+from gallery.models import BackgroundImage, BoardEditOperation, BoardGame, GamePlaySession, Path, Point
+
+class EditLogTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='editor', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=6, rows=6)
+        self.client.login(username='editor', password='pass')
+
+    def save_changes(self, changes):
+        response = self.client.post(
+            reverse('gallery:save_pending_changes', args=[self.board.id]), {'changes': changes}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def board_state(self):
+        self.board.refresh_from_db()
+        points = sorted(self.board.points.values_list('id', 'x', 'y', 'color'))
+        return self.board.name, self.board.cols, self.board.rows, points
+
+    def test_compact_ops(self):
+        ops = [
+            {'op': 'move', 'id': 1, 'from': [1, 1], 'to': [2, 2]},
+            {'op': 'move', 'id': 1, 'from': [2, 2], 'to': [1, 1]},
+            {'op': 'add', 'points': [{'id': 5, 'x': 3, 'y': 3, 'color': '#ff0000'}]},
+            {'op': 'delete', 'points': [{'id': 5, 'x': 3, 'y': 3, 'color': '#ff0000'}]},
+            {'op': 'rename', 'from': 'a', 'to': 'b'},
+            {'op': 'rename', 'from': 'b', 'to': 'c'},
+        ]
+        self.assertEqual(editlog.compact_ops(ops), [{'op': 'rename', 'from': 'a', 'to': 'c'}])
+
+    def test_undo_and_redo_batch_save(self):
+        self.save_changes([{'type': 'add', 'points': [{'x': 1, 'y': 1, 'color': '#ff0000'}, {'x': 6, 'y': 6, 'color': '#ff0000'}]}])
+        before = self.board_state()
+        result = self.save_changes([
+            {'type': 'update', 'pointId': Point.objects.get(x=1, y=1).id, 'x': 2, 'y': 1},
+            {'type': 'update_name', 'newName': 'Renamed'},
+            {'type': 'update_dimensions', 'newCols': 4, 'newRows': 4},
+        ])
+        self.assertEqual(len(result['all_points']), 0) # The shrink removed the (6, 6) point and its pair
+        after = self.board_state()
+
+        session = GamePlaySession.objects.create(player=self.user, board_game=self.board, is_solved=True)
+        Path.objects.bulk_create([Path(game_play_session=session, color='#ff0000', path_data=[[1, 1]])])
+
+        response = self.client.post(reverse('gallery:undo_board_edit', args=[self.board.id]), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.board_state(), before)
+        self.assertEqual(response.json()['can_redo'], True)
+        session.refresh_from_db()
+        self.assertFalse(session.is_solved)
+        self.assertFalse(session.paths.exists())
+
+        response = self.client.post(reverse('gallery:redo_board_edit', args=[self.board.id]), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.board_state(), after)
+
+        response = self.client.post(reverse('gallery:undo_board_edit', args=[self.board.id]), {'steps': 2}, content_type='application/json')
+        self.assertEqual(response.json()['applied'], [2, 1])
+        self.assertEqual(self.board.points.count(), 0)
+        self.assertEqual(response.json()['can_undo'], False)
+
+    def test_new_edit_discards_redo_history(self):
+        self.save_changes([{'type': 'update_name', 'newName': 'One'}])
+        self.client.post(reverse('gallery:undo_board_edit', args=[self.board.id]), content_type='application/json')
+        self.save_changes([{'type': 'update_name', 'newName': 'Two'}])
+        self.assertFalse(BoardEditOperation.objects.filter(board=self.board, undone=True).exists())
+        response = self.client.post(reverse('gallery:redo_board_edit', args=[self.board.id]), content_type='application/json')
+        self.assertEqual(response.json()['applied'], [])
+
+    def test_undo_conflict_after_outside_edit(self):
+        self.save_changes([{'type': 'add', 'points': [{'x': 1, 'y': 1, 'color': '#ff0000'}, {'x': 2, 'y': 2, 'color': '#ff0000'}]}])
+        Point.objects.filter(x=1, y=1).update(x=3)
+        response = self.client.post(reverse('gallery:undo_board_edit', args=[self.board.id]), content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.board.points.count(), 2)
+
+    def test_malformed_undo_body_is_rejected(self):
+        self.save_changes([{'type': 'update_name', 'newName': 'Renamed'}])
+        for body in ([1], '"x"', {'steps': True}, {'steps': 0}):
+            for name in ('gallery:undo_board_edit', 'gallery:redo_board_edit'):
+                with self.subTest(body=body, view=name):
+                    response = self.client.post(reverse(name, args=[self.board.id]), body, content_type='application/json')
+                    self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.board_state()[0], 'Renamed')
+
+    @override_settings(GALLERY_EDIT_HISTORY={'MAX_ENTRIES': 3})
+    def test_log_is_bounded(self):
+        for i in range(5):
+            self.save_changes([{'type': 'update_name', 'newName': f'Name {i}'}])
+        self.assertEqual(list(BoardEditOperation.objects.filter(board=self.board).values_list('seq', flat=True)), [3, 4, 5])
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Point
+from gallery.solution import BoardSnapshot, grade_candidate
+
+class GradeCandidateTests(TestCase):
+
+    def setUp(self):
+        # 3x2 board: red along the top row, green along the bottom row.
+        self.snapshot = BoardSnapshot.from_points(
+            1, 3, 2, [(1, 1, '#ff0000'), (3, 1, '#ff0000'), (1, 2, '#00ff00'), (3, 2, '#00ff00')]
+        )
+
+    def path(self, color, *cells):
+        return {'color': color, 'path_data': [{'x': x, 'y': y} for x, y in cells]}
+
+    def test_verdicts(self):
+        red = self.path('#ff0000', (1, 1), (2, 1), (3, 1))
+        green = self.path('#00ff00', (1, 2), (2, 2), (3, 2))
+        cases = {
+            'solved': [red, green],
+            'gap': [red],
+            'overlap': [red, self.path('#00ff00', (1, 2), (2, 2), (2, 1), (3, 1), (3, 2))],
+            'bad_endpoints': [self.path('#ff0000', (1, 1), (2, 1)), green],
+            'invalid': [self.path('#ff0000', (1, 1), (3, 1)), green],
+        }
+        for expected, candidate in cases.items():
+            with self.subTest(expected=expected):
+                self.assertEqual(grade_candidate(self.snapshot, candidate)['verdict'], expected)
+
+    def test_grade_api_is_read_only(self):
+        user = User.objects.create_user(username='bot', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        board = BoardGame.objects.create(user=user, background=bg, name='Board', cols=3, rows=2)
+        for x, y, color in ((1, 1, '#ff0000'), (3, 1, '#ff0000'), (1, 2, '#00ff00'), (3, 2, '#00ff00')):
+            Point.objects.create(route=board, x=x, y=y, color=color)
+        self.client.login(username='bot', password='pass')
+        solved = [self.path('#ff0000', (1, 1), (2, 1), (3, 1)), self.path('#00ff00', (1, 2), (2, 2), (3, 2))]
+        url = reverse('gallery:grade_solutions_api', args=[board.id])
+        response = self.client.post(url, {'candidates': [solved, solved[:1]] * 50}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['solved_count'], 50)
+        self.assertEqual(response.json()['results'][1]['verdict'], 'gap')
+        self.assertFalse(GamePlaySession.objects.exists())
+
+        # Changing the board's points invalidates the cached snapshot.
+        Point.objects.filter(route=board, x=3, y=1).delete()
+        Point.objects.filter(route=board, x=1, y=1).delete()
+        response = self.client.post(url, {'candidates': [solved]}, content_type='application/json')
+        self.assertEqual(response.json()['results'][0]['verdict'], 'invalid')
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from gallery import jobs
+from gallery.models import BackgroundImage, BoardGame, Job, Point
+
+calls = []
+
+@jobs.job('test_record')
+def record_call(value):
+    calls.append(value)
+
+@jobs.job('test_fail')
+def always_fail():
+    raise ValueError("boom")
+
+@override_settings(JOB_QUEUE={'EAGER': False, 'MAX_ATTEMPTS': 2, 'RETRY_BACKOFF': 10})
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_claim_and_run(self):
+        job = jobs.enqueue('test_record', {'value': 1}, unique=True)
+        self.assertIsNone(jobs.enqueue('test_record', {'value': 1}, unique=True))
+        self.assertEqual(jobs.claim('worker-a', 5), [job.id])
+        self.assertEqual(jobs.claim('worker-b', 5), [])
+
+        self.assertTrue(jobs.run_job(job.id, 'worker-a'))
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+        with self.assertRaises(ValueError):
+            jobs.enqueue('no_such_job')
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = jobs.enqueue('test_fail')
+        self.assertEqual(jobs.run_pending('worker-a'), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=5))
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run_pending('worker-a')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertEqual(jobs.claim('worker-a', 5), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        job = jobs.enqueue('test_record', {'value': 2}, delay=60)
+        self.assertEqual(jobs.claim('worker-a', 5), [])
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.claim('worker-a', 5)
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(jobs.claim('worker-b', 5), [job.id])
+        self.assertFalse(jobs.run_job(job.id, 'worker-a'))
+        self.assertTrue(jobs.run_job(job.id, 'worker-b'))
+        self.assertEqual(calls, [2])
+
+    @override_settings(JOB_QUEUE={'EAGER': True})
+    def test_eager_runs_inline_unless_delayed(self):
+        self.assertIsNone(jobs.enqueue('test_record', {'value': 3}))
+        self.assertIsNotNone(jobs.enqueue('test_record', {'value': 4}, delay=5))
+        self.assertEqual(calls, [3])
+
+    def test_point_changes_queue_one_rating(self):
+        user = User.objects.create_user(username='worker', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        board = BoardGame.objects.create(user=user, background=bg, name='Pair', cols=2, rows=1)
+        Point.objects.create(route=board, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=board, x=2, y=1, color='#ff0000')
+        job = Job.objects.get(name='rate_board')
+        self.assertEqual(job.payload, {'board_id': board.id})
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run_pending('worker-a')
+        self.assertFalse(Job.objects.filter(name='rate_board').exists())
+        board.refresh_from_db()
+        self.assertEqual((board.difficulty, board.difficulty_stale), (10.0, False))
+
+    def test_deleting_a_board_leaves_no_jobs(self):
+        user = User.objects.create_user(username='deleter', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        boards = [BoardGame.objects.create(user=user, background=bg, name=f'Doomed {i}', cols=3, rows=1) for i in range(2)]
+        for board in boards:
+            for x in (1, 3):
+                Point.objects.create(route=board, x=x, y=1, color='#ff0000')
+        Job.objects.all().delete()
+
+        with self.assertNumQueries(9):  # No per-point resets, recounts or jobs
+            boards[0].delete()
+        BoardGame.objects.filter(pk=boards[1].pk).delete()
+        self.assertFalse(Job.objects.exists())
+        Point.objects.create(route=BoardGame.objects.create(user=user, background=bg, name='Live', cols=3, rows=1), x=1, y=1, color='#ff0000')
+        self.assertTrue(Job.objects.filter(name='rate_board').exists())  # Resets work again afterwards
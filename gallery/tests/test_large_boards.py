@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Path, Point
+
+class LargeBoardTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', password='pass')
+        self.bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+
+    def test_max_dimension_is_configurable(self):
+        board = BoardGame.objects.create(user=self.user, background=self.bg, name='Marathon', cols=50, rows=50)
+        self.assertEqual(board.cols, 50)
+        with self.assertRaises(ValidationError):
+            BoardGame.objects.create(user=self.user, background=self.bg, name='Too big', cols=51, rows=50)
+        with self.settings(GALLERY_BOARD_MAX_DIMENSION=12):
+            with self.assertRaises(ValidationError):
+                BoardGame.objects.create(user=self.user, background=self.bg, name='Capped', cols=13, rows=13)
+
+    def test_api_create_board_accepts_large_boards(self):
+        self.client.login(username='author', password='pass')
+        response = self.client.post(
+            reverse('gallery:api_create_board'),
+            {'name': 'Big', 'rows': 25, 'cols': 40, 'background_id': self.bg.id},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(
+            reverse('gallery:api_create_board'),
+            {'name': 'Bigger', 'rows': 51, 'cols': 40, 'background_id': self.bg.id},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_path_clean_on_large_board(self):
+        board = BoardGame.objects.create(user=self.user, background=self.bg, name='Marathon', cols=50, rows=50)
+        Point.objects.create(route=board, x=1, y=50, color='#123456')
+        Point.objects.create(route=board, x=50, y=50, color='#123456')
+        session = GamePlaySession.objects.create(player=self.user, board_game=board)
+        row = [{'x': x, 'y': 50} for x in range(1, 51)]
+        Path(game_play_session=session, color='#123456', path_data=row).clean()
+
+        invalid_paths = {
+            'gap': row[:10] + row[11:],
+            'self-intersection': row[:3] + [row[1]] + row[1:],
+            'out of bounds': row[:-1] + [{'x': 51, 'y': 50}],
+            'wrong endpoints': row[:-1],
+        }
+        for reason, path_data in invalid_paths.items():
+            with self.subTest(reason=reason):
+                with self.assertRaises(ValidationError):
+                    Path(game_play_session=session, color='#123456', path_data=path_data).clean()
@@ -0,0 +1,42 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.servers.basehttp import WSGIServer
+from django.test import LiveServerTestCase
+from django.test.testcases import LiveServerThread, QuietWSGIRequestHandler
+from gallery.models import BackgroundImage, GamePlaySession
+
+class SerialLiveServerThread(LiveServerThread):
+    # Serves one request at a time: the test database's in-memory SQLite connection is
+    # shared with the server thread and can't take concurrent requests.
+
+    def _create_server(self, connections_override=None):
+        return WSGIServer((self.host, self.port), QuietWSGIRequestHandler, allow_reuse_address=False)
+
+class LoadTestCommandTests(LiveServerTestCase):
+    databases = {'default', 'replica'}
+    server_thread_class = SerialLiveServerThread
+
+    def test_reports_every_endpoint_without_errors(self):
+        BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        out = StringIO()
+        call_command(
+            'loadtest', '--url', self.live_server_url, '--editors', '1', '--players', '1', '--duration', '1',
+            '--ramp-up', '0', '--autosave-interval', '0.05', '--editor-think', '0.05', stdout=out,
+        )
+        rows = {}
+        for line in out.getvalue().splitlines():
+            fields = line.split()
+            if len(fields) == 9 and fields[1].isdigit():
+                rows[fields[0]] = fields
+        # The player's first save goes to the board-scoped URL and creates its session.
+        self.assertEqual(rows['get_or_create_game_session'][1], '1')
+        self.assertEqual(rows['save_board_paths_api'][1], '1')
+        self.assertGreater(int(rows['save_all_paths_api'][1]), 1)
+        self.assertTrue({'update_point', 'save_pending_changes'} & set(rows))
+        self.assertEqual({endpoint: fields[3] for endpoint, fields in rows.items()}, dict.fromkeys(rows, '0'))
+        self.assertIn('Done.', out.getvalue())
+
+        session = GamePlaySession.objects.get(player=User.objects.get(username='loadtest-player-0'))
+        self.assertTrue(session.paths.exists())
@@ -0,0 +1,131 @@
+import os
+import tempfile
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame
+
+class RequestProfilingMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='pass')
+        self.bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=self.bg, name='Board')
+        self.client.login(username='testuser', password='pass')
+
+    @override_settings(REQUEST_PROFILING={'ENABLED': True})
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('gallery:get_board_data_api', args=[self.board.id]))
+        self.assertEqual(response.status_code, 200)
+        header = response['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('serialize;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    @override_settings(REQUEST_PROFILING={'ENABLED': False})
+    def test_disabled(self):
+        response = self.client.get(reverse('gallery:get_board_data_api', args=[self.board.id]))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_sampled_profile_written(self):
+        with tempfile.TemporaryDirectory() as profile_dir:
+            config = {'ENABLED': True, 'PROFILE_SAMPLE_RATE': 1.0, 'PROFILE_DIR': profile_dir}
+            with override_settings(REQUEST_PROFILING=config):
+                self.client.get(reverse('gallery:api_playable_boards'))
+            dumps = os.listdir(profile_dir)
+            self.assertEqual(len(dumps), 1)
+            self.assertIn('gallery_api_playable_boards', dumps[0])
+
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='pass')
+        self.bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=self.bg, name='Board')
+        self.client.login(username='testuser', password='pass')
+
+    def test_histogram_exposition(self):
+        from path_editor.metrics import Histogram
+        histogram = Histogram('test_latency_seconds', 'Test.', labelnames=('view',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, view='a')
+        histogram.observe(0.5, view='a')
+        histogram.observe(5, view='a')
+        lines = histogram.collect()
+        self.assertIn('test_latency_seconds_bucket{view="a",le="0.1"} 1', lines)
+        self.assertIn('test_latency_seconds_bucket{view="a",le="1"} 2', lines)
+        self.assertIn('test_latency_seconds_bucket{view="a",le="+Inf"} 3', lines)
+        self.assertIn('test_latency_seconds_count{view="a"} 3', lines)
+
+    def test_request_metrics_recorded(self):
+        from path_editor.metrics import REQUEST_LATENCY, REQUEST_ERRORS
+        view = 'gallery:get_board_data_api'
+        before = REQUEST_LATENCY.count(view=view, method='GET')
+        errors_before = REQUEST_ERRORS.value(view=view, status_class='4xx')
+        self.client.get(reverse(view, args=[self.board.id]))
+        self.client.get(reverse(view, args=[999999]))
+        self.assertEqual(REQUEST_LATENCY.count(view=view, method='GET'), before + 2)
+        self.assertEqual(REQUEST_ERRORS.value(view=view, status_class='4xx'), errors_before + 1)
+
+    def test_metrics_endpoint(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('gallery_session_resets_total', body)
+
+    def test_metrics_endpoint_forbidden_for_remote_hosts(self):
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.1.2.3')
+        self.assertEqual(response.status_code, 403)
+
+
+import gzip
+import json
+from unittest import mock
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from path_editor.middleware import CompressionMiddleware, _Gzip
+
+@override_settings(RESPONSE_COMPRESSION={'ENCODINGS': ['gzip'], 'MIN_SIZE': 200})
+class CompressionMiddlewareTests(SimpleTestCase):
+    payload = {'paths': [{'color': '#ff0000', 'path_data': [{'x': x, 'y': 1} for x in range(50)]}]}
+
+    def respond(self, response, accept_encoding='gzip, br;q=0'):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def test_json_is_gzipped(self):
+        response = self.respond(JsonResponse(self.payload))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.payload)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+    def test_skips_small_unlisted_and_unaccepted_responses(self):
+        self.assertFalse(self.respond(JsonResponse({'ok': True})).has_header('Content-Encoding'))
+        self.assertFalse(self.respond(HttpResponse(b'x' * 1000, content_type='image/png')).has_header('Content-Encoding'))
+        self.assertFalse(self.respond(JsonResponse(self.payload), accept_encoding='identity').has_header('Content-Encoding'))
+
+    def test_html_is_never_compressed(self):
+        page = HttpResponse(b'<input name="csrfmiddlewaretoken" value="secret">' * 100, content_type='text/html; charset=utf-8')
+        response = self.respond(page)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('Accept-Encoding', response.get('Vary', ''))
+
+    def test_identical_responses_are_compressed_once(self):
+        middleware = CompressionMiddleware(lambda request: JsonResponse(self.payload))
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        with mock.patch.object(_Gzip, 'compress', autospec=True, side_effect=lambda self, data: gzip.compress(data)) as compress:
+            first, second = middleware(request), middleware(request)
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_streaming_response_is_compressed_per_chunk(self):
+        lines = [json.dumps({'seq': seq}) + '\n' for seq in range(100)]
+        response = self.respond(StreamingHttpResponse(iter(lines), content_type='application/x-ndjson'))
+        chunks = list(response.streaming_content)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(gzip.decompress(b''.join(chunks)).decode(), ''.join(lines))
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from gallery import movelog
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, SessionMoveChunk
+import json
+
+class MoveLogTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='player', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=5, rows=4)
+        self.session = GamePlaySession.objects.create(player=self.user, board_game=self.board)
+        self.client.login(username='player', password='pass')
+
+    def moves(self, count, start_t=1_700_000_000_000):
+        return [
+            {'op': 'start' if i == 0 else 'step', 'color': '#a1b2c3', 'x': i % 5 + 1, 'y': i // 5 % 4 + 1, 't': start_t + i * 40}
+            for i in range(count)
+        ]
+
+    def test_round_trip(self):
+        moves = self.moves(7) + [{'op': 'clear', 'color': '#a1b2c3', 't': 1_700_000_001_000}]
+        seq = movelog.append_moves(self.session, moves)
+        self.assertEqual(seq, 1)
+        chunk = SessionMoveChunk.objects.get(session=self.session)
+        self.assertEqual(len(bytes(chunk.data)), 8 * movelog.RECORD.size)
+        self.assertEqual(movelog.decode_chunk(chunk), moves)
+
+    @override_settings(GALLERY_MOVE_LOG={'COMPACT_EVERY': 4, 'MAX_MOVES': 10})
+    def test_compaction_merges_and_caps(self):
+        all_moves = []
+        for batch in range(4):
+            batch_moves = self.moves(3, start_t=1_700_000_000_000 + batch * 1000)
+            all_moves += batch_moves
+            movelog.append_moves(self.session, batch_moves)
+        chunks = list(SessionMoveChunk.objects.filter(session=self.session))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].seq, 4)
+        self.assertEqual(movelog.decode_chunk(chunks[0]), all_moves[-10:])
+        self.assertEqual(movelog.append_moves(self.session, self.moves(1)), 5)
+
+    @override_settings(GALLERY_MOVE_LOG={'COMPACT_EVERY': 4, 'MAX_MOVES': 10})
+    def test_replay_resumes_inside_merged_chunks(self):
+        batches = [self.moves(3, start_t=1_700_000_000_000 + batch * 1000) for batch in range(4)]
+        for batch in batches:
+            movelog.append_moves(self.session, batch)
+        replay = lambda after_seq: [moves for seq, moves in movelog.iter_replay(self.session, after_seq=after_seq)]
+        self.assertEqual(replay(2), [batches[2] + batches[3]])
+        self.assertEqual(replay(3), [batches[3]])
+        self.assertEqual(replay(0), [(batches[0] + batches[1] + batches[2] + batches[3])[-10:]])
+        self.assertEqual(replay(4), [])
+
+    def test_append_and_replay_api(self):
+        append_url = reverse('gallery:append_moves_api', args=[self.session.id])
+        for _ in range(3):
+            response = self.client.post(append_url, {'moves': self.moves(4)}, content_type='application/json')
+            self.assertEqual(response.status_code, 201)
+        response = self.client.post(append_url, {'moves': [{'op': 'step', 'color': '#a1b2c3', 'x': 9, 'y': 1}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post(append_url, [], content_type='application/json').status_code, 400)
+        with mock.patch('gallery.movelog.append_moves', side_effect=IntegrityError):
+            self.assertEqual(self.client.post(append_url, {'moves': self.moves(1)}, content_type='application/json').status_code, 409)
+
+        response = self.client.get(reverse('gallery:replay_moves_api', args=[self.session.id]), {'after_seq': 1})
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([line['seq'] for line in lines], [2, 3])
+        self.assertEqual(lines[0]['moves'], self.moves(4))
+
+    def test_reset_progress_clears_log(self):
+        movelog.append_moves(self.session, self.moves(2))
+        self.session.reset_progress()
+        self.assertFalse(SessionMoveChunk.objects.exists())
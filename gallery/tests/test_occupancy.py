@@ -0,0 +1,97 @@
+from django.test import TestCase
+from gallery import occupancy
+from path_editor.caching import cache_lock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Path, Point
+
+class MoveValidationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='mover', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=3, rows=2)
+        for x, y, color in ((1, 1, '#ff0000'), (3, 1, '#ff0000'), (1, 2, '#00ff00'), (3, 2, '#00ff00')):
+            Point.objects.create(route=self.board, x=x, y=y, color=color)
+        self.client.login(username='mover', password='pass')
+        self.url = reverse('gallery:validate_move_api', args=[self.board.id])
+
+    def move(self, op, color, x=None, y=None):
+        response = self.client.post(self.url, {'op': op, 'color': color, 'x': x, 'y': y}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def reason(self, *move):
+        return self.move(*move).get('reason')
+
+    def test_moves_are_checked_against_the_occupancy(self):
+        red, green = '#ff0000', '#00ff00'
+        self.assertEqual(self.reason('step', red, 2, 1), 'not_started')
+        self.assertEqual(self.reason('start', red, 2, 1), 'not_an_endpoint')
+        self.assertTrue(self.move('start', red, 1, 1)['valid'])
+        self.assertEqual(self.reason('step', red, 3, 1), 'not_adjacent')
+        self.assertEqual(self.reason('step', red, 0, 1), 'out_of_bounds')
+        self.assertEqual(self.reason('step', red, 1, 2), 'collision')  # Green's point
+        self.assertTrue(self.move('step', red, 2, 1)['valid'])
+        self.assertEqual(self.reason('step', red, 1, 1), 'self_intersection')
+        self.assertTrue(self.move('step', red, 2, 2)['valid'])
+        self.assertTrue(self.move('retract', red)['valid'])
+        self.assertEqual(self.move('step', red, 3, 1), {'valid': True, 'complete': True, 'solved': False})
+        self.assertEqual(self.reason('step', red, 3, 2), 'already_complete')
+
+        self.move('start', green, 1, 2)
+        self.assertEqual(self.reason('step', green, 1, 1), 'collision')
+        self.move('step', green, 2, 2)
+        with self.assertNumQueries(2):  # Session and user only
+            self.assertEqual(self.move('step', green, 3, 2), {'valid': True, 'complete': True, 'solved': True})
+        self.assertEqual(self.reason('step', '#0000ff', 1, 1), 'unknown_color')
+
+    def test_state_is_seeded_from_saved_paths_and_reset_by_board_edits(self):
+        session = GamePlaySession.objects.create(player=self.user, board_game=self.board)
+        Path.objects.bulk_create([Path(game_play_session=session, color='#ff0000',
+                                       path_data=[{'x': 1, 'y': 1}, {'x': 2, 'y': 1}])])
+        self.assertEqual(self.reason('step', '#00ff00', 2, 1), 'not_started')
+        self.assertTrue(self.move('start', '#00ff00', 1, 2)['valid'])
+        self.assertEqual(self.reason('step', '#00ff00', 1, 1), 'collision')
+        self.assertTrue(self.move('step', '#ff0000', 3, 1)['complete'])
+
+        Path.objects.all().delete()
+        Point.objects.filter(color='#00ff00', x=3).update(x=2)
+        self.board.claim_version()
+        self.assertEqual(self.reason('step', '#ff0000', 2, 1), 'not_started')
+
+    def test_malformed_move_is_rejected(self):
+        response = self.client.post(self.url, {'op': 'jump', 'color': '#ff0000'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {'op': 'step', 'color': '#ff0000', 'x': '1', 'y': 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_concurrent_moves_do_not_overwrite_each_other(self):
+        key = occupancy.occupancy_cache_key(self.board.id, self.user.id)
+        with cache_lock(key) as locked:  # Another request is checking a move
+            self.assertTrue(locked)
+            self.assertEqual(self.reason('start', '#ff0000', 1, 1), 'conflict')
+            occupancy.replace_state(self.board.id, self.user.id, None)  # A save meanwhile drops the state
+            self.assertIsNone(cache.get(key))
+        self.assertTrue(self.move('start', '#ff0000', 1, 1)['valid'])
+        self.assertTrue(self.move('step', '#ff0000', 2, 1)['valid'])
+        self.assertEqual(cache.get(key).paths, {'#ff0000': [0, 1]})
+
+    def test_boards_with_more_than_255_colors(self):
+        board = BoardGame.objects.create(user=self.user, background=self.board.background, name='Big', cols=50, rows=50)
+        colors = [f'#{i:06x}' for i in range(300)]
+        Point.objects.bulk_create(
+            Point(route=board, x=x, y=i // 25 + 1, color=color)
+            for i, color in enumerate(colors) for x in (2 * (i % 25) + 1, 2 * (i % 25) + 2)
+        )
+        last = colors[-1]  # Color index 300, on row 12
+        occupancy.apply_move(board.id, self.user.id, 'start', last, 49, 12)
+        state, snapshot = occupancy.apply_move(board.id, self.user.id, 'step', last, 50, 12)
+        self.assertTrue(state.is_complete(snapshot, last))
+        self.assertEqual(state.cells[11 * 50 + 49], 300)
+
+        state = occupancy.build_state(snapshot, [(last, [{'x': 49, 'y': 12}, {'x': 50, 'y': 12}])])
+        self.assertEqual(state.paths, {last: [11 * 50 + 48, 11 * 50 + 49]})
+        self.assertTrue(state.is_complete(snapshot, last))
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from PIL import Image
+from gallery import previews
+from gallery.models import BackgroundImage, BoardGame, Job, Point
+
+class BoardPreviewTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root, GALLERY_PREVIEWS={'MAX_SIZE': 120, 'FORMAT': 'PNG'})
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username='painter', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Preview', cols=6, rows=4)
+        Point.objects.create(route=self.board, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=self.board, x=6, y=4, color='#ff0000')
+        self.client.login(username='painter', password='pass')
+
+    def test_renders_once_per_board_state(self):
+        self.assertTrue(Job.objects.filter(name='render_board_preview').exists())
+        first = previews.update_board_preview(self.board.id)
+        path = previews.preview_path(self.board.id, first)
+        with Image.open(path) as img:
+            self.assertEqual(img.size, (120, 80))
+            self.assertEqual(img.getpixel((10, 10))[:3], (255, 0, 0))
+        mtime = os.path.getmtime(path)
+        self.assertEqual(previews.update_board_preview(self.board.id), first)
+        self.assertEqual(os.path.getmtime(path), mtime)
+
+        Point.objects.filter(route=self.board, x=6).update(x=5)
+        second = previews.update_board_preview(self.board.id)
+        self.assertNotEqual(second, first)
+        self.assertFalse(os.path.exists(path))
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.preview_fingerprint, second)
+
+    def test_preview_url_is_immutable(self):
+        self.assertIsNone(self.client.get(reverse('gallery:api_playable_boards')).json()[0]['preview_url'])
+        fingerprint = previews.update_board_preview(self.board.id)
+        url = self.client.get(reverse('gallery:api_playable_boards')).json()[0]['preview_url']
+        self.assertEqual(url, reverse('gallery:board_preview', args=[self.board.id, fingerprint]))
+
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'\x89PNG'))
+
+        stale = self.client.get(reverse('gallery:board_preview', args=[self.board.id, '0' * 16]))
+        self.assertRedirects(stale, url, fetch_redirect_response=False)
+
+    def test_preview_requests_never_render(self):
+        url = reverse('gallery:board_preview', args=[self.board.id, '0' * 16])
+        with mock.patch('gallery.previews.update_board_preview') as update_preview:
+            self.assertEqual(self.client.get(url).status_code, 404)  # Not rendered yet
+        update_preview.assert_not_called()
+
+        fingerprint = previews.update_board_preview(self.board.id)
+        os.remove(previews.preview_path(self.board.id, fingerprint))
+        Job.objects.all().delete()
+        self.assertEqual(self.client.get(reverse('gallery:board_preview', args=[self.board.id, fingerprint])).status_code, 404)
+        self.assertTrue(Job.objects.filter(name='render_board_preview').exists())
+
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 302)  # To the login page
@@ -0,0 +1,59 @@
+import json
+from io import StringIO
+from unittest import skipIf, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Point
+from gallery.renderers import MEDIA_TYPE, msgpack
+
+class MsgpackGameApiTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='packer', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=3, rows=1)
+        Point.objects.create(route=self.board, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=self.board, x=3, y=1, color='#ff0000')
+        self.client.login(username='packer', password='pass')
+        self.path = {'color': '#ff0000', 'path_data': [{'x': x, 'y': 1} for x in (1, 2, 3)]}
+
+    def test_json_is_the_default_and_the_fallback(self):
+        url = reverse('gallery:get_board_data_api', args=[self.board.id])
+        self.assertEqual(self.client.get(url).json()['route']['cols'], 3)
+        response = self.client.get(url, HTTP_ACCEPT=f'{MEDIA_TYPE}, */*')
+        self.assertEqual(response['Content-Type'], MEDIA_TYPE if msgpack else 'application/json')
+
+    @skipUnless(msgpack, "msgpack isn't installed")
+    def test_save_and_read_session_as_msgpack(self):
+        response = self.client.post(reverse('gallery:save_board_paths_api', args=[self.board.id]),
+                                    msgpack.packb({'paths': [self.path]}), content_type=MEDIA_TYPE, HTTP_ACCEPT=MEDIA_TYPE)
+        self.assertEqual(response['Content-Type'], MEDIA_TYPE)
+        self.assertTrue(msgpack.unpackb(response.content)['is_solved'])
+
+        response = self.client.get(reverse('gallery:get_or_create_game_session', args=[self.board.id]), HTTP_ACCEPT=MEDIA_TYPE)
+        session = msgpack.unpackb(response.content)
+        self.assertEqual(session['id'], GamePlaySession.objects.get().id)
+        self.assertEqual(session['paths'][0]['path_data'], self.path['path_data'])
+
+    @skipUnless(msgpack, "msgpack isn't installed")
+    def test_malformed_body_is_rejected(self):
+        response = self.client.post(reverse('gallery:save_board_paths_api', args=[self.board.id]), b'\xc1', content_type=MEDIA_TYPE)
+        self.assertEqual(response.status_code, 400)
+
+    @skipIf(msgpack, "msgpack is installed")
+    def test_msgpack_bodies_are_unsupported_without_msgpack(self):
+        response = self.client.post(reverse('gallery:save_board_paths_api', args=[self.board.id]), b'\x80', content_type=MEDIA_TYPE)
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(GamePlaySession.objects.exists())
+
+    def test_encoding_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_encoding', '--size', '05x05', '--kind', 'hard', '--repeat', '1', '--json', stdout=out, stderr=StringIO())
+        results = json.loads(out.getvalue())
+        self.assertTrue(results)
+        for formats in results.values():
+            self.assertEqual(set(formats), {'json', 'msgpack'} if msgpack else {'json'})
+            self.assertGreater(formats['json']['bytes'], formats['json']['gzip_bytes'] / 2)
@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from path_editor import schema
+
+class PrecomputedSchemaTests(SimpleTestCase):
+
+    def setUp(self):
+        self.schema_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.schema_dir)
+        override = override_settings(OPENAPI_SCHEMA={'DIR': self.schema_dir})
+        override.enable()
+        self.addCleanup(override.disable)
+        schema.reset()
+        self.addCleanup(schema.reset)
+
+    def test_schema_is_built_once_and_served_from_hashed_files(self):
+        with mock.patch('path_editor.schema.render', wraps=schema.render) as render:
+            response = self.client.get('/api/schema/')
+            self.client.get('/api/schema/')
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi; charset=utf-8')
+        self.assertIn(b'/gallery/api/board/{board_id}/data/', response.content)
+        manifest = schema.read_manifest()
+        self.assertEqual(sorted(os.listdir(self.schema_dir)), sorted(['manifest.json', *manifest['files'].values()]))
+
+        self.assertEqual(self.client.get('/api/schema/', HTTP_ACCEPT='application/json').json()['openapi'][:2], '3.')
+        self.assertEqual(self.client.get('/api/schema/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_rebuilds_when_the_urlconf_changes(self):
+        schema.build()
+        schema.reset()
+        with mock.patch('path_editor.schema.render', wraps=schema.render) as render:
+            self.client.get('/api/schema/')
+            self.assertEqual(render.call_count, 0)
+            schema.reset()
+            with mock.patch('path_editor.schema.urlconf_fingerprint', return_value='changed'):
+                self.client.get('/api/schema/')
+            self.assertEqual(render.call_count, 1)
+        self.assertEqual(schema.read_manifest()['urlconf'], 'changed')
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from gallery import search
+from gallery.models import BackgroundImage, BoardGame, Point
+
+class BoardSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice', password='pass')
+        self.bob = User.objects.create_user(username='bob', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.river = BoardGame.objects.create(user=self.alice, background=bg, name='River Crossing', cols=6, rows=6)
+        self.rivet = BoardGame.objects.create(user=self.bob, background=bg, name='Rivet factory', cols=8, rows=6)
+        self.maze = BoardGame.objects.create(user=self.bob, background=bg, name='Maze of rivers', cols=8, rows=8)
+        self.client.login(username='alice', password='pass')
+
+    def search(self, **params):
+        response = self.client.get(reverse('gallery:api_search_boards'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_tokenize(self):
+        self.assertEqual(search.tokenize('Maze: of MAZE-rivers!'), ['maze', 'of', 'rivers'])
+
+    def test_prefix_match_requires_every_word(self):
+        self.assertEqual({b['id'] for b in self.search(q='riv')['results']}, {self.river.id, self.rivet.id, self.maze.id})
+        self.assertEqual([b['id'] for b in self.search(q='riv maz')['results']], [self.maze.id])
+        self.assertEqual(self.search(q='crossings')['total'], 0)
+
+    def test_rename_reindexes(self):
+        self.river.name = 'Lake'
+        self.river.save(update_fields=['name'])
+        self.assertEqual([b['id'] for b in self.search(q='lak')['results']], [self.river.id])
+        self.assertEqual(self.search(q='crossing')['total'], 0)
+
+    def test_facets_ignore_their_own_filter(self):
+        data = self.search(q='riv', cols=8)
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['facets']['cols'], [{'value': 8, 'count': 2}, {'value': 6, 'count': 1}])
+        self.assertEqual(data['facets']['creator'], [{'value': self.bob.id, 'label': 'bob', 'count': 2}])
+
+        page = self.search(page=2, page_size=2)
+        self.assertEqual((page['total'], len(page['results'])), (3, 1))
+
+    def test_color_count_follows_points(self):
+        Point.objects.create(route=self.river, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=self.river, x=2, y=2, color='#ff0000')
+        Point.objects.create(route=self.river, x=3, y=3, color='#00ff00')
+        self.river.refresh_from_db()
+        self.assertEqual(self.river.color_count, 2)
+        Point.objects.filter(route=self.river, color='#00ff00').delete()
+        self.assertEqual(self.search(color_count=1)['results'][0]['id'], self.river.id)
+
+    def test_facets_follow_board_changes(self):
+        self.assertEqual(self.search()['facets']['rows'], [{'value': 6, 'count': 2}, {'value': 8, 'count': 1}])
+        self.maze.rows = 6
+        self.maze.save(update_fields=['rows'])
+        self.assertEqual(self.search()['facets']['rows'], [{'value': 6, 'count': 3}])
+        self.rivet.delete()
+        self.assertEqual(self.search()['facets']['creator'], [{'value': self.alice.id, 'label': 'alice', 'count': 1},
+                                                             {'value': self.bob.id, 'label': 'bob', 'count': 1}])
+
+        self.assertEqual(self.search()['facets']['color_count'], [{'value': 0, 'count': 2}])
+        Point.objects.create(route=self.river, x=1, y=1, color='#ff0000')
+        self.assertEqual(self.search()['facets']['color_count'], [{'value': 0, 'count': 1}, {'value': 1, 'count': 1}])
@@ -0,0 +1,58 @@
+from collections import Counter
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from gallery.benchmarks.corpus import load_corpus
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Point
+from gallery.solution import check_solution
+
+class BenchmarkCorpusTests(SimpleTestCase):
+
+    def test_candidates_match_solvability(self):
+        for board in load_corpus(sizes=['05x05', '12x12', '25x25']):
+            with self.subTest(board=board['name']):
+                colors = Counter(p['color'] for p in board['points'])
+                self.assertTrue(all(count == 2 for count in colors.values()))
+                paths = [(p['color'], p['path_data']) for p in board['candidate']]
+                self.assertEqual(check_solution(board['rows'], board['cols'], colors, paths), board['solvable'])
+
+    def test_unsolvable_boards_seal_a_corner(self):
+        for board in load_corpus(kinds=['unsolvable']):
+            with self.subTest(board=board['name']):
+                cells = {(p['x'], p['y']): p['color'] for p in board['points']}
+                self.assertNotIn((1, 1), cells)
+                self.assertNotEqual(cells[(2, 1)], cells[(1, 2)])
+
+
+class SaveAllPathsSolveCheckTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='player', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=3, rows=2)
+        for x, y, color in ((1, 1, '#ff0000'), (3, 1, '#ff0000'), (1, 2, '#00ff00'), (3, 2, '#00ff00')):
+            Point.objects.create(route=self.board, x=x, y=y, color=color)
+        self.session = GamePlaySession.objects.create(player=self.user, board_game=self.board)
+        self.client.login(username='player', password='pass')
+        self.url = reverse('gallery:save_all_paths_api', args=[self.session.id])
+
+    def row_path(self, color, y):
+        return {'color': color, 'path_data': [{'x': x, 'y': y} for x in (1, 2, 3)]}
+
+    def test_full_solution_is_solved(self):
+        paths = [self.row_path('#ff0000', 1), self.row_path('#00ff00', 2)]
+        response = self.client.post(self.url, {'paths': paths}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['is_solved'])
+        self.session.refresh_from_db()
+        self.assertTrue(self.session.is_solved)
+
+    def test_partial_solution_is_not_solved(self):
+        response = self.client.post(self.url, {'paths': [self.row_path('#ff0000', 1)]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['is_solved'])
+
+    def test_invalid_path_rejected(self):
+        bad = {'color': '#ff0000', 'path_data': [{'x': 1, 'y': 1}, {'x': 3, 'y': 1}]}
+        response = self.client.post(self.url, {'paths': [bad]}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
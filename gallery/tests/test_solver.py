@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, Point
+from gallery.solver import difficulty, solve
+
+STRIPES = [(1, 1, '#ff0000'), (3, 1, '#ff0000'), (1, 2, '#00ff00'), (3, 2, '#00ff00'), (1, 3, '#0000ff'), (3, 3, '#0000ff')]
+CORNERS = [(1, 1, '#ff0000'), (3, 3, '#ff0000')]
+
+class SolverTests(TestCase):
+
+    def test_forced_board_is_unique_and_easy(self):
+        stats = solve(3, 3, STRIPES, node_limit=1000)
+        self.assertEqual((stats.solutions, stats.nodes, stats.exhausted), (1, 0, False))
+        self.assertEqual(stats.forced_moves, stats.total_moves)
+        self.assertEqual(difficulty(stats, 1000), 10.0)
+
+    def test_branching_board_rates_harder(self):
+        stats = solve(3, 3, CORNERS, node_limit=1000)
+        self.assertEqual(stats.solutions, 2)
+        self.assertGreater(difficulty(stats, 1000), 10.0)
+
+    def test_exhausted_and_unsolvable_boards(self):
+        self.assertEqual(difficulty(solve(3, 3, CORNERS, node_limit=1), 1), 100.0)
+        crossing = [(1, 1, '#ff0000'), (3, 1, '#ff0000'), (1, 3, '#00ff00'), (3, 3, '#00ff00')]
+        self.assertIsNone(difficulty(solve(3, 3, crossing, node_limit=1000), 1000))
+        self.assertIsNone(difficulty(solve(3, 3, [(1, 1, '#ff0000')], node_limit=1000), 1000))
+
+
+class RateBoardsCommandTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rater', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.easy = BoardGame.objects.create(user=self.user, background=bg, name='Easy', cols=3, rows=3)
+        self.hard = BoardGame.objects.create(user=self.user, background=bg, name='Hard', cols=3, rows=3)
+        self.unrated = BoardGame.objects.create(user=self.user, background=bg, name='Unrated', cols=3, rows=3)
+        for board, points in ((self.easy, STRIPES), (self.hard, CORNERS)):
+            for x, y, color in points:
+                Point.objects.create(route=board, x=x, y=y, color=color)
+
+    def rate(self, *args):
+        call_command('rate_boards', *args, stdout=StringIO())
+
+    def test_rates_stale_boards_and_edits_mark_them_stale(self):
+        self.rate('--limit', '2')
+        self.easy.refresh_from_db()
+        self.assertEqual((self.easy.difficulty, self.easy.difficulty_stale), (10.0, False))
+
+        Point.objects.filter(route=self.easy, color='#0000ff').delete()
+        self.easy.refresh_from_db()
+        self.assertTrue(self.easy.difficulty_stale)
+        self.hard.cols = 4
+        self.hard.save()
+        self.hard.refresh_from_db()
+        self.assertTrue(self.hard.difficulty_stale)
+
+    def test_playable_boards_order_and_filter_by_difficulty(self):
+        self.rate()
+        self.client.login(username='rater', password='pass')
+        url = reverse('gallery:api_playable_boards')
+
+        names = [b['name'] for b in self.client.get(url, {'order': '-difficulty'}).json()]
+        self.assertEqual(names, ['Hard', 'Easy', 'Unrated'])
+        names = [b['name'] for b in self.client.get(url, {'order': 'difficulty', 'max_difficulty': 20}).json()]
+        self.assertEqual(names, ['Easy'])
+        self.assertEqual(self.client.get(url, {'order': 'size'}).status_code, 400)
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import resolve, reverse
+from path_editor.urls import LazyView
+
+class LazyViewTests(TestCase):
+
+    def test_view_is_imported_on_first_call(self):
+        view = LazyView('rest_framework_simplejwt.views.TokenRefreshView')
+        self.assertNotIn('view', view.__dict__)
+        self.assertEqual(resolve('/api/token/refresh/')._func_path, 'rest_framework_simplejwt.views.TokenRefreshView')
+        self.assertEqual(view.cls.__name__, 'TokenRefreshView')
+
+    def test_token_endpoint_works_without_csrf_token(self):
+        User.objects.create_user(username='jwt', password='pass')
+        self.client.handler.enforce_csrf_checks = True
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'jwt', 'password': 'pass'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
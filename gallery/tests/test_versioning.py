@@ -0,0 +1,62 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from gallery.models import BackgroundImage, BoardGame, Point, StaleBoardVersion
+
+class BoardVersionTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='editor', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=6, rows=6, auto_save_enabled=True)
+        self.point = Point.objects.create(route=self.board, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=self.board, x=6, y=6, color='#ff0000')
+        self.client.login(username='editor', password='pass')
+
+    def save_changes(self, changes, version):
+        return self.client.post(
+            reverse('gallery:save_pending_changes', args=[self.board.id]),
+            {'changes': changes, 'version': version}, content_type='application/json',
+        )
+
+    def test_claim_version(self):
+        self.board.claim_version(0)
+        self.assertEqual(self.board.version, 1)
+        with self.assertRaises(StaleBoardVersion):
+            self.board.claim_version(0)
+        self.board.claim_version()
+        self.assertEqual(BoardGame.objects.get(pk=self.board.pk).version, 2)
+
+    def test_stale_batch_save_is_rejected_with_snapshot(self):
+        response = self.save_changes([{'type': 'update', 'pointId': self.point.id, 'x': 2, 'y': 1}], version=0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], 1)
+
+        # A second tab still holding version 0
+        response = self.save_changes([{'type': 'update', 'pointId': self.point.id, 'x': 3, 'y': 1}], version=0)
+        self.assertEqual(response.status_code, 409)
+        data = response.json()
+        self.assertEqual(data['version'], 1)
+        self.assertIn({'id': self.point.id, 'x': 2, 'y': 1, 'color': '#ff0000'}, data['all_points'])
+        self.assertEqual(Point.objects.get(pk=self.point.pk).x, 2)
+
+    def test_autosave_endpoints_check_version(self):
+        url = reverse('gallery:update_point', args=[self.board.id, self.point.id])
+        response = self.client.put(url, {'x': 2, 'y': 2, 'version': 0}, content_type='application/json')
+        self.assertEqual(response.json()['version'], 1)
+        response = self.client.put(url, {'x': 3, 'y': 3, 'version': 0}, content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.delete(reverse('gallery:delete_point_api', args=[self.point.id]), {'version': 0},
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.board.points.count(), 2)
+
+        response = self.client.post(reverse('gallery:update_board_name', args=[self.board.id]), {'name': 'New', 'version': 1},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['version'], 2)
+
+    def test_failed_edit_does_not_bump_version(self):
+        response = self.save_changes([{'type': 'update', 'pointId': self.point.id, 'x': 6, 'y': 6}], version=0)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(BoardGame.objects.get(pk=self.board.pk).version, 0)
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.urls import reverse
-from gallery.models import BackgroundImage, BoardGame
+from gallery.models import BackgroundImage, BoardGame, GamePlaySession, Point
 from django.contrib.auth import get_user_model
 from django.contrib.auth.views import LogoutView
 from django.contrib.auth import SESSION_KEY
@@ -36,3 +36,137 @@ class ViewTests(TestCase):
         self.client.login(username='testuser', password='pass')
         response = self.client.get(reverse('gallery:route_list'))
         self.assertEqual(response.status_code, 200)
+
+
+class BulkPointPairTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='editor', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=800, height=600)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=12, rows=12)
+        self.client.login(username='editor', password='pass')
+        self.url = reverse('gallery:add_point_pairs', args=[self.board.id])
+
+    def pairs(self, count):
+        return [
+            {'color': f'#0000{i:02x}', 'points': [{'x': 1, 'y': i + 1}, {'x': 12, 'y': i + 1}]}
+            for i in range(count)
+        ]
+
+    def test_adds_all_pairs_with_constant_queries(self):
+        session = GamePlaySession.objects.create(player=self.user, board_game=self.board, is_solved=True)
+        with self.assertNumQueries(19):
+            response = self.client.post(self.url, {'pairs': self.pairs(12), 'version': 0}, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()['points']), 24)
+        self.assertEqual(response.json()['version'], 1)
+        self.assertEqual(Point.objects.filter(route=self.board).count(), 24)
+        session.refresh_from_db()
+        self.assertFalse(session.is_solved)
+
+    def test_rejects_whole_batch_on_conflict(self):
+        Point.objects.create(route=self.board, x=12, y=3, color='#ffffff')
+        response = self.client.post(self.url, {'pairs': self.pairs(4)}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('[Pair 3]', response.json()['error'])
+        self.assertEqual(Point.objects.filter(route=self.board).count(), 1)
+
+        duplicate_color = self.pairs(1) + [{'color': '#000000', 'points': [{'x': 5, 'y': 5}, {'x': 6, 'y': 6}]}]
+        response = self.client.post(self.url, {'pairs': duplicate_color}, content_type='application/json')
+        self.assertIn('[Pair 2]', response.json()['error'])
+
+        Point.objects.create(route=self.board, x=1, y=12, color='#abcdef')
+        upper_case = [{'color': '#ABCDEF', 'points': [{'x': 5, 'y': 5}, {'x': 6, 'y': 6}]}]
+        response = self.client.post(self.url, {'pairs': upper_case}, content_type='application/json')
+        self.assertIn('already has points', response.json()['error'])
+        self.assertEqual(self.board.points.count(), 2)
+
+    def test_failed_validation_keeps_the_version_and_colors_are_stored_lower_case(self):
+        response = self.client.post(self.url, {'pairs': [{'color': '#ff0000', 'points': [{'x': 99, 'y': 1}, {'x': 1, 'y': 1}]}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, 0)
+        response = self.client.post(self.url, {'pairs': [{'color': '#FF0000', 'points': [{'x': 1, 'y': 1}, {'x': 2, 'y': 1}]}]},
+                                    content_type='application/json')
+        self.assertEqual({p['color'] for p in response.json()['points']}, {'#ff0000'})
+
+    def test_boolean_coordinates_are_rejected(self):
+        pairs = [{'color': '#ff0000', 'points': [{'x': True, 'y': 1}, {'x': 2, 'y': False}]}]
+        response = self.client.post(self.url, {'pairs': pairs}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('integer x and y', response.json()['error'])
+        self.assertFalse(self.board.points.exists())
+
+
+class ForkBoardTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.user = User.objects.create_user(username='forker', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=800, height=600)
+        self.board = BoardGame.objects.create(user=self.owner, background=bg, name='Original', cols=4, rows=3)
+        Point.objects.bulk_create([
+            Point(route=self.board, x=1, y=1, color='#ff0000'), Point(route=self.board, x=4, y=3, color='#ff0000'),
+            Point(route=self.board, x=2, y=1, color='#00ff00'), Point(route=self.board, x=2, y=3, color='#00ff00'),
+        ])
+        self.client.login(username='forker', password='pass')
+        self.url = reverse('gallery:fork_board_api', args=[self.board.id])
+
+    def fork_points(self, response):
+        self.assertEqual(response.status_code, 201, response.content)
+        fork = BoardGame.objects.get(pk=response.json()['id'])
+        return fork, set(fork.points.values_list('x', 'y', 'color'))
+
+    def test_plain_fork_copies_points_in_constant_queries(self):
+        with self.assertNumQueries(13):
+            response = self.client.post(self.url, content_type='application/json')
+        fork, points = self.fork_points(response)
+        self.assertEqual((fork.user, fork.name, fork.cols, fork.rows), (self.user, 'Original (copy)', 4, 3))
+        self.assertEqual(points, set(self.board.points.values_list('x', 'y', 'color')))
+
+    def test_rotate_fork(self):
+        fork, points = self.fork_points(self.client.post(self.url, {'transform': 'rotate_90'}, content_type='application/json'))
+        self.assertEqual((fork.cols, fork.rows), (3, 4))
+        self.assertEqual(points, {(3, 1, '#ff0000'), (1, 4, '#ff0000'), (3, 2, '#00ff00'), (1, 2, '#00ff00')})
+
+    def test_shrinking_fork_drops_broken_pairs(self):
+        response = self.client.post(self.url, {'transform': 'mirror_x', 'cols': 3}, content_type='application/json')
+        fork, points = self.fork_points(response)
+        self.assertEqual(points, {(3, 1, '#00ff00'), (3, 3, '#00ff00')})
+        self.assertEqual(response.json()['points_copied'], 2)
+
+    def test_malformed_body_is_rejected(self):
+        for body in ({'name': 42}, {'name': ['x']}, ['x'], {'cols': True, 'rows': True}, {'cols': False}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(self.url, body, content_type='application/json').status_code, 400)
+        self.assertEqual(BoardGame.objects.count(), 1)
+
+
+class LazySessionTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='browser', password='pass')
+        bg = BackgroundImage.objects.create(name='BG', image='backgrounds/test.jpg', width=100, height=100)
+        self.board = BoardGame.objects.create(user=self.user, background=bg, name='Board', cols=3, rows=1)
+        Point.objects.create(route=self.board, x=1, y=1, color='#ff0000')
+        Point.objects.create(route=self.board, x=3, y=1, color='#ff0000')
+        self.client.login(username='browser', password='pass')
+
+    def test_reading_a_session_does_not_create_it(self):
+        response = self.client.get(reverse('gallery:get_or_create_game_session', args=[self.board.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['id'], response.json()['paths']), (None, []))
+        self.assertEqual(len(response.json()['board_details']['points']), 2)
+        self.assertFalse(GamePlaySession.objects.exists())
+
+    def test_first_save_creates_the_session(self):
+        path = {'color': '#ff0000', 'path_data': [{'x': x, 'y': 1} for x in (1, 2, 3)]}
+        response = self.client.post(reverse('gallery:save_board_paths_api', args=[self.board.id]),
+                                    {'paths': [path]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        session = GamePlaySession.objects.get(player=self.user, board_game=self.board)
+        self.assertEqual((response.json()['session_id'], session.is_solved), (session.id, True))
+
+        data = self.client.get(reverse('gallery:get_or_create_game_session', args=[self.board.id])).json()
+        self.assertEqual((data['id'], len(data['paths'])), (session.id, 1))
@@ -0,0 +1,43 @@
+"""
+Board geometry transforms used when forking a board.
+
+Coordinates are 1-based with y growing downwards, as everywhere else in the gallery.
+Rotations are clockwise.
+"""
+
+TRANSFORMS = ('mirror_x', 'mirror_y', 'rotate_90', 'rotate_180', 'rotate_270')
+
+
+def transformed_size(cols, rows, transform=None):
+    if transform in ('rotate_90', 'rotate_270'):
+        return rows, cols
+    return cols, rows
+
+
+def transform_cell(x, y, cols, rows, transform=None):
+    """Maps cell (x, y) of a cols x rows board to its position after `transform`."""
+    if transform is None:
+        return x, y
+    if transform == 'mirror_x':
+        return cols + 1 - x, y
+    if transform == 'mirror_y':
+        return x, rows + 1 - y
+    if transform == 'rotate_90':
+        return rows + 1 - y, x
+    if transform == 'rotate_180':
+        return cols + 1 - x, rows + 1 - y
+    if transform == 'rotate_270':
+        return y, cols + 1 - x
+    raise ValueError(f"Unknown transform {transform!r}; expected one of {', '.join(TRANSFORMS)}.")
+
+
+def transform_points(points, cols, rows, transform=None, new_size=None):
+    """
+    Transforms (x, y, color) tuples and returns them with the resulting board size.
+    With `new_size`, points that end up outside it are dropped together with their pair,
+    as when a board is shrunk in the editor.
+    """
+    out_cols, out_rows = new_size or transformed_size(cols, rows, transform)
+    moved = [(*transform_cell(x, y, cols, rows, transform), color) for x, y, color in points]
+    dropped_colors = {color for x, y, color in moved if x > out_cols or y > out_rows}
+    return [p for p in moved if p[2] not in dropped_colors], out_cols, out_rows
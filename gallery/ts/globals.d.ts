@@ -14,6 +14,7 @@ declare global {
     rows: number;
     cols: number;
     auto_save_enabled: boolean;
+    version?: number; // Bumped by every editor write; sent back so stale writes get a 409
   }
 
   interface BoardData {
@@ -43,6 +44,9 @@ declare global {
     ) => boolean;
     clearPendingChanges: () => void;
     setCurrentPointsData: (points: PointData[]) => void; // For after save
+    getBoardVersion: () => number | undefined;
+    setBoardVersion: (version?: number) => void;
+    applyStaleBoardSnapshot: (data: any) => void; // Adopt the server's board after a 409
     removePointsByColorFromState: (color: string) => PointData[]; // Removes from currentPointsData, returns removed
     removePointByIdFromState: (pointId: string) => PointData | undefined; // Removes specific point by ID
 
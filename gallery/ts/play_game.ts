@@ -38,7 +38,7 @@ interface ClientPathInfo {
 }
 
 interface GameSessionData {
-  id: number;
+  id: number | null; // null until the first save creates the session
   player_username: string;
   board_game: number;
   board_game_name: string;
@@ -781,10 +781,6 @@ class FreeFlowGame {
   }
 
   async handleSaveProgress(): Promise<void> {
-    if (!this.sessionId) {
-      this.updateGameStatus("Session ID not found. Cannot save.", true);
-      return;
-    }
     if (!this.hasUnsavedChanges && !this.isSolvedState) {
       // if not solved, and no unsaved changes
       // Allow saving if it's a newly solved state, even if hasUnsavedChanges was false before solving.
@@ -807,15 +803,17 @@ class FreeFlowGame {
     }));
 
     try {
+      // Before the first save there is no session yet; saving by board creates it.
+      const saveUrl = this.sessionId
+        ? `/gallery/api/game/session/${this.sessionId}/save_all_paths/`
+        : `/gallery/api/game/board/${currentBoardId}/session/save_all_paths/`;
       const response = await this.apiRequest<{
         message: string;
+        session_id: number;
         paths_count: number;
         is_solved: boolean;
-      }>(
-        `/gallery/api/game/session/${this.sessionId}/save_all_paths/`,
-        "POST",
-        { paths: pathsToSave }
-      );
+      }>(saveUrl, "POST", { paths: pathsToSave });
+      this.sessionId = response.session_id;
       this.isSolvedState = response.is_solved; // Update with server's authoritative state
       this.setUnsavedChanges(false); // This will re-evaluate button states
 
@@ -6,6 +6,7 @@ interface BoardGame {
   user_id: number;
   creator_username: string;
   background_image_url: string | null;
+  preview_url?: string | null; // Rendered board preview, null until the first render
   rows: number;
   cols: number;
   view_url: string;
@@ -296,7 +297,11 @@ class RouteListManager {
       const backgroundDiv = document.createElement("div");
       backgroundDiv.className =
         "w-full h-32 bg-cover bg-center rounded-t-lg mb-2";
-      if (board.background_image_url) {
+      if (board.preview_url) {
+        backgroundDiv.style.backgroundImage = `url('${board.preview_url}')`;
+        backgroundDiv.classList.replace("bg-cover", "bg-contain");
+        backgroundDiv.classList.add("bg-no-repeat");
+      } else if (board.background_image_url) {
         backgroundDiv.style.backgroundImage = `url('${board.background_image_url}')`;
       } else {
         backgroundDiv.classList.add("bg-gray-200");
@@ -179,6 +179,27 @@ class RouteEditorApp implements IRouteEditorContext {
     this.currentPointsData = [...points];
     if (this.boardData) this.boardData.points = this.currentPointsData; // Sync with boardData too
   };
+  public getBoardVersion = (): number | undefined =>
+    this.boardData?.route.version;
+  public setBoardVersion = (version?: number): void => {
+    if (this.boardData && typeof version === "number")
+      this.boardData.route.version = version;
+  };
+  public applyStaleBoardSnapshot = (data: any): void => {
+    // 409 from an editor endpoint: another tab saved first, so local edits are discarded.
+    this.clearPendingChanges();
+    if (this.boardData && data.route) this.boardData.route = data.route;
+    this.setCurrentPointsData(data.all_points || []);
+    this.rebuildBoardVisuals(
+      this.boardData?.route.cols,
+      this.boardData?.route.rows,
+      this.currentPointsData
+    );
+    if (this.boardData?.route.name)
+      this.updatePageTitle(this.boardData.route.name);
+    this.updateSaveChangesButtonState();
+    alert(data.error || "This board was changed in another editor.");
+  };
 
   public removePointsByColorFromState = (color: string): PointData[] => {
     const removed: PointData[] = [];
@@ -532,10 +553,18 @@ class RouteEditorApp implements IRouteEditorContext {
               "Content-Type": "application/json",
               "X-CSRFToken": this.csrfToken,
             },
-            body: JSON.stringify({ x: newX, y: newY }),
+            body: JSON.stringify({
+              x: newX,
+              y: newY,
+              version: this.getBoardVersion(),
+            }),
           }
         );
         const data = await response.json();
+        if (response.status === 409) {
+          this.applyStaleBoardSnapshot(data);
+          return;
+        }
         if (!response.ok) {
           if (data.auto_save_off) {
             // Server turned off auto-save
@@ -557,6 +586,7 @@ class RouteEditorApp implements IRouteEditorContext {
         if (!(data && data.success)) {
           throw new Error(data.error || "Server reported update failure.");
         }
+        this.setBoardVersion(data.version);
       } catch (err) {
         console.error("Auto-save update error:", err);
         this.currentPointsData[pointIndex] = originalPointData; // Revert data
@@ -730,10 +760,18 @@ class RouteEditorApp implements IRouteEditorContext {
             `/gallery/api/point/${idForApiCall}/delete/`,
             {
               method: "DELETE",
-              headers: { "X-CSRFToken": this.csrfToken },
+              headers: {
+                "Content-Type": "application/json",
+                "X-CSRFToken": this.csrfToken,
+              },
+              body: JSON.stringify({ version: this.getBoardVersion() }),
             }
           );
           const data = await response.json();
+          if (response.status === 409) {
+            this.applyStaleBoardSnapshot(data);
+            return;
+          }
           if (!response.ok)
             throw new Error(
               data.error || `Failed to delete point pair ${response.statusText}`
@@ -810,10 +848,17 @@ class RouteEditorApp implements IRouteEditorContext {
             "Content-Type": "application/json",
             "X-CSRFToken": this.csrfToken,
           },
-          body: JSON.stringify({ changes: this.pendingChanges }),
+          body: JSON.stringify({
+            changes: this.pendingChanges,
+            version: this.getBoardVersion(),
+          }),
         }
       );
       const data = await response.json();
+      if (response.status === 409) {
+        this.applyStaleBoardSnapshot(data);
+        return;
+      }
       if (!response.ok || data.status !== "success") {
         throw new Error(
           data.error || data.message || "Failed to save pending changes."
@@ -821,6 +866,7 @@ class RouteEditorApp implements IRouteEditorContext {
       }
       this.clearPendingChanges();
       this.setCurrentPointsData(data.all_points || []); // Server response is source of truth
+      this.setBoardVersion(data.version);
       if (this.boardData && data.board_route_data) {
         // Server might return updated route data too
         this.boardData.route = data.board_route_data;
@@ -222,9 +222,15 @@ class PointAdder {
               { ...point1, color },
               { ...point2, color },
             ],
+            version: this.context.getBoardVersion(),
           }),
         });
         const data = await response.json();
+        if (response.status === 409) {
+          this.context.applyStaleBoardSnapshot(data);
+          this.resetPairForm();
+          return;
+        }
         if (!response.ok) {
           if (data.auto_save_off) {
             // Server indicates auto-save was turned off
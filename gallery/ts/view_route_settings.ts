@@ -133,15 +133,23 @@ class BoardSettingsManager {
               "Content-Type": "application/json",
               "X-CSRFToken": this.context.getCsrfToken(),
             },
-            body: JSON.stringify({ name: newName }),
+            body: JSON.stringify({
+              name: newName,
+              version: this.context.getBoardVersion(),
+            }),
           }
         );
         const data = await response.json();
+        if (response.status === 409) {
+          this.applyStaleBoard(data);
+          return;
+        }
         if (!response.ok)
           throw new Error(data.error || `HTTP error ${response.status}`);
         if (data.status !== "success") {
           throw new Error(data.message || "Failed to update name on server");
         }
+        this.context.setBoardVersion(data.version);
         // Name is already updated in context state by data.name from server if different
         // this.context.updateBoardNameInState(data.name); // if server can transform name
         // this.context.updatePageTitle(data.name);
@@ -174,16 +182,17 @@ class BoardSettingsManager {
     if (!this.boardId) return;
     const newCols = parseInt(this.colsInput.value);
     const newRows = parseInt(this.rowsInput.value);
+    const maxDimension = parseInt(this.colsInput.max) || 12;
 
     if (
       isNaN(newCols) ||
       isNaN(newRows) ||
       newCols < 1 ||
-      newCols > 12 ||
+      newCols > maxDimension ||
       newRows < 1 ||
-      newRows > 12
+      newRows > maxDimension
     ) {
-      alert("Columns and Rows must be numbers between 1 and 12.");
+      alert(`Columns and Rows must be numbers between 1 and ${maxDimension}.`);
       return;
     }
 
@@ -214,10 +223,18 @@ class BoardSettingsManager {
               "Content-Type": "application/json",
               "X-CSRFToken": this.context.getCsrfToken(),
             },
-            body: JSON.stringify({ cols: newCols, rows: newRows }),
+            body: JSON.stringify({
+              cols: newCols,
+              rows: newRows,
+              version: this.context.getBoardVersion(),
+            }),
           }
         );
         const data = await response.json();
+        if (response.status === 409) {
+          this.applyStaleBoard(data);
+          return;
+        }
         if (!response.ok)
           throw new Error(
             data.error || data.message || `HTTP error ${response.status}`
@@ -273,6 +290,12 @@ class BoardSettingsManager {
     }
   }
 
+  private applyStaleBoard(data: any): void {
+    this.context.applyStaleBoardSnapshot(data);
+    const boardData = this.context.getBoardData();
+    if (boardData) this.initializePanel(boardData); // Show the server's name and size
+  }
+
   private async handleToggleAutoSave(): Promise<void> {
     if (!this.boardId) return;
     const autoSaveEnabled = this.autoSaveToggle.checked;
@@ -24,8 +24,12 @@ urlpatterns = [
     # --- API endpoints specifically for route_list.html frontend ---
     path('api/my-boards/', views.api_my_boards, name='api_my_boards'),
     path('api/playable-boards/', views.api_playable_boards, name='api_playable_boards'),
+    path('api/daily/', views.daily_puzzle_api, name='daily_puzzle_api'), # Puzzle of the day and its leaderboard
+    path('api/boards/search/', views.api_search_boards, name='api_search_boards'),
     path('api/backgrounds/', views.api_background_images, name='api_background_images'),
     path('api/boards/create/', views.api_create_board, name='api_create_board'), # For creating boards
+    path('api/board/<int:board_id>/fork/', views.fork_board_api, name='fork_board_api'),
+    path('board/<int:board_id>/preview/<str:fingerprint>/', views.board_preview, name='board_preview'),
     # API for deleting a specific board (used by "My Boards" delete button)
     path('route/<int:board_id>/delete/', views.delete_board_api, name='delete_board_api'),
 
@@ -34,12 +38,15 @@ urlpatterns = [
 
     path("points/update/<int:route_id>/<int:point_id>/", views.update_point, name="update_point"), 
     path('points/add/<int:route_id>/', views.add_points, name='add_points'), 
+    path('api/board/<int:board_id>/pairs/', views.add_point_pairs, name='add_point_pairs'),
 
     path('route/<int:board_id>/update-name/', views.update_board_name, name='update_board_name'),
     path('route/<int:board_id>/update-dimensions/', views.update_board_dimensions, name='update_board_dimensions'),
     
     path('api/board/<int:board_id>/toggle-autosave/', views.toggle_board_autosave, name='toggle_board_autosave'), 
     path('api/board/<int:route_id>/save-pending-changes/', views.save_pending_changes, name='save_pending_changes'), 
+    path('api/board/<int:board_id>/undo/', views.undo_board_edit, name='undo_board_edit'),
+    path('api/board/<int:board_id>/redo/', views.redo_board_edit, name='redo_board_edit'),
 
 
     # Gameplay URLs
@@ -50,5 +57,15 @@ urlpatterns = [
     
     # New endpoint for saving all paths
     path('api/game/session/<int:session_id>/save_all_paths/', views.save_all_paths_api, name='save_all_paths_api'),
+    path('api/game/board/<int:board_id>/session/save_all_paths/', views.save_all_paths_api, name='save_board_paths_api'), # First save creates the session
+
+    path('api/game/board/<int:board_id>/move/', views.validate_move_api, name='validate_move_api'), # Live per-move check
+
+    # Append-only move log and replay
+    path('api/game/session/<int:session_id>/moves/', views.append_moves_api, name='append_moves_api'),
+    path('api/game/session/<int:session_id>/moves/replay/', views.replay_moves_api, name='replay_moves_api'),
+
+    # Read-only batch grading of candidate solutions (bots / AI players)
+    path('api/board/<int:board_id>/grade/', views.grade_solutions_api, name='grade_solutions_api'),
 
 ]
\ No newline at end of file
@@ -1,26 +1,75 @@
 # START OF FILE views.py
 
 from django.shortcuts import render, get_object_or_404, redirect
-from .models import BackgroundImage, Point, BoardGame
+from .models import (
+    BOARD_LISTING, BackgroundImage, Point, BoardGame, GamePlaySession, Path, StaleBoardVersion, defer_session_resets,
+    max_board_dimension, request_session_reset, schedule_difficulty_rating, schedule_preview_render,
+)
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from .forms import PointForm
-
-from django.http import JsonResponse
+from .metrics import PATHS_SAVED, SESSIONS_SOLVED, SOLVER_CALLS
+from .renderers import game_api_parsers, game_api_renderers
+from .serializers import GamePlaySessionSerializer, PathSerializer, PointSerializer
+from . import daily, editlog, movelog, occupancy, search, transforms
+from .solution import (
+    board_data_cache_key, check_solution, get_board_snapshot, grade_candidates, invalidate_board_snapshot,
+)
+
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 import json
+import os
+from urllib.parse import urlencode
 from django.core.exceptions import ValidationError
-from django.db import transaction # For batch saving
+from django.db import IntegrityError, transaction # For batch saving
+from django.db.models import F
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 
 from django.urls import reverse
+from django.utils import timezone
+from django.conf import settings
+
+from path_editor.caching import cache_generation, get_or_compute
+from path_editor.db_router import read_from_replica
+from path_editor.middleware import timing_span
 
 # Added @login_required if it was missing and seems appropriate
 # Added @require_http_methods if it was missing and the view implies specific methods
 
 @login_required
 def route_list(request):
-    return render(request, 'gallery/route_list.html')
+    return render(request, 'gallery/route_list.html', {'max_board_dimension': max_board_dimension()})
+
+
+def _board_route_data(board):
+    return {
+        'id': board.id, 'name': board.name, 'rows': board.rows, 'cols': board.cols,
+        'auto_save_enabled': board.auto_save_enabled, 'version': board.version,
+    }
+
+
+def _expected_version(data):
+    """The board version an editor write is based on; None for clients that don't send one."""
+    version = data.get('version')
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+        raise ValidationError("'version' must be an integer.")
+    return version
+
+
+def _stale_board_response(board_id):
+    board = BoardGame.objects.get(pk=board_id)
+    return JsonResponse({
+        "error": "This board was changed in another editor. The latest version has been loaded; please redo your edit.",
+        "conflict": True,
+        "version": board.version,
+        "route": _board_route_data(board),
+        "all_points": list(board.points.all().order_by('id').values('id', 'x', 'y', 'color')),
+    }, status=409)
 
 
 @login_required
@@ -33,7 +82,10 @@ def view_route(request, route_id):
         if point_form.is_valid():
             new_point = point_form.save(commit=False)
             new_point.route = route
-            new_point.save()
+            with transaction.atomic():
+                route.claim_version() # The HTML form doesn't carry a version
+                new_point.save()
+                editlog.record(route, [{'op': 'add', 'points': [{'id': new_point.id, 'x': new_point.x, 'y': new_point.y, 'color': new_point.color}]}])
             return redirect(f'{reverse("gallery:view_route", args=[route.id])}?panel=form&point_added_id={new_point.id}')
         else:
             form = point_form
@@ -41,6 +93,7 @@ def view_route(request, route_id):
     return render(request, 'gallery/view_route.html', {
         'route': route,
         'form': form,
+        'max_board_dimension': max_board_dimension(),
     })
 
 @login_required
@@ -50,11 +103,23 @@ def delete_point_api(request, point_id):
     try:
         point_to_delete = get_object_or_404(Point, id=point_id, route__user=request.user)
         board_id = point_to_delete.route.id
+        expected_version = _expected_version(json.loads(request.body) if request.body else {})
         color_of_deleted_point = point_to_delete.color
-        Point.objects.filter(route_id=board_id, color=color_of_deleted_point).delete()
-        return JsonResponse({"success": True, "message": f"Points with color {color_of_deleted_point} deleted."})
+        color_group = Point.objects.filter(route_id=board_id, color=color_of_deleted_point)
+        with transaction.atomic(), defer_session_resets():
+            point_to_delete.route.claim_version(expected_version)
+            deleted_points = editlog.point_dicts(color_group)
+            color_group.delete()
+            editlog.record(point_to_delete.route, [{'op': 'delete', 'points': deleted_points}])
+        return JsonResponse({"success": True, "message": f"Points with color {color_of_deleted_point} deleted.", "version": point_to_delete.route.version})
+    except StaleBoardVersion:
+        return _stale_board_response(board_id)
     except Point.DoesNotExist:
         return JsonResponse({"error": "Point not found or permission denied."}, status=404)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    except ValidationError as ve:
+        return JsonResponse({"error": ", ".join(ve.messages)}, status=400)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
@@ -75,10 +140,16 @@ def update_point(request, route_id, point_id):
         if route.points.filter(x=new_x, y=new_y).exclude(id=point_id).exists():
             return JsonResponse({"error": f"Cell ({new_x}, {new_y}) is already occupied by another point."}, status=400)
 
+        move = {'op': 'move', 'id': point.id, 'from': [point.x, point.y], 'to': [new_x, new_y]}
         point.x = new_x
         point.y = new_y
-        point.save()
-        return JsonResponse({"success": True, "id": point.id, "x": point.x, "y": point.y, "color": point.color})
+        with transaction.atomic():
+            route.claim_version(_expected_version(data))
+            point.save()
+            editlog.record(route, [move])
+        return JsonResponse({"success": True, "id": point.id, "x": point.x, "y": point.y, "color": point.color, "version": route.version})
+    except StaleBoardVersion:
+        return _stale_board_response(route.id)
     except Point.DoesNotExist:
         return JsonResponse({"error": "Point not found"}, status=404)
     except json.JSONDecodeError:
@@ -111,6 +182,7 @@ def add_points(request, route_id):
 
         created_points_response = []
         with transaction.atomic():
+            route.claim_version(_expected_version(data))
             for p_data in points_data:
                 if not (1 <= p_data["x"] <= route.cols and 1 <= p_data["y"] <= route.rows):
                     raise ValidationError(f"Point coordinates ({p_data['x']}, {p_data['y']}) are out of bounds.")
@@ -121,9 +193,12 @@ def add_points(request, route_id):
                     route=route, x=p_data["x"], y=p_data["y"], color=p_data["color"]
                 )
                 created_points_response.append({"id": point_obj.id, "x": point_obj.x, "y": point_obj.y, "color": point_obj.color})
+            editlog.record(route, [{'op': 'add', 'points': created_points_response}])
 
-        return JsonResponse({"success": True, "points": created_points_response})
+        return JsonResponse({"success": True, "points": created_points_response, "version": route.version})
 
+    except StaleBoardVersion:
+        return _stale_board_response(route.id)
     except BoardGame.DoesNotExist:
         return JsonResponse({"error": "Board not found or permission denied."}, status=404)
     except json.JSONDecodeError:
@@ -133,6 +208,81 @@ def add_points(request, route_id):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+def _validate_point_pairs(route, pairs):
+    """
+    Validates color pairs against one in-memory snapshot of the board and returns the
+    unsaved Point objects, with colors lower-cased. Raises ValidationError naming the
+    first offending pair. Call after claim_version(), in the same transaction, so no
+    other edit of the board can change it in between.
+    """
+    occupied = set()
+    used_colors = set()
+    for x, y, color in route.points.values_list('x', 'y', 'color'):
+        occupied.add((x, y))
+        used_colors.add(color.lower())
+
+    new_points = []
+    for pair_idx, pair in enumerate(pairs):
+        label = f"[Pair {pair_idx+1}]"
+        if not isinstance(pair, dict):
+            raise ValidationError(f"{label}: Each pair must be an object with color and points.")
+        color, points = pair.get('color'), pair.get('points')
+        if not (isinstance(color, str) and len(color) == 7 and color[0] == '#' and all(c in '0123456789abcdefABCDEF' for c in color[1:])):
+            raise ValidationError(f"{label}: Color must be a #rrggbb string.")
+        color = color.lower() # As <input type="color"> sends it, so #FF0000 and #ff0000 are one color
+        if color in used_colors:
+            raise ValidationError(f"{label}: Color {color} already has points on this board or earlier in the request.")
+        if not isinstance(points, list) or len(points) != 2:
+            raise ValidationError(f"{label}: A pair needs exactly two points.")
+        for p_data in points:
+            x, y = (p_data.get('x'), p_data.get('y')) if isinstance(p_data, dict) else (None, None)
+            if not (type(x) is int and type(y) is int): # Not bool, which JSON true/false would pass as
+                raise ValidationError(f"{label}: Each point must have integer x and y.")
+            if not (1 <= x <= route.cols and 1 <= y <= route.rows):
+                raise ValidationError(f"{label}: Point ({x},{y}) out of current board bounds ({route.cols}x{route.rows}).")
+            if (x, y) in occupied:
+                raise ValidationError(f"{label}: Cell ({x},{y}) is already occupied.")
+            occupied.add((x, y))
+            new_points.append(Point(route=route, x=x, y=y, color=color))
+        used_colors.add(color)
+    return new_points
+
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def add_point_pairs(request, board_id):
+    """
+    Adds any number of color pairs in one request:
+    {"pairs": [{"color": "#rrggbb", "points": [{"x", "y"}, {"x", "y"}]}, ...], "version": n}
+    """
+    route = get_object_or_404(BoardGame, id=board_id, user=request.user)
+    try:
+        data = json.loads(request.body)
+        pairs = data.get('pairs')
+        if not isinstance(pairs, list) or not pairs:
+            return JsonResponse({"error": "'pairs' must be a non-empty list."}, status=400)
+        expected_version = _expected_version(data)
+
+        with transaction.atomic(), defer_session_resets():
+            route.claim_version(expected_version)
+            new_points = _validate_point_pairs(route, pairs)
+            # bulk_create() skips Point.save() and its signals, so reset sessions and the
+            # grading snapshot once for the whole batch.
+            created = Point.objects.bulk_create(new_points)
+            request_session_reset(route.id)
+            invalidate_board_snapshot(route.id)
+            created_points = [{"id": p.id, "x": p.x, "y": p.y, "color": p.color} for p in created]
+            editlog.record(route, [{'op': 'add', 'points': created_points}])
+
+        return JsonResponse({"success": True, "points": created_points, "version": route.version})
+    except (StaleBoardVersion, IntegrityError): # IntegrityError: a cell was taken by a concurrent edit
+        return _stale_board_response(route.id)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON data"}, status=400)
+    except ValidationError as ve:
+        return JsonResponse({"error": ", ".join(ve.messages)}, status=400)
+
 @csrf_exempt
 @login_required
 @require_http_methods(["PUT"])
@@ -165,7 +315,9 @@ def save_pending_changes(request, route_id):
         changes = data.get('changes', [])
 
         results = []
-        with transaction.atomic():
+        edit_ops = []
+        with transaction.atomic(), defer_session_resets():
+            route.claim_version(_expected_version(data))
             for change_idx, change in enumerate(changes):
                 change_type = change.get('type')
 
@@ -207,6 +359,7 @@ def save_pending_changes(request, route_id):
                         )
                         added_pair_details.append({"id": point_obj.id, "x": point_obj.x, "y": point_obj.y, "color": point_obj.color})
 
+                    edit_ops.append({'op': 'add', 'points': added_pair_details})
                     results.append({"type": "add", "success": True, "points": added_pair_details})
 
                 elif change_type == 'update':
@@ -237,6 +390,7 @@ def save_pending_changes(request, route_id):
                             if not is_occupier_being_moved_or_deleted_in_batch:
                                 raise ValidationError(f"[Change {change_idx+1}]: Cell ({new_x},{new_y}) for point {point_id} is already occupied by another point ({occupying_point_id}) not being moved/deleted in this batch.")
 
+                    edit_ops.append({'op': 'move', 'id': point_id, 'from': [point_to_update.x, point_to_update.y], 'to': [new_x, new_y]})
                     point_to_update.x = new_x
                     point_to_update.y = new_y
                     point_to_update.save()
@@ -251,7 +405,9 @@ def save_pending_changes(request, route_id):
                         point_id_to_delete = int(point_id_to_delete_str)
                         point_instance_to_delete = Point.objects.get(id=point_id_to_delete, route=route)
                         color_group_to_remove = point_instance_to_delete.color
-                        deleted_count, _ = Point.objects.filter(route=route, color=color_group_to_remove).delete()
+                        color_group = Point.objects.filter(route=route, color=color_group_to_remove)
+                        edit_ops.append({'op': 'delete', 'points': editlog.point_dicts(color_group)})
+                        deleted_count, _ = color_group.delete()
                         if deleted_count > 0:
                             results.append({"type": "delete", "success": True, "color_deleted": color_group_to_remove, "ids_affected_estimate": deleted_count})
                         else:
@@ -268,6 +424,7 @@ def save_pending_changes(request, route_id):
                         raise ValidationError(f"[Change {change_idx+1}]: New name cannot be empty.")
                     if len(new_name) > 100:
                         raise ValidationError(f"[Change {change_idx+1}]: New name is too long (max 100 characters).")
+                    edit_ops.append({'op': 'rename', 'from': route.name, 'to': new_name.strip()})
                     route.name = new_name.strip()
                     route.save(update_fields=['name'])
                     results.append({"type": "update_name", "success": True, "newName": route.name})
@@ -275,21 +432,25 @@ def save_pending_changes(request, route_id):
                 elif change_type == 'update_dimensions':
                     new_cols = change.get('newCols')
                     new_rows = change.get('newRows')
-                    if not (isinstance(new_cols, int) and 1 <= new_cols <= 12):
-                        raise ValidationError(f"[Change {change_idx+1}]: Cols must be an integer between 1 and 12.")
-                    if not (isinstance(new_rows, int) and 1 <= new_rows <= 12):
-                        raise ValidationError(f"[Change {change_idx+1}]: Rows must be an integer between 1 and 12.")
-                    route.cols = new_cols
-                    route.rows = new_rows
-                    route.save(update_fields=['cols', 'rows']) 
+                    max_dimension = max_board_dimension()
+                    if not (isinstance(new_cols, int) and 1 <= new_cols <= max_dimension):
+                        raise ValidationError(f"[Change {change_idx+1}]: Cols must be an integer between 1 and {max_dimension}.")
+                    if not (isinstance(new_rows, int) and 1 <= new_rows <= max_dimension):
+                        raise ValidationError(f"[Change {change_idx+1}]: Rows must be an integer between 1 and {max_dimension}.")
+                    edit_ops.extend(editlog.resize_board(route, new_cols, new_rows))
                     results.append({"type": "update_dimensions", "success": True, "newCols": route.cols, "newRows": route.rows})
 
                 else:
                     raise ValidationError(f"[Change {change_idx+1}]: Unknown change type: {change_type}")
 
+            editlog.record(route, edit_ops)
+
         all_current_points = list(route.points.all().order_by('id').values('id', 'x', 'y', 'color'))
-        return JsonResponse({"status": "success", "results": results, "all_points": all_current_points})
+        with timing_span(request, 'serialize'):
+            return JsonResponse({"status": "success", "results": results, "all_points": all_current_points, "version": route.version})
 
+    except StaleBoardVersion:
+        return _stale_board_response(route.id)
     except BoardGame.DoesNotExist:
         return JsonResponse({"error": "Board not found or permission denied."}, status=404)
     except json.JSONDecodeError:
@@ -313,9 +474,17 @@ def update_board_name(request, board_id):
         if len(new_name) > 100:
              return JsonResponse({'status': 'error', 'message': 'Name too long (max 100 chars).'}, status=400)
 
+        rename = {'op': 'rename', 'from': board.name, 'to': new_name.strip()}
         board.name = new_name.strip()
-        board.save(update_fields=['name'])
-        return JsonResponse({'status': 'success', 'name': board.name})
+        with transaction.atomic():
+            board.claim_version(_expected_version(data))
+            board.save(update_fields=['name'])
+            editlog.record(board, [rename])
+        return JsonResponse({'status': 'success', 'name': board.name, 'version': board.version})
+    except StaleBoardVersion:
+        return _stale_board_response(board.id)
+    except ValidationError as ve:
+        return JsonResponse({'status': 'error', 'message': ", ".join(ve.messages)}, status=400)
     except BoardGame.DoesNotExist:
         return JsonResponse({"error": "Board not found or permission denied."}, status=404)
     except Exception as e:
@@ -333,14 +502,15 @@ def update_board_dimensions(request, board_id):
         new_cols = data.get('cols')
         new_rows = data.get('rows')
 
-        if not (isinstance(new_cols, int) and 1 <= new_cols <= 12):
-             return JsonResponse({'status': 'error', 'message': 'Cols must be an integer between 1 and 12.'}, status=400)
-        if not (isinstance(new_rows, int) and 1 <= new_rows <= 12):
-             return JsonResponse({'status': 'error', 'message': 'Rows must be an integer between 1 and 12.'}, status=400)
+        max_dimension = max_board_dimension()
+        if not (isinstance(new_cols, int) and 1 <= new_cols <= max_dimension):
+             return JsonResponse({'status': 'error', 'message': f'Cols must be an integer between 1 and {max_dimension}.'}, status=400)
+        if not (isinstance(new_rows, int) and 1 <= new_rows <= max_dimension):
+             return JsonResponse({'status': 'error', 'message': f'Rows must be an integer between 1 and {max_dimension}.'}, status=400)
 
-        board.cols = new_cols
-        board.rows = new_rows
-        board.save(update_fields=['cols', 'rows'])
+        with transaction.atomic(), defer_session_resets():
+            board.claim_version(_expected_version(data))
+            editlog.record(board, editlog.resize_board(board, new_cols, new_rows))
 
         remaining_points = list(board.points.all().values('id', 'x', 'y', 'color'))
 
@@ -348,8 +518,11 @@ def update_board_dimensions(request, board_id):
             'status': 'success',
             'cols': board.cols,
             'rows': board.rows,
-            'points': remaining_points
+            'points': remaining_points,
+            'version': board.version,
         })
+    except StaleBoardVersion:
+        return _stale_board_response(board.id)
     except BoardGame.DoesNotExist:
         return JsonResponse({"error": "Board not found or permission denied."}, status=404)
     except ValidationError as ve:
@@ -357,6 +530,57 @@ def update_board_dimensions(request, board_id):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+def _replay_edit_history(request, board_id, replay):
+    board = get_object_or_404(BoardGame, id=board_id, user=request.user)
+    try:
+        data = json.loads(request.body) if request.body else {}
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Expected a JSON object.'}, status=400)
+        steps = data.get('steps', 1)
+        if not (isinstance(steps, int) and not isinstance(steps, bool) and 1 <= steps <= editlog.max_entries()):
+            return JsonResponse({"error": f"'steps' must be an integer between 1 and {editlog.max_entries()}."}, status=400)
+        with transaction.atomic():
+            seqs = replay(board, steps)
+            if seqs:
+                board.claim_version(_expected_version(data))
+    except StaleBoardVersion:
+        return _stale_board_response(board.id)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    except editlog.EditConflict as conflict:
+        return JsonResponse({"error": ", ".join(conflict.messages), "conflict": True}, status=409)
+    except ValidationError as ve:
+        return JsonResponse({"error": ", ".join(ve.messages)}, status=400)
+
+    board.refresh_from_db()
+    return JsonResponse({
+        "status": "success",
+        "applied": seqs,
+        "name": board.name,
+        "cols": board.cols,
+        "rows": board.rows,
+        "version": board.version,
+        "all_points": list(board.points.all().order_by('id').values('id', 'x', 'y', 'color')),
+        **editlog.history_state(board),
+    })
+
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def undo_board_edit(request, board_id):
+    """Reverts the board's latest saved edits (optional JSON body {"steps": n})."""
+    return _replay_edit_history(request, board_id, editlog.undo)
+
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def redo_board_edit(request, board_id):
+    """Re-applies the board's most recently undone edits (optional JSON body {"steps": n})."""
+    return _replay_edit_history(request, board_id, editlog.redo)
+
+
 @csrf_exempt
 @login_required
 @require_http_methods(["DELETE"])
@@ -375,6 +599,38 @@ def delete_board_api(request, board_id):
         return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
+def _payload_cache_timeout(name, default):
+    return getattr(settings, 'PAYLOAD_CACHE', {}).get(name, default)
+
+def _preview_url(board):
+    if not board.preview_fingerprint:
+        return None  # Not rendered yet; the render_board_preview job is queued
+    return reverse('gallery:board_preview', args=[board.id, board.preview_fingerprint])
+
+@login_required
+@require_http_methods(["GET"])
+def board_preview(request, board_id, fingerprint):
+    """
+    Serves a board preview image. URLs carry the preview's fingerprint, so a response
+    never changes and may be cached forever; an outdated fingerprint redirects to the
+    current preview. Rendering is left to the render_board_preview job: previews that
+    aren't rendered (yet) are a 404.
+    """
+    from . import previews  # Loads Pillow; most workers never serve a preview
+    board = get_object_or_404(BoardGame, id=board_id)
+    if fingerprint != board.preview_fingerprint:
+        if not board.preview_fingerprint:
+            raise Http404("This board's preview has not been rendered yet.")
+        return redirect('gallery:board_preview', board_id=board.id, fingerprint=board.preview_fingerprint)
+    try:
+        image = open(previews.preview_path(board.id, fingerprint), 'rb')
+    except OSError:
+        schedule_preview_render(board.id)  # Rendered files were removed from disk
+        raise Http404("This board's preview is being rendered.")
+    response = FileResponse(image, content_type=previews.content_type())
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
 @login_required
 @require_http_methods(["GET"])
 def api_my_boards(request):
@@ -387,6 +643,7 @@ def api_my_boards(request):
             'user_id': board.user.id,
             'creator_username': board.user.username,
             'background_image_url': board.background.image.url if board.background and board.background.image else None,
+            'preview_url': _preview_url(board),
             'rows': board.rows,
             'cols': board.cols,
             'view_url': reverse('gallery:view_route', args=[board.id]),
@@ -394,10 +651,51 @@ def api_my_boards(request):
         })
     return JsonResponse(boards_data, safe=False)
 
+@read_from_replica
 @login_required
 @require_http_methods(["GET"])
 def api_playable_boards(request):
-    boards = BoardGame.objects.all().select_related('background', 'user').order_by('-id')
+    """
+    Lists playable boards, newest first. ?order=difficulty|-difficulty sorts by the
+    stored solver rating (unrated boards last); ?min_difficulty= and ?max_difficulty=
+    filter on it. Cached until a board changes (BOARD_LISTING generation) or for
+    PAYLOAD_CACHE['LISTING_SECONDS'].
+    """
+    boards = BoardGame.objects.all().select_related('background', 'user')
+    try:
+        if request.GET.get('min_difficulty'):
+            boards = boards.filter(difficulty__gte=float(request.GET['min_difficulty']))
+        if request.GET.get('max_difficulty'):
+            boards = boards.filter(difficulty__lte=float(request.GET['max_difficulty']))
+    except ValueError:
+        return JsonResponse({'error': 'min_difficulty and max_difficulty must be numbers.'}, status=400)
+
+    order = request.GET.get('order')
+    if order not in (None, '', 'difficulty', '-difficulty'):
+        return JsonResponse({'error': "order must be 'difficulty' or '-difficulty'."}, status=400)
+    params = sorted((name, request.GET[name]) for name in ('order', 'min_difficulty', 'max_difficulty') if request.GET.get(name))
+    cache_key = f'gallery:playable-boards:{cache_generation(BOARD_LISTING)}:{urlencode(params)}'
+    boards_data = get_or_compute(cache_key, lambda: _playable_boards_data(boards, order), _payload_cache_timeout('LISTING_SECONDS', 60))
+    return JsonResponse(boards_data, safe=False)
+
+@read_from_replica
+@login_required
+@require_http_methods(["GET"])
+def daily_puzzle_api(request):
+    """Today's puzzle of the day and its leaderboard (see gallery.daily); 404 if none is scheduled."""
+    today = timezone.localdate()
+    entry = daily.daily_entry(today)
+    if entry is None:
+        return JsonResponse({'error': 'No puzzle is scheduled for today.', 'date': today.isoformat()}, status=404)
+    return JsonResponse({'puzzle': entry, 'leaderboard': daily.board_leaderboard(entry['board_id'])})
+
+def _playable_boards_data(boards, order):
+    if order == 'difficulty':
+        boards = boards.order_by(F('difficulty').asc(nulls_last=True), '-id')
+    elif order == '-difficulty':
+        boards = boards.order_by(F('difficulty').desc(nulls_last=True), '-id')
+    else:
+        boards = boards.order_by('-id')
     boards_data = []
     for board in boards:
         boards_data.append({
@@ -406,12 +704,56 @@ def api_playable_boards(request):
             'user_id': board.user.id,
             'creator_username': board.user.username,
             'background_image_url': board.background.image.url if board.background and board.background.image else None,
+            'preview_url': _preview_url(board),
             'rows': board.rows,
             'cols': board.cols,
+            'difficulty': board.difficulty,
             'view_url': reverse('gallery:play_game', args=[board.id]),
         })
-    return JsonResponse(boards_data, safe=False)
+    return boards_data
+
+@read_from_replica
+@login_required
+@require_http_methods(["GET"])
+def api_search_boards(request):
+    """
+    Searches playable boards: ?q=<words>&rows=&cols=&color_count=&creator=<user id>&page=&page_size=
+    Returns one page of boards plus facet counts for rows, cols, color_count and creator.
+    """
+    filters = {}
+    try:
+        for facet in search.FACETS:
+            if request.GET.get(facet):
+                filters[facet] = int(request.GET[facet])
+        page = max(int(request.GET.get('page', 1)), 1)
+        page_size = min(max(int(request.GET.get('page_size', 20)), 1), 100)
+    except ValueError:
+        return JsonResponse({'error': 'Facet filters, page and page_size must be integers.'}, status=400)
+
+    query = request.GET.get('q', '')
+    total, boards, facets = search.search_boards(query, filters, page, page_size)
+    return JsonResponse({
+        'query': query,
+        'page': page,
+        'page_size': page_size,
+        'total': total,
+        'results': [{
+            'id': board.id,
+            'name': board.name,
+            'user_id': board.user.id,
+            'creator_username': board.user.username,
+            'background_image_url': board.background.image.url if board.background and board.background.image else None,
+            'preview_url': _preview_url(board),
+            'rows': board.rows,
+            'cols': board.cols,
+            'color_count': board.color_count,
+            'difficulty': board.difficulty,
+            'view_url': reverse('gallery:play_game', args=[board.id]),
+        } for board in boards],
+        'facets': facets,
+    })
 
+@read_from_replica
 @login_required
 @require_http_methods(["GET"])
 def api_background_images(request):
@@ -440,10 +782,11 @@ def api_create_board(request):
             return JsonResponse({'error': 'Board name cannot be empty.'}, status=400)
         if len(name) > 100:
             return JsonResponse({'error': 'Board name is too long (max 100 characters).'}, status=400)
-        if not (1 <= rows <= 12):
-            return JsonResponse({'error': 'Rows must be an integer between 1 and 12.'}, status=400)
-        if not (1 <= cols <= 12):
-            return JsonResponse({'error': 'Cols must be an integer between 1 and 12.'}, status=400)
+        max_dimension = max_board_dimension()
+        if not (1 <= rows <= max_dimension):
+            return JsonResponse({'error': f'Rows must be an integer between 1 and {max_dimension}.'}, status=400)
+        if not (1 <= cols <= max_dimension):
+            return JsonResponse({'error': f'Cols must be an integer between 1 and {max_dimension}.'}, status=400)
         if not background_id:
             return JsonResponse({'error': 'Background image is required.'}, status=400)
 
@@ -464,6 +807,7 @@ def api_create_board(request):
             'user_id': board.user.id,
             'creator_username': board.user.username,
             'background_image_url': board.background.image.url if board.background and board.background.image else None,
+            'preview_url': _preview_url(board),
             'rows': board.rows,
             'cols': board.cols,
             'view_url': reverse('gallery:view_route', args=[board.id]),
@@ -482,13 +826,73 @@ def api_create_board(request):
         return JsonResponse({'error': f'An unexpected error occurred: {str(e)}'}, status=500)
 
 
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def fork_board_api(request, board_id):
+    """
+    Copies a board and all of its points to a new board owned by the requester.
+    Optional JSON body: {"name", "transform" (one of transforms.TRANSFORMS), "cols", "rows"}.
+    Costs a constant number of queries: one read of the points and one bulk_create.
+    """
+    source = get_object_or_404(BoardGame.objects.select_related('background'), id=board_id)
+    try:
+        data = json.loads(request.body) if request.body else {}
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Expected a JSON object.'}, status=400)
+        name = data.get('name') or f"{source.name} (copy)"[:100]
+        if not isinstance(name, str):
+            return JsonResponse({'error': 'Board name must be a string.'}, status=400)
+        name = name.strip()
+        transform = data.get('transform')
+        if not name:
+            return JsonResponse({'error': 'Board name cannot be empty.'}, status=400)
+        if len(name) > 100:
+            return JsonResponse({'error': 'Board name is too long (max 100 characters).'}, status=400)
+        if transform is not None and transform not in transforms.TRANSFORMS:
+            return JsonResponse({'error': f"Unknown transform; expected one of {', '.join(transforms.TRANSFORMS)}."}, status=400)
+
+        new_size = None
+        if data.get('cols') is not None or data.get('rows') is not None:
+            default_cols, default_rows = transforms.transformed_size(source.cols, source.rows, transform)
+            new_size = (data.get('cols', default_cols), data.get('rows', default_rows))
+            max_dimension = max_board_dimension()
+            if not all(type(n) is int and 1 <= n <= max_dimension for n in new_size):
+                return JsonResponse({'error': f'Cols and rows must be integers between 1 and {max_dimension}.'}, status=400)
+
+        points, cols, rows = transforms.transform_points(
+            source.points.order_by().values_list('x', 'y', 'color'), source.cols, source.rows, transform, new_size,
+        )
+        with transaction.atomic():
+            board = BoardGame.objects.create(
+                user=request.user, background=source.background, name=name, cols=cols, rows=rows,
+                auto_save_enabled=False, color_count=len({color for x, y, color in points}),
+            )
+            Point.objects.bulk_create(Point(route=board, x=x, y=y, color=color) for x, y, color in points)
+            schedule_difficulty_rating(board.id) # bulk_create() bypasses the Point signals
+
+        return JsonResponse({
+            'id': board.id,
+            'name': board.name,
+            'user_id': request.user.id,
+            'creator_username': request.user.username,
+            'background_image_url': board.background.image.url if board.background and board.background.image else None,
+            'preview_url': _preview_url(board),
+            'rows': board.rows,
+            'cols': board.cols,
+            'points_copied': len(points),
+            'forked_from': source.id,
+            'view_url': reverse('gallery:view_route', args=[board.id]),
+            'delete_url': reverse('gallery:delete_board_api', args=[board.id])
+        }, status=201)
+
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data.'}, status=400)
+    except ValidationError as ve:
+        return JsonResponse({"error": ", ".join(ve.messages)}, status=400)
+
+
 # Game views
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-from rest_framework import status
-from .models import GamePlaySession, Path # Point, BoardGame already imported
-from .serializers import GamePlaySessionSerializer, PathSerializer, PointSerializer # BoardSerializer not used here directly
 
 @login_required
 def play_game_view(request, board_id):
@@ -503,40 +907,61 @@ def play_game_view(request, board_id):
         'csrf_token': request.META.get('CSRF_COOKIE') # Or use django.middleware.csrf.get_token(request)
     })
 
+@read_from_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(game_api_renderers())
 def get_board_data_api(request, board_id):
+    # Invalidated by every board/point change (see invalidate_board_snapshot).
+    data_for_frontend = get_or_compute(
+        board_data_cache_key(board_id), lambda: build_board_data(board_id), _payload_cache_timeout('BOARD_DATA_SECONDS', 300)
+    )
+    return Response(data_for_frontend)
+
+def build_board_data(board_id):
+    """The get_board_data_api payload of a board; raises Http404 if it doesn't exist."""
     board = get_object_or_404(BoardGame, pk=board_id)
     points_data = PointSerializer(board.points.all(), many=True).data
     frontend_points = [{
         "id": p_data["id"], "x": p_data["x"], "y": p_data["y"], "color": p_data["color"]
     } for p_data in points_data]
-
-    data_for_frontend = {
-        'route': {
-            'id': board.id, 'name': board.name, 'rows': board.rows, 'cols': board.cols,
-            'auto_save_enabled': board.auto_save_enabled
-        },
+    return {
+        'route': _board_route_data(board),
         'points': frontend_points
     }
-    return Response(data_for_frontend)
 
+@read_from_replica
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(game_api_renderers())
 def get_or_create_game_session(request, board_id):
+    """
+    Returns the player's session on the board. Doesn't write: a player who hasn't saved
+    on this board yet gets an empty, unsaved session (id null), and save_all_paths_api
+    creates the row on their first save.
+    """
     board_game = get_object_or_404(BoardGame, pk=board_id)
-    session, created = GamePlaySession.objects.get_or_create(
-        player=request.user,
-        board_game=board_game
-    )
+    session = GamePlaySession.objects.filter(player=request.user, board_game=board_game).first()
+    if session is None:
+        session = GamePlaySession(player=request.user, board_game=board_game)
     serializer = GamePlaySessionSerializer(session, context={'request': request})
     return Response(serializer.data)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(game_api_renderers())
+@parser_classes(game_api_parsers())
 @transaction.atomic
-def save_all_paths_api(request, session_id):
-    session = get_object_or_404(GamePlaySession, pk=session_id)
+def save_all_paths_api(request, session_id=None, board_id=None):
+    """
+    Replaces the session's paths. Reached by session id, or by board id for a player
+    whose session doesn't exist yet; that first save creates it.
+    """
+    if board_id is not None:
+        board_game = get_object_or_404(BoardGame, pk=board_id)
+        session, _ = GamePlaySession.objects.get_or_create(player=request.user, board_game=board_game)
+    else:
+        session = get_object_or_404(GamePlaySession, pk=session_id)
     if session.player != request.user:
         return Response({'error': 'You do not own this game session.'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -569,36 +994,122 @@ def save_all_paths_api(request, session_id):
 
     # Server-side validation of "solved" state based on saved paths
     board = session.board_game
-    is_currently_solved = False
-
-    # 1. All required colors have paths
-    required_colors = set(Point.objects.filter(route=board).values_list('color', flat=True).distinct())
-    drawn_colors = set(p.color for p in saved_path_instances_for_check)
-
-    if required_colors == drawn_colors:
-        # 2. No paths overlap (implicitly handled by unique cell check below if all cells are covered)
-        # 3. All cells on the grid are covered by paths
-        all_path_coords_flat = []
-        valid_paths_for_solve_check = True
-        for p_instance in saved_path_instances_for_check:
-            # Path.clean() already validated endpoints and contiguity.
-            # Path.clean() also validates path coordinates are within board bounds.
-            # Path.clean() also validates self-intersection for each path.
-            for coord in p_instance.path_data: # path_data is a list of dicts {'x': val, 'y': val}
-                all_path_coords_flat.append((coord['x'], coord['y']))
-        
-        if valid_paths_for_solve_check:
-            # Check for overlaps between different paths and if all cells are covered
-            if len(all_path_coords_flat) == len(set(all_path_coords_flat)): # No overlaps between paths
-                total_grid_cells = board.rows * board.cols
-                if len(set(all_path_coords_flat)) == total_grid_cells: # All cells covered
-                    is_currently_solved = True
-    
+    required_colors = Point.objects.filter(route=board).values_list('color', flat=True).distinct()
+    SOLVER_CALLS.inc()
+    is_currently_solved = check_solution(
+        board.rows, board.cols, required_colors,
+        ((p.color, p.path_data) for p in saved_path_instances_for_check),
+    )
+
+    # Live move validation continues from exactly what was saved.
+    saved_paths = [(p.color, p.path_data) for p in saved_path_instances_for_check]
+    transaction.on_commit(lambda: occupancy.replace_state(
+        board.id, session.player_id, occupancy.build_state(occupancy.cached_board_snapshot(board.id), saved_paths),
+    ))
+
+    was_solved = session.is_solved
     session.is_solved = is_currently_solved
-    session.save(update_fields=['last_updated', 'is_solved']) # last_updated is auto_now, is_solved updated here.
+    update_fields = ['last_updated', 'is_solved'] # last_updated is auto_now, is_solved updated here.
+    if is_currently_solved != was_solved:
+        session.solved_at = timezone.now() if is_currently_solved else None
+        update_fields.append('solved_at')
+        daily.invalidate_leaderboard(board.id)
+    session.save(update_fields=update_fields)
+
+    PATHS_SAVED.inc(len(saved_path_instances_for_check))
+    if is_currently_solved and not was_solved:
+        SESSIONS_SOLVED.inc()
 
     return Response({
         'message': 'Paths saved successfully.',
+        'session_id': session.id,
         'paths_count': len(saved_path_instances_for_check),
         'is_solved': is_currently_solved # Return server's calculation
-    }, status=status.HTTP_200_OK)
\ No newline at end of file
+    }, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def grade_solutions_api(request, board_id):
+    """
+    Read-only batch grading: validates many candidate path sets against one cached
+    snapshot of the board without touching Path or GamePlaySession rows.
+    """
+    board = get_object_or_404(BoardGame, pk=board_id)
+    candidates = request.data.get('candidates') if isinstance(request.data, dict) else None
+    if not isinstance(candidates, list):
+        return Response({'error': "Invalid data format. Expected 'candidates': a list of path lists."}, status=status.HTTP_400_BAD_REQUEST)
+    max_candidates = getattr(settings, 'GALLERY_GRADE_MAX_CANDIDATES', 5000)
+    if len(candidates) > max_candidates:
+        return Response({'error': f"Too many candidates (max {max_candidates} per request)."}, status=status.HTTP_400_BAD_REQUEST)
+
+    snapshot = get_board_snapshot(board)
+    SOLVER_CALLS.inc(len(candidates))
+    results = grade_candidates(snapshot, candidates)
+    return Response({
+        'board_id': board.id,
+        'results': results,
+        'solved_count': sum(1 for r in results if r['verdict'] == 'solved'),
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def validate_move_api(request, board_id):
+    """
+    Checks one move of the player's in-progress board, {"op", "color", "x", "y"} with the
+    ops of the move log, against a cached occupancy bitmap and records it if valid.
+    Answers {"valid": true, "complete", "solved"} or {"valid": false, "reason", "detail"};
+    a rejected move leaves the state unchanged.
+    """
+    data = request.data if isinstance(request.data, dict) else {}
+    op, color, x, y = data.get('op'), data.get('color'), data.get('x'), data.get('y')
+    if op not in occupancy.OPS or not isinstance(color, str):
+        return Response({'error': f"Expected an op ({', '.join(occupancy.OPS)}) and a color."}, status=status.HTTP_400_BAD_REQUEST)
+    if op in (occupancy.START, occupancy.STEP) and not (type(x) is int and type(y) is int):
+        return Response({'error': 'x and y must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        state, snapshot = occupancy.apply_move(board_id, request.user.id, op, color, x, y)
+    except BoardGame.DoesNotExist:
+        return Response({'error': 'Board not found.'}, status=status.HTTP_404_NOT_FOUND)
+    except occupancy.MoveRejected as rejected:
+        return Response({'valid': False, 'reason': rejected.reason, 'detail': rejected.detail})
+    return Response({
+        'valid': True,
+        'complete': state.is_complete(snapshot, color),
+        'solved': state.is_solved(snapshot),
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def append_moves_api(request, session_id):
+    session = get_object_or_404(GamePlaySession.objects.select_related('board_game'), pk=session_id)
+    if session.player_id != request.user.id:
+        return Response({'error': 'You do not own this game session.'}, status=status.HTTP_403_FORBIDDEN)
+    moves = request.data.get('moves') if isinstance(request.data, dict) else None
+    try:
+        seq = movelog.append_moves(session, moves)
+    except ValidationError as ve:
+        return Response({'error': ", ".join(ve.messages)}, status=status.HTTP_400_BAD_REQUEST)
+    except IntegrityError: # Lost a race for the seq where the database doesn't lock the session row
+        return Response({'error': 'Another append to this session is in progress; retry.'}, status=status.HTTP_409_CONFLICT)
+    return Response({'seq': seq, 'appended': len(moves)}, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def replay_moves_api(request, session_id):
+    """
+    Streams the session's move log as NDJSON, one line per stored chunk:
+    {"seq": N, "moves": [{"op", "color", "x", "y", "t"}, ...]}. Resume with ?after_seq=N.
+    """
+    session = get_object_or_404(GamePlaySession, pk=session_id)
+    if session.player_id != request.user.id:
+        return Response({'error': 'You do not own this game session.'}, status=status.HTTP_403_FORBIDDEN)
+    try:
+        after_seq = int(request.GET.get('after_seq', 0))
+    except ValueError:
+        return Response({'error': 'after_seq must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    lines = (
+        json.dumps({'seq': seq, 'moves': moves}, separators=(',', ':')) + '\n'
+        for seq, moves in movelog.iter_replay(session, after_seq=after_seq)
+    )
+    return StreamingHttpResponse(lines, content_type='application/x-ndjson')
@@ -0,0 +1,130 @@
+"""
+Stampede-safe get-or-compute caching for hot payloads.
+
+get_or_compute() stores each value with the time it took to compute. It keeps the
+value STALE_GRACE seconds past its logical expiry, so that:
+- Before expiry, requests recompute early with a probability that grows as expiry
+  nears and with the compute cost ("XFetch"). Hot keys are usually refreshed before
+  they expire at all.
+- Only the request holding the key's lock recomputes. The lock is a cache.add(), so
+  it is shared by all processes that share the cache backend (see CACHES in
+  settings). Everyone else keeps getting the cached, possibly stale, value.
+- On a cold miss, requests without the lock wait briefly for the winner's result
+  instead of all hitting the database.
+
+Generations give cheap invalidation of many keys at once: include
+cache_generation(name) in the keys and call bump_generation(name) when the
+underlying data changes. refresh() recomputes a key unconditionally, to warm it ahead
+of expected traffic. cache_lock() takes a key's lock for read-modify-write updates.
+"""
+import math
+import random
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _config(name, default):
+    return getattr(settings, 'PAYLOAD_CACHE', {}).get(name, default)
+
+
+def cache_generation(name):
+    return cache.get_or_set(f'generation:{name}', time.time_ns, None)
+
+
+def bump_generation(name):
+    cache.set(f'generation:{name}', time.time_ns(), None)
+
+
+def _acquire(lock_key):
+    token = uuid.uuid4().hex
+    return token if cache.add(lock_key, token, _config('LOCK_TIMEOUT', 30)) else None
+
+
+def _release(lock_key, token):
+    # Not atomic, but only deletes a lock that expired and was re-taken in between.
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _compute_and_store(key, compute, timeout):
+    start = time.perf_counter()
+    value = compute()
+    delta = time.perf_counter() - start
+    cache.set(key, (value, delta, time.time() + timeout), timeout + _config('STALE_GRACE', 60))
+    return value
+
+
+def get_or_compute(key, compute, timeout, beta=1.0):
+    """
+    Returns the cached value of `key`, calling `compute()` at most once at a time per
+    key (across processes sharing the cache) when it is missing or due for refresh.
+    `beta` > 1 favours earlier refreshes.
+    """
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        # XFetch: -log(rand) is exponentially distributed, so recomputing "early" gets
+        # likelier as expiry approaches and the more expensive the value is.
+        if time.time() - delta * beta * math.log(random.random() or 1e-12) < expires_at:
+            return value
+        token = _acquire(lock_key)
+        if token is None:
+            return value  # Someone else is refreshing it
+        try:
+            return _compute_and_store(key, compute, timeout)
+        finally:
+            _release(lock_key, token)
+
+    deadline = time.monotonic() + _config('WAIT_TIMEOUT', 5)
+    while True:
+        token = _acquire(lock_key)
+        if token is not None:
+            try:
+                entry = cache.get(key)  # Filled while we were waiting for the lock
+                if entry is not None:
+                    return entry[0]
+                return _compute_and_store(key, compute, timeout)
+            finally:
+                _release(lock_key, token)
+        time.sleep(_config('WAIT_INTERVAL', 0.05))
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if time.monotonic() > deadline:
+            # The lock holder is stuck or gone; don't make this request wait any longer.
+            return _compute_and_store(key, compute, timeout)
+
+
+def refresh(key, compute, timeout):
+    """Recomputes and stores `key` now (holding its lock if it is free) and returns the value."""
+    lock_key = f'{key}:lock'
+    token = _acquire(lock_key)
+    try:
+        return _compute_and_store(key, compute, timeout)
+    finally:
+        if token is not None:
+            _release(lock_key, token)
+
+
+@contextmanager
+def cache_lock(key, wait=0, interval=None):
+    """
+    Holds the lock of `key` (the one get_or_compute() takes) for the block. Yields True,
+    or False if another holder kept it for `wait` seconds.
+    """
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + wait
+    token = _acquire(lock_key)
+    while token is None and time.monotonic() < deadline:
+        time.sleep(interval or _config('WAIT_INTERVAL', 0.05))
+        token = _acquire(lock_key)
+    try:
+        yield token is not None
+    finally:
+        if token is not None:
+            _release(lock_key, token)
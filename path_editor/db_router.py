@@ -0,0 +1,79 @@
+"""
+Read/write splitting between the primary database and a read-only replica alias.
+
+Queries go to the primary unless a view opted in with @read_from_replica. Inside such
+a view, reads use the replica until the request writes anything or opens a
+transaction on the primary. From then on the request is pinned to the primary, so it
+always reads its own writes. Without a 'replica' alias in DATABASES, everything
+stays on 'default'.
+
+On SQLite the replica is a second, read-only (mode=ro) connection to the same WAL
+database file. Readers then never wait on the writer's lock and can't take it
+themselves.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# None outside replica-enabled views, otherwise whether the request is still allowed to read from the replica.
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def read_from_replica(view):
+    """Lets a view's safe (GET/HEAD/OPTIONS) requests read from the replica."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or not replica_configured():
+            return view(request, *args, **kwargs)
+        token = _replica_reads.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+def pin_to_primary():
+    """Sends the rest of the current request's reads to the primary."""
+    if _replica_reads.get():
+        _replica_reads.set(False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and not connections[PRIMARY].in_atomic_block:
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+@receiver(connection_created)
+def enable_sqlite_wal(sender, connection, **kwargs):
+    # WAL lets the replica connection read while the primary writes. The mode is stored
+    # in the database file, so setting it on the primary covers both connections.
+    if connection.vendor == 'sqlite' and connection.alias == PRIMARY and replica_configured():
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
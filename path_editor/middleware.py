@@ -0,0 +1,433 @@
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers, set_response_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+REQUEST_PROFILING_DEFAULTS = {
+    'ENABLED': False,
+    'SERVER_TIMING': True,
+    'PROFILE_SAMPLE_RATE': 0.0,   # Fraction of requests (0.0 - 1.0) that get a cProfile dump
+    'PROFILE_SLOW_MS': None,      # Dump the profile of any request slower than this (profiles every request!)
+    'PROFILE_DIR': None,
+}
+
+
+def get_profiling_settings():
+    config = dict(REQUEST_PROFILING_DEFAULTS)
+    config.update(getattr(settings, 'REQUEST_PROFILING', {}))
+    return config
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting queries and the time spent in them.
+    Installed on every connection for the duration of a request.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+    @contextmanager
+    def installed(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+class RequestTimings:
+    def __init__(self):
+        self.spans = {}
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timing_span(request, name):
+    """
+    Adds the wall time of the block to the request's Server-Timing metric `name`.
+    A no-op when the profiling middleware is not active for this request.
+    """
+    timings = getattr(request, '_request_timings', None)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(name, time.perf_counter() - start)
+
+
+_profiler_lock = threading.Lock()
+
+
+class RequestProfilingMiddleware:
+    """
+    Records DB query count/time, serialization time and total time per request and
+    reports them in a Server-Timing header. Optionally writes a cProfile dump of a
+    sampled fraction of requests, or of every request slower than PROFILE_SLOW_MS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_profiling_settings()
+        self.enabled = config['ENABLED']
+        self.server_timing = config['SERVER_TIMING']
+        self.sample_rate = float(config['PROFILE_SAMPLE_RATE'] or 0.0)
+        self.slow_ms = config['PROFILE_SLOW_MS']
+        self.profile_dir = config['PROFILE_DIR'] or os.path.join(settings.BASE_DIR, 'profiles')
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        request._request_timings = timings
+        query_stats = QueryStats()
+
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        profiler = self._start_profiler() if (sampled or self.slow_ms is not None) else None
+
+        start = time.perf_counter()
+        try:
+            with query_stats.installed():
+                response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiler_lock.release()
+        total = time.perf_counter() - start
+
+        if profiler is not None:
+            is_slow = self.slow_ms is not None and total * 1000 >= self.slow_ms
+            if sampled or is_slow:
+                self._dump_profile(profiler, request, total)
+
+        if self.server_timing:
+            response['Server-Timing'] = self._format_server_timing(timings, query_stats, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook; time the rendering as serialization.
+        timings = getattr(request, '_request_timings', None)
+        if timings is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timings.add('serialize', time.perf_counter() - start)
+            )
+        return response
+
+    def _start_profiler(self):
+        # The interpreter supports a single active profiler, so concurrent requests
+        # in other threads simply run unprofiled.
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiling tool is already active
+            _profiler_lock.release()
+            return None
+        return profiler
+
+    def _dump_profile(self, profiler, request, total):
+        match = getattr(request, 'resolver_match', None)
+        label = match.view_name if match and match.view_name else request.path
+        label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'root'
+        filename = f"{int(time.time() * 1000)}-{request.method}-{label}-{total * 1000:.0f}ms.prof"
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, filename))
+        except OSError:
+            pass  # Profiling must never break the request
+
+    @staticmethod
+    def _format_server_timing(timings, query_stats, total):
+        metrics = [f'db;dur={query_stats.duration * 1000:.2f};desc="{query_stats.count} queries"']
+        for name, seconds in timings.spans.items():
+            metrics.append(f'{name};dur={seconds * 1000:.2f}')
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+class MetricsMiddleware:
+    """
+    Feeds per-view latency, error and DB query metrics into the in-process registry
+    exposed at /metrics/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from .metrics import REQUEST_DB_QUERIES, REQUEST_ERRORS, REQUEST_LATENCY
+
+        query_stats = QueryStats()
+        start = time.perf_counter()
+        with query_stats.installed():
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else '<unresolved>'
+        REQUEST_LATENCY.observe(elapsed, view=view, method=request.method)
+        if query_stats.count:
+            REQUEST_DB_QUERIES.inc(query_stats.count, view=view)
+        if response.status_code >= 400:
+            REQUEST_ERRORS.inc(view=view, status_class=f'{response.status_code // 100}xx')
+        return response
+
+
+COMPRESSION_DEFAULTS = {
+    'ENABLED': True,
+    'MIN_SIZE': 512,              # Smaller bodies aren't worth the CPU and headers
+    # API payloads only. HTML pages carry CSRF tokens and per-user content next to
+    # reflected input, so compressing them would expose those secrets to BREACH.
+    'CONTENT_TYPES': [
+        'application/json', 'application/x-ndjson',
+        'application/vnd.oai.openapi', 'application/vnd.oai.openapi+json',
+    ],
+    'ENCODINGS': ['br', 'zstd', 'gzip'],  # Server preference; missing libraries are skipped
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+    'ZSTD_LEVEL': 3,
+    'CACHE_SIZE': 64,             # Compressed bodies kept, keyed by ETag and encoding
+    'CACHE_MAX_BODY': 1024 * 1024,
+}
+
+
+def get_compression_settings():
+    config = dict(COMPRESSION_DEFAULTS)
+    config.update(getattr(settings, 'RESPONSE_COMPRESSION', {}))
+    return config
+
+
+class _Gzip:
+    def __init__(self, config):
+        self.level = config['GZIP_LEVEL']
+
+    def compress(self, data):
+        compressor = self.stream()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    @staticmethod
+    def chunk(compressor, data):
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    @staticmethod
+    def finish(compressor):
+        return compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, config):
+        self.quality = config['BROTLI_QUALITY']
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self):
+        return brotli.Compressor(quality=self.quality)
+
+    @staticmethod
+    def chunk(compressor, data):
+        return compressor.process(data) + compressor.flush()
+
+    @staticmethod
+    def finish(compressor):
+        return compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, config):
+        self.level = config['ZSTD_LEVEL']
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self):
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    @staticmethod
+    def chunk(compressor, data):
+        return compressor.compress(data) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    @staticmethod
+    def finish(compressor):
+        return compressor.flush()
+
+
+def available_encoders(config):
+    codecs = {'gzip': _Gzip}
+    if brotli is not None:
+        codecs['br'] = _Brotli
+    if zstandard is not None:
+        codecs['zstd'] = _Zstd
+    return {name: codecs[name](config) for name in config['ENCODINGS'] if name in codecs}
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q > 0) from an Accept-Encoding header."""
+    accepted = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies, so identical responses are compressed once."""
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies of allowlisted content types with the best encoding the
+    client accepts: brotli or zstd when their libraries are installed, otherwise gzip.
+    Streaming responses are compressed chunk by chunk and flushed after every chunk, so
+    they keep streaming.
+
+    GET responses get an ETag (a hash of the body) if they have none, and compressed
+    bodies are cached per ETag and encoding: repeated identical responses, such as a
+    board listing served to many players, are compressed once.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_compression_settings()
+        self.enabled = config['ENABLED']
+        self.min_size = config['MIN_SIZE']
+        self.content_types = set(config['CONTENT_TYPES'])
+        self.encoders = available_encoders(config)
+        self.cache_max_body = config['CACHE_MAX_BODY']
+        self.cache = CompressedBodyCache(config['CACHE_SIZE']) if config['CACHE_SIZE'] else None
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.enabled or not self._compressible(response):
+            return response
+
+        # Whatever gets chosen below depends on the request's Accept-Encoding.
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        encoding = next((name for name in self.encoders if name in accepted), None)
+        if encoding is None:
+            return response
+        encoder = self.encoders[encoding]
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._compress_async_stream(encoder, response.streaming_content)
+            else:
+                response.streaming_content = self._compress_stream(encoder, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = self._compress_body(request, response, encoder, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        if response.has_header('ETag'):
+            # The compressed body is a different representation than the uncompressed one.
+            response.headers['ETag'] = re.sub(r'^"', 'W/"', response.headers['ETag'])
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compressible(self, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 304):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        return content_type in self.content_types
+
+    def _compress_body(self, request, response, encoder, encoding):
+        if self.cache is None or request.method not in ('GET', 'HEAD') or response.status_code != 200:
+            return encoder.compress(response.content)
+        if not response.has_header('ETag'):
+            set_response_etag(response)
+        key = (request.path, response.headers['ETag'], encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = encoder.compress(response.content)
+            if len(compressed) <= self.cache_max_body:
+                self.cache.set(key, compressed)
+        return compressed
+
+    @staticmethod
+    def _compress_stream(encoder, chunks):
+        compressor = encoder.stream()
+        for chunk in chunks:
+            data = encoder.chunk(compressor, chunk)
+            if data:
+                yield data
+        yield encoder.finish(compressor)
+
+    @staticmethod
+    async def _compress_async_stream(encoder, chunks):
+        compressor = encoder.stream()
+        async for chunk in chunks:
+            data = encoder.chunk(compressor, chunk)
+            if data:
+                yield data
+        yield encoder.finish(compressor)
@@ -0,0 +1,164 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer. Instead of doing that
+on each /api/schema/ request like SpectacularAPIView, build() renders it once as
+YAML and JSON into OPENAPI_SCHEMA['DIR'] under content-hashed names
+(openapi.<hash>.yaml/.json), next to a manifest.json recording the fingerprint of
+the URL configuration it was built from. schema_view serves the files from memory.
+
+The build_openapi_schema command builds it at deploy time. If the URLconf changed
+since (its fingerprint no longer matches the manifest), the first request rebuilds
+it. Changes to serializers that don't touch the URLconf need the command.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import URLResolver, get_resolver
+from django.views.decorators.http import require_http_methods
+
+MANIFEST = 'manifest.json'
+FORMATS = {
+    'yaml': 'application/vnd.oai.openapi; charset=utf-8',
+    'json': 'application/vnd.oai.openapi+json; charset=utf-8',
+}
+
+_lock = threading.Lock()
+# The resolver the loaded schema belongs to, the manifest and the rendered bodies by format.
+_loaded = {'resolver': None, 'manifest': None, 'bodies': None}
+
+
+def schema_dir():
+    return getattr(settings, 'OPENAPI_SCHEMA', {}).get('DIR', os.path.join(settings.BASE_DIR, 'static', 'schema'))
+
+
+def _pattern_lines(patterns, prefix=''):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield f"{route} include {pattern.namespace}"
+            yield from _pattern_lines(pattern.url_patterns, route)
+        else:
+            yield f"{route} {pattern.name} {pattern.lookup_str}"
+
+
+def urlconf_fingerprint(resolver=None):
+    """Hash of every route, its name and view, and the schema settings."""
+    resolver = resolver or get_resolver()
+    digest = hashlib.sha256()
+    for line in _pattern_lines(resolver.url_patterns):
+        digest.update(line.encode() + b'\n')
+    digest.update(repr(sorted(getattr(settings, 'SPECTACULAR_SETTINGS', {}).items())).encode())
+    return digest.hexdigest()[:16]
+
+
+def _write(path, content):
+    # Written under a temporary name and renamed, so readers never see a partial file.
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def render():
+    """Generates the schema and returns the YAML and JSON bodies by format."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+    return {
+        'yaml': OpenApiYamlRenderer().render(schema, renderer_context={}),
+        'json': OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def build(fingerprint=None):
+    """Renders the schema into schema_dir() and returns the new manifest."""
+    bodies = render()
+    content_hash = hashlib.sha256(bodies['json']).hexdigest()[:12]
+    directory = schema_dir()
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'urlconf': fingerprint or urlconf_fingerprint(), 'hash': content_hash, 'files': {}}
+    for fmt, body in bodies.items():
+        name = f'openapi.{content_hash}.{fmt}'
+        _write(os.path.join(directory, name), body)
+        manifest['files'][fmt] = name
+    previous = read_manifest()
+    _write(os.path.join(directory, MANIFEST), json.dumps(manifest, indent=2).encode())
+    if previous and previous['hash'] != content_hash:
+        for name in previous['files'].values():
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    return manifest
+
+
+def read_manifest():
+    try:
+        with open(os.path.join(schema_dir(), MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _read_bodies(manifest):
+    bodies = {}
+    for fmt, name in manifest['files'].items():
+        with open(os.path.join(schema_dir(), name), 'rb') as f:
+            bodies[fmt] = f.read()
+    return bodies
+
+
+def current():
+    """Returns (manifest, bodies), building the schema if it is missing or outdated."""
+    resolver = get_resolver()
+    if _loaded['resolver'] is resolver:
+        return _loaded['manifest'], _loaded['bodies']
+    with _lock:
+        if _loaded['resolver'] is not resolver:
+            fingerprint = urlconf_fingerprint(resolver)
+            manifest = read_manifest()
+            try:
+                bodies = _read_bodies(manifest) if manifest and manifest['urlconf'] == fingerprint else None
+            except FileNotFoundError:
+                bodies = None
+            if bodies is None:
+                manifest = build(fingerprint)
+                bodies = _read_bodies(manifest)
+            _loaded.update(manifest=manifest, bodies=bodies, resolver=resolver)
+    return _loaded['manifest'], _loaded['bodies']
+
+
+def reset():
+    """Forgets the loaded schema; the next request re-checks the manifest."""
+    _loaded.update(resolver=None, manifest=None, bodies=None)
+
+
+def _requested_format(request):
+    fmt = request.GET.get('format')
+    if fmt in FORMATS:
+        return fmt
+    # Same choice SpectacularAPIView's content negotiation makes (Swagger UI asks for JSON).
+    return 'json' if 'json' in request.headers.get('Accept', '') else 'yaml'
+
+
+@require_http_methods(["GET", "HEAD"])
+def schema_view(request):
+    """Serves the precomputed OpenAPI schema, as YAML by default or JSON."""
+    manifest, bodies = current()
+    fmt = _requested_format(request)
+    etag = f'"{manifest["hash"]}-{fmt}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(bodies[fmt], content_type=FORMATS[fmt])
+        response['Content-Disposition'] = f'inline; filename="{manifest["files"][fmt]}"'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'  # Revalidate: the schema changes with deploys
+    response['Vary'] = 'Accept'
+    return response
@@ -37,7 +37,9 @@ LOGOUT_REDIRECT_URL = '/'  # Redirect after logging out
 
 INSTALLED_APPS = [
     'rest_framework',
-    'rest_framework_simplejwt',
+    # rest_framework_simplejwt isn't listed: it has no models or templates, and as an app its
+    # settings module (which imports django.test) would load at startup. Its token views
+    # are imported on first use, see path_editor.urls.LazyView.
     'drf_spectacular', 
     'widget_tweaks',
     'main.apps.MainConfig',
@@ -52,6 +54,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'path_editor.middleware.MetricsMiddleware',
+    'path_editor.middleware.RequestProfilingMiddleware',
+    'path_editor.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -91,9 +96,41 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    # Read-only connection to the same (WAL) file, used by views marked @read_from_replica.
+    # Remove this alias to send every query to 'default'. See path_editor/db_router.py.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{BASE_DIR / 'db.sqlite3'}?mode=ro",
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['path_editor.db_router.ReplicaRouter']
+
+# Cache
+# path_editor.caching's single-flight locks and cache generations only hold across the
+# processes that share one cache, so this must not be Django's default per-process
+# LocMemCache. Production should set REDIS_URL (needs the `redis` package). Without it,
+# the file cache is shared by the processes of this host; its add() isn't atomic, so
+# two processes missing the same key at once may occasionally both compute it.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -157,6 +194,102 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',  # To use drf-spectacular for Swagger UI
 }
 
+# Largest allowed board dimension (cols and rows), enforced by BoardGame.save and the editor APIs.
+GALLERY_BOARD_MAX_DIMENSION = 50
+
+# Upper bound on candidate solutions per grade_solutions_api request.
+GALLERY_GRADE_MAX_CANDIDATES = 5000
+
+# Per-session move log (gallery.movelog): max moves per append, compaction cadence and size cap.
+GALLERY_MOVE_LOG = {
+    'MAX_BATCH': 2000,
+    'COMPACT_EVERY': 32,
+    'MAX_MOVES': 50000,
+}
+
+# Per-board editor undo/redo log (gallery.editlog): number of saved edits kept per board.
+GALLERY_EDIT_HISTORY = {
+    'MAX_ENTRIES': 100,
+}
+
+# Board search (gallery.search): max values listed per facet and how long facet counts are cached.
+GALLERY_SEARCH = {
+    'FACET_LIMIT': 20,
+    'FACET_CACHE_SECONDS': 30,
+}
+
+# Difficulty rating (gallery.solver, rate_boards command): search nodes explored per board
+# before giving up and rating it 100, and how long after an edit the rate_board job runs.
+GALLERY_DIFFICULTY = {
+    'MAX_NODES': 20000,
+    'RATE_DELAY_SECONDS': 30,
+}
+
+# Board preview images (gallery.previews): longest side in pixels, WEBP or PNG, and how long
+# after an edit the render_board_preview job runs.
+GALLERY_PREVIEWS = {
+    'MAX_SIZE': 240,
+    'FORMAT': 'WEBP',
+    'RENDER_DELAY_SECONDS': 5,
+}
+
+# Puzzle of the day (gallery.daily, prepare_daily_puzzle command): leaderboard length, cache
+# lifetimes, and how far past midnight the caches warmed by the command stay fresh.
+GALLERY_DAILY = {
+    'LEADERBOARD_SIZE': 20,
+    'LEADERBOARD_SECONDS': 300,
+    'ENTRY_SECONDS': 600,
+    'WARM_MARGIN_SECONDS': 60 * 60,
+}
+
+# Stampede-protected payload caching (path_editor.caching): how long board data and board
+# listings are cached, how long a stale value is still served while one request refreshes
+# it, and how long other requests wait for the first computation of a missing value.
+PAYLOAD_CACHE = {
+    'BOARD_DATA_SECONDS': 300,
+    'LISTING_SECONDS': 60,
+    'STALE_GRACE': 60,
+    'LOCK_TIMEOUT': 30,
+    'WAIT_TIMEOUT': 5,
+}
+
+# Precomputed OpenAPI schema served at /api/schema/ (see path_editor.schema and the
+# build_openapi_schema command). Generated files are content-hashed.
+OPENAPI_SCHEMA = {
+    'DIR': os.path.join(BASE_DIR, 'static', 'schema'),
+}
+
+# Database-backed background jobs (gallery.jobs, runworker command). EAGER runs undelayed
+# jobs inline when they are enqueued, so development doesn't need a worker running.
+JOB_QUEUE = {
+    'EAGER': DEBUG,
+    'LEASE_SECONDS': 300,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 10,
+    'RETRY_BACKOFF_MAX': 3600,
+}
+
+# Per-request Server-Timing headers (DB, serialization, total) and sampled cProfile dumps.
+# Leave PROFILE_SLOW_MS as None outside of staging: it runs the profiler on every request.
+REQUEST_PROFILING = {
+    'ENABLED': DEBUG,
+    'SERVER_TIMING': True,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'PROFILE_SLOW_MS': None,
+    'PROFILE_DIR': BASE_DIR / 'profiles',
+}
+
+# Response compression (path_editor.middleware.CompressionMiddleware). brotli and zstd
+# are used when the `brotli` / `zstandard` packages are installed, gzip otherwise.
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 512,
+    'ENCODINGS': ['br', 'zstd', 'gzip'],
+    'CACHE_SIZE': 64,
+}
+
+# Hosts allowed to scrape /metrics/ without a staff login.
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -18,12 +18,43 @@ from django.contrib import admin
 from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
 
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from path_editor.metrics import metrics_view
+from path_editor.schema import schema_view
+
+
+class LazyView:
+    """
+    A class-based view that is imported on its first request instead of when the
+    URLconf loads. Used for views whose modules (simplejwt, drf_spectacular's views)
+    are slow to import and rarely hit, to keep worker startup fast.
+
+    Only for DRF APIViews: those are CSRF-exempt and enforce CSRF themselves. Other
+    attributes (e.g. `cls`, read by the schema generator) come from the real view.
+    """
+    csrf_exempt = True
+
+    def __init__(self, dotted_path, **initkwargs):
+        self.dotted_path = dotted_path
+        self.initkwargs = initkwargs
+        # Used by URLPattern.lookup_str and ResolverMatch without importing the view.
+        self.__module__, self.__name__ = dotted_path.rsplit('.', 1)
+        self.__qualname__ = self.__name__
+
+    @cached_property
+    def view(self):
+        return import_string(self.dotted_path).as_view(**self.initkwargs)
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if name == 'view_class' or name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.view, name)
 
-from users.schema import CustomTokenObtainPairView
-from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path('', include('main.urls')),
@@ -33,11 +64,13 @@ urlpatterns = [
     # path("polls/", include("polls.urls")),
     path('admin/', admin.site.urls),
 
-    path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/', LazyView('users.schema.CustomTokenObtainPairView'), name='token_obtain_pair'),
+    path('api/token/refresh/', LazyView('rest_framework_simplejwt.views.TokenRefreshView'), name='token_refresh'),
+
+    path('api/schema/', schema_view, name='schema'),
+    path('swagger/', LazyView('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
 
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('metrics/', metrics_view, name='metrics'),
     
 ]
 